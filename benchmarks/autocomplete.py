@@ -0,0 +1,102 @@
+"""
+Benchmark AutocompleteIndex queries over a large, skewed set of choices.
+
+Builds place names from a small set of common English syllables, picked
+with a Zipf-like distribution so that a few n-grams appear in most names,
+which is the worst case for the n-gram posting lists. Then times prefix,
+substring and fuzzy queries (typos and shuffled words) and prints the
+mean and worst time per query.
+
+Usage::
+
+    python benchmarks/autocomplete.py [--choices N] [--number N]
+"""
+
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(1, ".")
+
+from flask_discord_interactions import AutocompleteIndex
+
+SYLLABLES = [
+    "ton",
+    "ham",
+    "ford",
+    "ing",
+    "ley",
+    "bury",
+    "wick",
+    "field",
+    "stead",
+    "worth",
+    "brook",
+    "dale",
+    "mar",
+    "ash",
+    "bridge",
+    "castle",
+    "new",
+    "north",
+    "west",
+    "king",
+    "water",
+    "stan",
+    "mill",
+    "hurst",
+]
+
+QUERIES = {
+    "prefix": ["ton", "tonham", "northwick", "westbury"],
+    "substring": ["ham", "fordley", "bridgewater", "ingham"],
+    "fuzzy": ["tonham fordx", "tinham ford", "brigewater", "kingstn mill", "fordtonx"],
+}
+
+
+def skewed_names(count: int, seed: int = 0):
+    "Generate place names, with the first syllables far more common."
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(SYLLABLES))]
+
+    def word():
+        return "".join(rng.choices(SYLLABLES, weights, k=rng.randint(2, 3)))
+
+    names = set()
+    while len(names) < count:
+        names.add(" ".join(word() for _ in range(rng.randint(1, 2))))
+    return sorted(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--choices", type=int, default=100_000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    names = skewed_names(args.choices)
+
+    start = time.perf_counter()
+    index = AutocompleteIndex(names)
+    print(
+        f"Built an index of {len(index)} choices in {time.perf_counter() - start:.2f}s\n"
+    )
+
+    print(f"{'kind':<12}{'query':<16}{'results':>8}{'mean':>10}{'max':>10}")
+    for kind, queries in QUERIES.items():
+        for query in queries:
+            times = []
+            for _ in range(args.number):
+                start = time.perf_counter()
+                results = index.query(query)
+                times.append(time.perf_counter() - start)
+
+            print(
+                f"{kind:<12}{query:<16}{len(results):>8}"
+                f"{sum(times) / len(times) * 1000:>8.3f}ms{max(times) * 1000:>8.3f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark the serialization of component-heavy messages.
+
+Builds the messages from ``examples/components.py`` plus a worst-case
+message (4 rows of 5 buttons, and a row with a 25 option select menu), then
+times ``Message.encode()`` and compares the component serializer against the
+previous ``dataclasses.asdict`` based implementation.
+
+Usage::
+
+    python benchmarks/components.py [--number N]
+"""
+
+import sys
+import timeit
+import argparse
+import dataclasses
+
+sys.path.insert(1, ".")
+
+from flask_discord_interactions import (
+    Message,
+    ActionRow,
+    Button,
+    ButtonStyles,
+    Embed,
+    SelectMenu,
+    SelectMenuOption,
+)
+
+
+def filter_none(d):
+    if isinstance(d, dict):
+        return {k: filter_none(v) for k, v in d.items() if v is not None}
+    elif isinstance(d, list):
+        return [filter_none(v) for v in d if v is not None]
+    else:
+        return d
+
+
+def legacy_dump(component):
+    return filter_none(dataclasses.asdict(component))
+
+
+def example_messages():
+    "The messages sent by the commands and handlers in examples/components.py."
+    return {
+        "click_counter": Message(
+            content="The button has been clicked 3 times",
+            components=[
+                ActionRow(
+                    components=[
+                        Button(
+                            style=ButtonStyles.PRIMARY,
+                            custom_id="handle_click",
+                            label="Click Me!",
+                        )
+                    ]
+                )
+            ],
+        ),
+        "voting": Message(
+            content="The question is: pizza?",
+            components=[
+                ActionRow(
+                    components=[
+                        Button(
+                            style=ButtonStyles.SUCCESS,
+                            custom_id="handle_upvote",
+                            emoji={"name": "⬆️"},
+                        ),
+                        Button(
+                            style=ButtonStyles.DANGER,
+                            custom_id="handle_downvote",
+                            emoji={"name": "⬇️"},
+                        ),
+                    ]
+                )
+            ],
+        ),
+        "avatar_view": Message(
+            embed=Embed(title="Someone", description="someone#0001"),
+            ephemeral=True,
+        ),
+        "google": Message(
+            content="search engine",
+            components=[
+                ActionRow(
+                    components=[
+                        Button(
+                            style=ButtonStyles.LINK,
+                            url="https://www.google.com/",
+                            label="Go to google",
+                        )
+                    ]
+                )
+            ],
+        ),
+        "stateful": Message(
+            content="Click the button!",
+            components=[
+                ActionRow(
+                    components=[
+                        Button(
+                            style=ButtonStyles.PRIMARY,
+                            custom_id=["handle_stateful", 1052345678901234567, 0],
+                            label="Click Me!",
+                        )
+                    ]
+                )
+            ],
+        ),
+        "worst_case": Message(
+            content="Lots of components",
+            components=[
+                ActionRow(
+                    components=[
+                        Button(
+                            style=ButtonStyles.SECONDARY,
+                            custom_id=["cell", row, column],
+                            label=f"{row}, {column}",
+                        )
+                        for column in range(5)
+                    ]
+                )
+                for row in range(4)
+            ]
+            + [
+                ActionRow(
+                    components=[
+                        SelectMenu(
+                            custom_id="menu",
+                            placeholder="Choose an option",
+                            options=[
+                                SelectMenuOption(
+                                    label=f"Option {i}",
+                                    value=str(i),
+                                    description=f"The option numbered {i}",
+                                )
+                                for i in range(25)
+                            ],
+                        )
+                    ]
+                )
+            ],
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'message':<16}{'encode':>12}{'dump':>12}{'asdict':>12}{'speedup':>10}")
+
+    for name, message in example_messages().items():
+        encode = timeit.timeit(message.encode, number=args.number)
+
+        components = message.components or []
+        dump = timeit.timeit(lambda: [c.dump() for c in components], number=args.number)
+        legacy = timeit.timeit(
+            lambda: [legacy_dump(c) for c in components], number=args.number
+        )
+
+        per_call = 1e6 / args.number
+        speedup = f"{legacy / dump:.1f}x" if components else "-"
+        print(
+            f"{name:<16}{encode * per_call:>10.1f}us{dump * per_call:>10.1f}us"
+            f"{legacy * per_call:>10.1f}us{speedup:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
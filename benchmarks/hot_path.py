@@ -0,0 +1,291 @@
+"""
+Benchmark the interaction hot path.
+
+Generates realistic, signed interaction payloads (slash commands with
+subcommands and resolved users/roles/channels, user and message commands,
+button clicks, select menus, modals and autocomplete) and times each stage
+of handling them: signature verification, ``Context.from_data``,
+``create_args``, ``Message.encode``, ``Component.dump`` and the whole
+request through the Flask test client.
+
+Results are printed and can be saved as JSON, then compared against a
+previous run to spot regressions between commits.
+
+Usage::
+
+    python benchmarks/hot_path.py [--number N] [--filter TEXT]
+        [--output results.json] [--compare baseline.json]
+"""
+
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+
+sys.path.insert(1, ".")
+
+from flask import Flask, request
+
+from flask_discord_interactions import (
+    DiscordInteractions,
+    Context,
+    Message,
+    Member,
+    Role,
+    Channel,
+    Modal,
+    TextInput,
+    ActionRow,
+    Button,
+    SelectMenu,
+    SelectMenuOption,
+    Autocomplete,
+)
+from flask_discord_interactions.payloads import InteractionFactory, Signer
+
+
+def create_bot(signer: Signer):
+    app = Flask(__name__)
+    app.config["DISCORD_PUBLIC_KEY"] = signer.public_key
+    app.config["DONT_REGISTER_WITH_DISCORD"] = True
+    discord = DiscordInteractions(app)
+
+    @discord.command()
+    def ping(ctx):
+        return "Pong!"
+
+    admin = discord.command_group("admin")
+    roles = admin.subgroup("roles")
+
+    @roles.command()
+    def assign(ctx, user: Member, role: Role, channel: Channel, reason: str, days: int):
+        return Message(
+            f"Gave {user.display_name} {role.name} in {channel.name} for {days} "
+            f"days: {reason}",
+            allowed_mentions={"parse": []},
+        )
+
+    @discord.command(type=2)
+    def profile(ctx, user):
+        return Message(f"{user.display_name}'s profile", ephemeral=True)
+
+    @discord.command(type=3)
+    def quote(ctx, message):
+        return f"> {message.content}"
+
+    @discord.custom_handler("menu")
+    def menu(ctx):
+        return Message(
+            update=True,
+            content=f"Page {ctx.values[0]}",
+            components=menu_components(),
+        )
+
+    @discord.custom_handler("click")
+    def click(ctx, button: int):
+        return Message(
+            update=True, content=f"Clicked {button}", components=menu_components()
+        )
+
+    @discord.custom_handler("feedback")
+    def feedback(ctx):
+        return Message(f"Thanks for the feedback: {ctx.get_component('text').value}")
+
+    @discord.command()
+    def survey(ctx):
+        return Modal(
+            "feedback",
+            "Feedback",
+            [ActionRow([TextInput("text", "Your feedback")])],
+        )
+
+    @discord.command()
+    def fruit(ctx, name: Autocomplete(str)):
+        return name
+
+    @fruit.autocomplete()
+    def fruit_autocomplete(ctx, name=None):
+        return [f for f in FRUIT if f.startswith(name.value)]
+
+    discord.set_route("/interactions")
+    return app, discord
+
+
+FRUIT = ["apple", "apricot", "avocado", "banana", "blackberry", "cherry"]
+
+
+def menu_components():
+    return [
+        ActionRow(
+            [Button(custom_id=["click", i], label=f"Button {i}") for i in range(5)]
+        ),
+        ActionRow(
+            [
+                SelectMenu(
+                    custom_id="menu",
+                    options=[
+                        SelectMenuOption(label=f"Page {i}", value=str(i))
+                        for i in range(25)
+                    ],
+                )
+            ]
+        ),
+    ]
+
+
+def generate_payloads(factory: InteractionFactory):
+    return {
+        "ping": factory.slash_command("ping"),
+        "subcommand": factory.slash_command(
+            "admin",
+            "roles",
+            "assign",
+            user=factory.user(),
+            role=factory.role(),
+            channel=factory.channel(),
+            reason="Helpful in #support",
+            days=30,
+        ),
+        "user_command": factory.user_command("profile"),
+        "message_command": factory.message_command("quote"),
+        "button": factory.component("click\n3"),
+        "select_menu": factory.component("menu", values=["7"]),
+        "modal": factory.slash_command("survey"),
+        "modal_submit": factory.modal_submit("feedback", text="Great bot!"),
+        "autocomplete": factory.autocomplete("fruit", focused="name", name="ap"),
+    }
+
+
+def measure(func, number: int):
+    "Call a function ``number`` times and summarize the latency of each call."
+    func()  # Warm up caches
+
+    timer = time.perf_counter_ns
+    samples = []
+    for _ in range(number):
+        start = timer()
+        func()
+        samples.append(timer() - start)
+
+    samples.sort()
+    total = sum(samples) / 1e9
+
+    def percentile(p):
+        return samples[min(int(len(samples) * p), len(samples) - 1)] / 1e3
+
+    return {
+        "number": number,
+        "ops_per_second": number / total,
+        "mean_us": total * 1e6 / number,
+        "p50_us": percentile(0.5),
+        "p90_us": percentile(0.9),
+        "p99_us": percentile(0.99),
+    }
+
+
+def benchmarks(app, discord, signer, payloads):
+    "Yield the name and function of each benchmark."
+
+    body, headers = signer.sign(payloads["subcommand"])
+
+    def verify():
+        with app.test_request_context(
+            "/interactions", method="POST", data=body, headers=headers
+        ):
+            discord.verify_signature(request)
+
+    yield "verify_signature", verify
+
+    with app.app_context():
+        for name, payload in payloads.items():
+            yield f"from_data/{name}", lambda p=payload: Context.from_data(
+                discord, app, p
+            )
+
+        for name in ["ping", "subcommand"]:
+            context = Context.from_data(discord, app, payloads[name])
+            yield f"create_args/{name}", context.create_args
+
+        menu = Message(content="Menu", components=menu_components())
+        yield "encode/text", Message("Pong!").encode
+        yield "encode/components", menu.encode
+        yield "component_dump/menu", lambda: [c.dump() for c in menu.components]
+
+    client = app.test_client()
+    for name, payload in payloads.items():
+        signed = signer.sign(payload)
+
+        def post(signed=signed):
+            response = client.post("/interactions", data=signed[0], headers=signed[1])
+            assert response.status_code == 200, response.data
+
+        yield f"handle_request/{name}", post
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--filter", help="only run benchmarks containing this text")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="compare against a saved JSON file")
+    args = parser.parse_args()
+
+    signer = Signer()
+    app, discord = create_bot(signer)
+    payloads = generate_payloads(InteractionFactory(seed=0))
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{'benchmark':<32}{'ops/s':>12}{'p50':>12}{'p99':>12}{'change':>10}")
+
+    results = {}
+    for name, func in benchmarks(app, discord, signer, payloads):
+        if args.filter and args.filter not in name:
+            continue
+
+        result = results[name] = measure(func, args.number)
+
+        change = "-"
+        if name in baseline:
+            ratio = baseline[name]["mean_us"] / result["mean_us"]
+            change = f"{ratio:.2f}x"
+
+        print(
+            f"{name:<32}{result['ops_per_second']:>12.0f}"
+            f"{result['p50_us']:>10.1f}us{result['p99_us']:>10.1f}us{change:>10}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "revision": git_revision(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "time": time.time(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
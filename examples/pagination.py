@@ -16,6 +16,7 @@ from flask_discord_interactions import (
     Button,
     ButtonStyles,
     Embed,
+    State,
 )
 
 
@@ -95,19 +96,22 @@ def paginated_static(ctx):
 
 # Here, you have to store each message on the server-side
 # (it probably won't fit into the custom_id state)
-message_data = {}
 
-# This is a bad way to store server-side data, you should use an actual
-# database, you *will* run into threading issues in production otherwise
+# ctx.state.put() stores the data in the state store and returns a short key
+# to include in the custom ID. Annotating a handler parameter with State
+# swaps the key back for the stored data. By default, the data is kept in
+# memory for 15 minutes. If you run multiple workers, pass a
+# SQLiteStateStore or RedisStateStore to DiscordInteractions instead.
 
 
 @discord.custom_handler()
-def handle_paginated_dynamic(ctx, id, pageno: int):
-    global message_data
+def handle_paginated_dynamic(ctx, pages: State, pageno: int):
+    if pages is None:
+        return Message(content="This menu has expired.", ephemeral=True)
 
     return Message(
-        embed=Embed(**message_data[id][pageno]),
-        components=get_page_buttons(handle_paginated_dynamic, id),
+        embed=Embed(**pages[pageno]),
+        components=get_page_buttons(handle_paginated_dynamic, ctx.handler_state[1]),
         update=True,
     )
 
@@ -116,7 +120,6 @@ def handle_paginated_dynamic(ctx, id, pageno: int):
 @discord.command()
 def paginated_dynamic(ctx):
     "A simple paginated menu with dynamic data"
-    global message_data
 
     now = datetime.datetime.now()
 
@@ -132,11 +135,11 @@ def paginated_dynamic(ctx):
         for i in range(10)
     ]
 
-    message_data[ctx.id] = message
+    key = ctx.state.put(message)
 
     return Message(
         embed=Embed(**message[0]),
-        components=get_page_buttons(handle_paginated_dynamic, ctx.id),
+        components=get_page_buttons(handle_paginated_dynamic, key),
     )
 
 
@@ -18,6 +18,10 @@ from flask_discord_interactions.models import (
     Channel,
     Attachment,
     Message,
+    MessageTemplate,
+    RenderedMessage,
+    MultipartBody,
+    File,
     ResponseType,
     Component,
     ActionRow,
@@ -31,7 +35,11 @@ from flask_discord_interactions.models import (
     SelectMenuOption,
     Autocomplete,
     AutocompleteResult,
+    AutocompleteIndex,
     Option,
+    EncodedResponse,
+    set_validation,
+    trusted,
 )
 
 from flask_discord_interactions.discord import (
@@ -45,6 +53,33 @@ from flask_discord_interactions.models import Embed
 
 from flask_discord_interactions.client import Client
 
+from flask_discord_interactions.cache import (
+    TTLCache,
+    AutocompleteCache,
+    ResponseCache,
+)
+
+from flask_discord_interactions.state import (
+    State,
+    StateStore,
+    MemoryStateStore,
+    SQLiteStateStore,
+    RedisStateStore,
+)
+
+from flask_discord_interactions.custom_id import StateCodec, CustomIDRouter
+
+from flask_discord_interactions.metrics import (
+    Timings,
+    MetricsSink,
+    InMemoryMetrics,
+    StatsDMetrics,
+)
+from flask_discord_interactions.profiling import Profiler
+from flask_discord_interactions.journal import Journal
+from flask_discord_interactions.idempotency import IdempotencyCache
+from flask_discord_interactions.tracing import set_tracer
+
 
 __all__ = [
     "embed",
@@ -64,6 +99,10 @@ __all__ = [
     "DiscordInteractions",
     "DiscordInteractionsBlueprint",
     "Message",
+    "MessageTemplate",
+    "RenderedMessage",
+    "MultipartBody",
+    "File",
     "ResponseType",
     "Embed",
     "Component",
@@ -80,5 +119,27 @@ __all__ = [
     "Permission",
     "Autocomplete",
     "AutocompleteResult",
+    "AutocompleteIndex",
     "Option",
+    "EncodedResponse",
+    "set_validation",
+    "trusted",
+    "TTLCache",
+    "AutocompleteCache",
+    "ResponseCache",
+    "State",
+    "StateStore",
+    "MemoryStateStore",
+    "SQLiteStateStore",
+    "RedisStateStore",
+    "StateCodec",
+    "CustomIDRouter",
+    "Timings",
+    "MetricsSink",
+    "InMemoryMetrics",
+    "StatsDMetrics",
+    "Profiler",
+    "Journal",
+    "IdempotencyCache",
+    "set_tracer",
 ]
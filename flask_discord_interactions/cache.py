@@ -0,0 +1,421 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from flask_discord_interactions.models import CommandOptionType
+
+
+class TTLCache:
+    """
+    A thread-safe, bounded least-recently-used cache whose entries expire
+    after a fixed time-to-live.
+
+    Attributes
+    ----------
+    maxsize: int
+        The maximum number of entries to keep. When the cache is full, the
+        least recently used entry is evicted.
+    ttl: float
+        The number of seconds an entry stays fresh. If ``None``, entries
+        never expire and are only evicted by the LRU bound.
+    hits: int
+        The number of lookups which returned a fresh entry.
+    misses: int
+        The number of lookups which found no fresh entry.
+    evictions: int
+        The number of entries evicted to stay within ``maxsize``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = None,
+        *,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None, *, stale: bool = False):
+        """
+        Look up an entry in the cache.
+
+        Parameters
+        ----------
+        key
+            The key to look up.
+        default
+            The value to return if there is no usable entry.
+        stale: bool
+            Whether to return an expired entry if one is still held. Stale
+            lookups are not counted towards the hit rate.
+
+        Returns
+        -------
+        Any
+            The cached value, or ``default``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                if not stale:
+                    self.misses += 1
+                return default
+
+            expires, value = entry
+
+            if stale:
+                return value
+
+            if expires is not None and expires <= self.timer():
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Add or replace an entry in the cache.
+
+        Parameters
+        ----------
+        key
+            The key to store the value under.
+        value
+            The value to store.
+        """
+        expires = None if self.ttl is None else self.timer() + self.ttl
+
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None):
+        "Remove an entry from the cache, returning its value if present."
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        "Remove every entry from the cache and reset the statistics."
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of lookups which returned a fresh entry.
+
+        Returns
+        -------
+        float
+            A value between 0 and 1, or 0 if there have been no lookups.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Return the statistics of this cache as a dict.
+
+        Returns
+        -------
+        dict
+            The current size and the hit, miss and eviction counters.
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+def iter_options(options: list):
+    """
+    Yield every leaf option in a (possibly nested) list of incoming options,
+    descending into subcommands and subcommand groups.
+
+    Parameters
+    ----------
+    options: list
+        The ``options`` list of incoming interaction data.
+    """
+    for option in options or []:
+        if option.get("type") in [
+            CommandOptionType.SUB_COMMAND,
+            CommandOptionType.SUB_COMMAND_GROUP,
+        ]:
+            yield option["name"], None, False
+            yield from iter_options(option.get("options"))
+        else:
+            yield option["name"], option.get("value"), option.get("focused", False)
+
+
+class AutocompleteCache(TTLCache):
+    """
+    Caches the encoded results of an autocomplete handler.
+
+    Results are keyed on the command name, the focused option, the value
+    typed so far and the values of the other options (since handlers often
+    depend on them). The key is built directly from the incoming interaction
+    data, so a cache hit skips building the :class:`.Context` as well as the
+    handler itself.
+
+    Only use this for handlers whose results depend on nothing but the
+    options (and, optionally, the locale or guild).
+
+    Attributes
+    ----------
+    maxsize: int
+        The maximum number of results to keep.
+    ttl: float
+        The number of seconds a result stays fresh.
+    locale: bool
+        Whether to cache results separately for each user locale.
+    guild: bool
+        Whether to cache results separately for each guild.
+    case_sensitive: bool
+        Whether the typed value is compared case-sensitively. If ``False``,
+        "ber" and "Ber" share a cache entry.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60,
+        *,
+        locale: bool = False,
+        guild: bool = False,
+        case_sensitive: bool = True,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(maxsize, ttl, timer=timer)
+        self.locale = locale
+        self.guild = guild
+        self.case_sensitive = case_sensitive
+
+    def make_key(self, data: dict):
+        """
+        Build the cache key for an incoming autocomplete interaction.
+
+        Parameters
+        ----------
+        data: dict
+            The incoming interaction data.
+
+        Returns
+        -------
+        tuple
+            A hashable key identifying the request.
+        """
+        interaction = data.get("data", {})
+
+        focused = None
+        values = []
+        for name, value, is_focused in iter_options(interaction.get("options")):
+            if is_focused:
+                if not self.case_sensitive and isinstance(value, str):
+                    value = value.lower()
+                focused = (name, value)
+            else:
+                values.append((name, json.dumps(value)))
+
+        return (
+            interaction.get("name"),
+            focused,
+            tuple(values),
+            data.get("locale") if self.locale else None,
+            data.get("guild_id") if self.guild else None,
+        )
+
+
+class ResponseCache(TTLCache):
+    """
+    Caches the encoded responses of a command.
+
+    Responses are keyed on the command, the values of the options (including
+    the subcommand being invoked) and the target of context menu commands,
+    and optionally on the user's locale and the guild, so one cache can be
+    shared between commands. A cache hit skips the command body and the
+    serialization of its response.
+
+    Only use this for commands whose response depends on nothing else, such
+    as ``/help`` or static information pages. Deferred responses and
+    responses with file attachments are never cached.
+
+    Attributes
+    ----------
+    maxsize: int
+        The maximum number of responses to keep.
+    ttl: float
+        The number of seconds a response stays fresh.
+    locale: bool
+        Whether to cache responses separately for each user locale.
+    guild: bool
+        Whether to cache responses separately for each guild.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 300,
+        *,
+        locale: bool = True,
+        guild: bool = False,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(maxsize, ttl, timer=timer)
+        self.locale = locale
+        self.guild = guild
+
+    def make_key(self, data: dict):
+        """
+        Build the cache key for an incoming command interaction.
+
+        Parameters
+        ----------
+        data: dict
+            The incoming interaction data.
+
+        Returns
+        -------
+        tuple
+            A hashable key identifying the request.
+        """
+        interaction = data.get("data", {})
+
+        return (
+            data.get("type"),
+            interaction.get("name"),
+            interaction.get("type"),
+            json.dumps(interaction.get("options"), sort_keys=True),
+            interaction.get("target_id"),
+            data.get("locale") if self.locale else None,
+            data.get("guild_id") if self.guild else None,
+        )
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key, so that only one of them
+    does the work and the others wait for its result.
+
+    Works for both threaded and asyncio deployments: :meth:`run` blocks the
+    calling thread, while :meth:`future` shares a future (either a
+    :class:`concurrent.futures.Future` or an :class:`asyncio.Future`) between
+    callers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._futures = {}
+
+    def run(self, key: Hashable, func: Callable, *args):
+        """
+        Call ``func(*args)``, unless a call with the same key is already in
+        progress, in which case wait for and return its result instead.
+
+        Parameters
+        ----------
+        key
+            The key identifying identical calls.
+        func
+            The function to call.
+        *args
+            Arguments to pass to the function.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def future(self, key: Hashable, start: Callable):
+        """
+        Return the in-flight future for a key, calling ``start()`` to create
+        one if there is none.
+
+        For asyncio futures, include the event loop in the key if the
+        instance is shared between event loops.
+
+        Parameters
+        ----------
+        key
+            The key identifying identical calls.
+        start
+            A function that starts the work and returns a future.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future
+            future = self._futures[key] = start()
+
+        # If the future is already done, the callback runs immediately, so it
+        # must be added without holding the lock
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return future
+
+    def _forget(self, key: Hashable, future):
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
@@ -92,11 +92,16 @@ class Client:
         """
 
         new_context = copy.deepcopy(self.current_context)
+        if new_context.discord is None:
+            new_context.discord = self.discord
 
-        new_context.custom_id = "\n".join((custom_id, *args))
+        if custom_id in self.discord.custom_id_codecs:
+            new_context.custom_id = self.discord.pack_custom_id(custom_id, *args)
+        else:
+            new_context.custom_id = "\n".join((custom_id, *args))
         new_context.parse_custom_id()
 
-        handler = self.discord.custom_id_handlers[new_context.primary_id]
+        handler = self.discord.get_custom_handler(new_context.primary_id)
 
         args = new_context.create_handler_args(handler)
 
@@ -8,6 +8,8 @@ from typing import Callable, List, Dict, TYPE_CHECKING
 from flask import Flask
 
 from flask_discord_interactions.context import Context, AsyncContext
+from flask_discord_interactions.metrics import phase
+from flask_discord_interactions import tracing
 from flask_discord_interactions.models import (
     Message,
     Modal,
@@ -20,10 +22,12 @@ from flask_discord_interactions.models import (
     Autocomplete,
     Option,
     Attachment,
+    EncodedResponse,
 )
 
 if TYPE_CHECKING:
     from flask_discord_interactions.discord import DiscordInteractions
+    from flask_discord_interactions.cache import AutocompleteCache, ResponseCache
 
 _type = type
 
@@ -69,8 +73,14 @@ class Command:
     discord: DiscordInteractions
         DiscordInteractionsBlueprint instance which this Command is associated
         with.
+    cache: ResponseCache
+        A :class:`.ResponseCache` used to store the encoded responses of
+        this command, or ``None`` to run the command every time.
     """
 
+    # Subgroups and groups don't call __init__, but are never cached
+    cache = None
+
     def __init__(
         self,
         command: Callable,
@@ -85,6 +95,7 @@ class Command:
         name_localizations: Dict[str, str] = None,
         description_localizations: Dict[str, str] = None,
         discord: "DiscordInteractions" = None,
+        cache: "ResponseCache" = None,
     ):
         self.command = command
         self.name = name
@@ -97,6 +108,7 @@ class Command:
         self.name_localizations = name_localizations
         self.description_localizations = description_localizations
         self.discord = discord
+        self.cache = cache
         self.id = None
 
         if self.name is None:
@@ -228,20 +240,46 @@ class Command:
         -------
         Message
             The response by the command, converted to a Message object.
+            If the command has a :attr:`cache`, an :class:`.EncodedResponse`
+            may be returned instead.
         """
 
-        if self.is_async:
-            context = AsyncContext.from_data(discord, app, data)
-        else:
-            context = Context.from_data(discord, app, data)
-        args, kwargs = context.create_args()
+        if self.cache is not None:
+            key = self.cache.make_key(data)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        with phase("context"):
+            if self.is_async:
+                context = AsyncContext.from_data(discord, app, data)
+            else:
+                context = Context.from_data(discord, app, data)
+            args, kwargs = context.create_args()
 
-        result = self.run(context, *args, **kwargs)
+        with phase("command"):
+            result = self.run(context, *args, **kwargs)
 
-        if isinstance(result, Modal):
+        if not isinstance(result, Modal):
+            result = Message.from_return_value(result)
+
+        if self.cache is None:
             return result
+        elif inspect.isawaitable(result):
+            return self._cache_response_async(result, key)
         else:
-            return Message.from_return_value(result)
+            return self._cache_response(result, key)
+
+    def _cache_response(self, result, key):
+        if isinstance(result, Message) and (result.deferred or result.files):
+            return result
+
+        encoded = EncodedResponse.from_response(result)
+        self.cache.set(key, encoded)
+        return encoded
+
+    async def _cache_response_async(self, result, key):
+        return self._cache_response(await result, key)
 
     def run(self, context: Context, *args, **kwargs):
         """
@@ -257,7 +295,14 @@ class Command:
             Any other options in the current invocation.
         """
 
-        return self.command(context, *args, **kwargs)
+        return tracing.call(
+            "discord.command",
+            self.command,
+            (context, *args),
+            kwargs,
+            attributes={"discord.command.name": self.name},
+            interaction_id=context.id,
+        )
 
     def dump(self):
         "Returns this command as a dict for registration with the Discord API."
@@ -278,7 +323,7 @@ class Command:
 
         return data
 
-    def autocomplete(self):
+    def autocomplete(self, *, cache: "AutocompleteCache" = None, timeout: float = None):
         """
         Register an autocomplete handler function for this command.
 
@@ -294,10 +339,21 @@ class Command:
             def autocomplete(ctx, value = None):
                 return ["hello", "world"]
 
+        Parameters
+        ----------
+        cache: AutocompleteCache
+            An :class:`.AutocompleteCache` used to store the results of the
+            handler, or ``True`` to use one with the default settings.
+        timeout: float
+            The number of seconds the handler may take before the last
+            cached (or an empty) result is returned instead.
         """
 
         def wrapper(f):
-            self.discord.add_autocomplete_handler(f, self.name)
+            self.discord.add_autocomplete_handler(
+                f, self.name, cache=cache, timeout=timeout
+            )
+            return f
 
         return wrapper
 
@@ -423,7 +479,14 @@ class SlashCommandSubgroup(Command):
         **kwargs
             Any other options in the current invocation.
         """
-        return self.subcommands[subcommands[0]].run(context, *subcommands[1:], **kwargs)
+        return tracing.call(
+            "discord.command_group",
+            self.subcommands[subcommands[0]].run,
+            (context, *subcommands[1:]),
+            kwargs,
+            attributes={"discord.command.name": self.name},
+            interaction_id=context.id,
+        )
 
 
 class SlashCommandGroup(SlashCommandSubgroup):
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import Callable, List, Optional, Union, TYPE_CHECKING
+import time
 import inspect
 import itertools
 import types
@@ -20,6 +21,11 @@ from flask_discord_interactions.models import (
     Component,
     Option,
 )
+from flask_discord_interactions.models.utils import trusted
+from flask_discord_interactions.metrics import record_followup
+from flask_discord_interactions import tracing
+from flask_discord_interactions.state import State
+from flask_discord_interactions.utils import RESPONSE_WINDOW, snowflake_time
 
 if TYPE_CHECKING:
     from flask_discord_interactions.discord import DiscordInteractions
@@ -124,6 +130,15 @@ class Context(LoadableDataclass):
         if hasattr(app, "_get_current_object"):
             app = app._get_current_object()
 
+        with tracing.span(
+            "discord.context",
+            {"discord.interaction.type": data.get("type")},
+            interaction_id=data.get("id"),
+        ):
+            return cls._from_data(discord, app, data)
+
+    @classmethod
+    def _from_data(cls, discord: "DiscordInteractions", app: Flask, data: dict):
         result = cls(
             app=app,
             discord=discord,
@@ -149,14 +164,79 @@ class Context(LoadableDataclass):
 
         result.data = data
 
-        result.parse_author(data)
-        result.parse_message(data)
-        result.parse_custom_id()
-        result.parse_resolved()
-        result.parse_target()
-        result.parse_components()
+        # Discord has already validated the models it sends us
+        with trusted():
+            result.parse_author(data)
+            result.parse_message(data)
+            result.parse_custom_id()
+            result.parse_resolved()
+            result.parse_target()
+            result.parse_components()
         return result
 
+    @property
+    def state(self):
+        """
+        The :class:`.StateStore` for server-side component state.
+
+        Use :meth:`.StateStore.put` to store a value and get a short key to
+        include in a custom ID, then annotate the corresponding handler
+        parameter with :class:`.State` to receive the value back.
+        """
+        if self.discord is None:
+            raise ValueError("This Context is not bound to a DiscordInteractions.")
+        return self.discord.state_store
+
+    @property
+    def created_at(self):
+        """
+        The time this interaction was created at, as a Unix timestamp, taken
+        from its snowflake ID. ``None`` if the ID is missing.
+        """
+        return snowflake_time(self.id)
+
+    @property
+    def deadline(self):
+        """
+        The time by which Discord must receive the initial response to this
+        interaction, as a Unix timestamp. ``None`` if the ID is missing.
+
+        This is measured against the local clock, so it is only as accurate
+        as the clock is synchronized.
+        """
+        created_at = self.created_at
+        if created_at is None:
+            return None
+        return created_at + RESPONSE_WINDOW
+
+    def time_remaining(self):
+        """
+        Return the number of seconds left until the :attr:`deadline`.
+
+        Commands that might not finish in time can check this and return a
+        deferred :class:`.Message` instead, then send the result as a
+        followup message.
+
+        .. code-block:: python
+
+            @discord.command()
+            def report(ctx):
+                if ctx.time_remaining() < 1:
+                    defer_to_background(ctx)
+                    return Message(deferred=True)
+                return build_report()
+
+        Returns
+        -------
+        float
+            The remaining seconds (negative if the deadline has passed), or
+            ``None`` if the interaction ID is missing.
+        """
+        deadline = self.deadline
+        if deadline is None:
+            return None
+        return deadline - time.time()
+
     @property
     def auth_headers(self):
         if self.discord:
@@ -350,7 +430,14 @@ class Context(LoadableDataclass):
             The custom ID handler to create arguments for.
         """
 
-        args = self.handler_state[1:]
+        codec = None
+        if self.discord is not None:
+            codec = self.discord.custom_id_codecs.get(self.primary_id)
+
+        if codec is not None:
+            args = codec.decode("".join(self.handler_state[1:]))
+        else:
+            args = self.handler_state[1:]
 
         sig = inspect.signature(handler)
 
@@ -361,7 +448,14 @@ class Context(LoadableDataclass):
         for i, argument, parameter in iterator:
             annotation = parameter.annotation
 
-            if annotation == int:
+            if annotation is State:
+                args[i] = self.state.get(argument)
+
+            elif codec is not None:
+                # Packed arguments are already decoded to the right type
+                pass
+
+            elif annotation == int:
                 args[i] = int(argument)
 
             elif annotation == bool:
@@ -403,7 +497,13 @@ class Context(LoadableDataclass):
 
         return url
 
-    def edit(self, updated: Union[Message, str], message: str = "@original"):
+    def edit(
+        self,
+        updated: Union[Message, str],
+        message: str = "@original",
+        *,
+        progress: Callable[[int, int], None] = None,
+    ):
         """
         Edit an existing message.
 
@@ -414,6 +514,9 @@ class Context(LoadableDataclass):
         message: str
             The ID of the message to edit.
             If omitted, edits the original message.
+        progress: Callable[[int, int], None]
+            Called with the number of bytes uploaded so far and the total
+            (or ``None`` if unknown) while attached files are uploaded.
         """
 
         updated = Message.from_return_value(updated)
@@ -421,12 +524,15 @@ class Context(LoadableDataclass):
         if not self.app or self.app.config["DONT_REGISTER_WITH_DISCORD"]:
             return
 
-        response, mimetype = updated.encode(followup=True)
-        updated = requests.patch(
-            self.followup_url(message),
-            data=response,
-            headers={"Content-Type": mimetype},
-        )
+        response, mimetype = self.encode_followup(updated, progress)
+        start = time.perf_counter()
+        with tracing.span("discord.followup.edit", interaction_id=self.id):
+            updated = requests.patch(
+                self.followup_url(message),
+                data=response,
+                headers={"Content-Type": mimetype},
+            )
+        self.observe_followup("edit", updated.status_code, updated.headers, start)
         updated.raise_for_status()
 
     def delete(self, message: str = "@original"):
@@ -443,17 +549,31 @@ class Context(LoadableDataclass):
         if not self.app or self.app.config["DONT_REGISTER_WITH_DISCORD"]:
             return
 
-        response = requests.delete(self.followup_url(message))
+        start = time.perf_counter()
+        with tracing.span("discord.followup.delete", interaction_id=self.id):
+            response = requests.delete(self.followup_url(message))
+        self.observe_followup("delete", response.status_code, response.headers, start)
         response.raise_for_status()
 
-    def send(self, message: Union[Message, str]):
+    def send(
+        self,
+        message: Union[Message, str],
+        *,
+        progress: Callable[[int, int], None] = None,
+    ):
         """
         Send a new followup message.
 
+        Attached files are streamed from their file objects while they are
+        uploaded, rather than read into memory first.
+
         Parameters
         ----------
         message: Union[Message, str]
             The :class:`Message` to send as a followup message.
+        progress: Callable[[int, int], None]
+            Called with the number of bytes uploaded so far and the total
+            (or ``None`` if unknown) while attached files are uploaded.
         """
 
         if not self.app or self.app.config["DONT_REGISTER_WITH_DISCORD"]:
@@ -461,13 +581,59 @@ class Context(LoadableDataclass):
 
         message = Message.from_return_value(message)
 
-        response, mimetype = message.encode(followup=True)
-        message = requests.post(
-            self.followup_url(), data=response, headers={"Content-Type": mimetype}
-        )
+        response, mimetype = self.encode_followup(message, progress)
+        start = time.perf_counter()
+        with tracing.span("discord.followup.send", interaction_id=self.id):
+            message = requests.post(
+                self.followup_url(), data=response, headers={"Content-Type": mimetype}
+            )
+        self.observe_followup("send", message.status_code, message.headers, start)
         message.raise_for_status()
         return message.json()["id"]
 
+    @staticmethod
+    def encode_followup(message, progress: Callable[[int, int], None] = None):
+        """
+        Encode a message for sending as a followup, streaming any attached
+        files.
+
+        Parameters
+        ----------
+        message
+            The :class:`Message` (or rendered :class:`.MessageTemplate`).
+        progress: Callable[[int, int], None]
+            The upload progress callback (see :class:`.MultipartBody`).
+
+        Returns
+        -------
+        Union[bytes, MultipartBody]
+            The body of the request.
+        str
+            The mimetype of the body.
+        """
+        if isinstance(message, Message):
+            return message.encode(followup=True, stream=True, progress=progress)
+
+        return message.encode(followup=True)
+
+    def observe_followup(self, method: str, status: int, headers, start: float):
+        "Report the duration of a followup request to the metrics sink, if any."
+        metrics = getattr(self.discord, "metrics", None)
+        if metrics is not None:
+            record_followup(metrics, method, status, headers, start)
+
+    @staticmethod
+    def followup_headers(body, mimetype: str):
+        "Return the headers for sending a followup body with aiohttp."
+        headers = {"Content-Type": mimetype}
+
+        # aiohttp can't tell the length of a streamed body by itself
+        length = getattr(body, "len", None)
+        if length is not None:
+            headers["Content-Length"] = str(length)
+
+        return headers
+
     def get_command(self, command_name: str = None):
         """
         Get the ID of a command by name.
@@ -537,7 +703,13 @@ class AsyncContext(Context):
 
         self.session = self.app.discord_client_session
 
-    async def edit(self, updated: Union[str, Message], message: str = "@original"):
+    async def edit(
+        self,
+        updated: Union[str, Message],
+        message: str = "@original",
+        *,
+        progress: Callable[[int, int], None] = None,
+    ):
         """
         Edit an existing message.
 
@@ -548,6 +720,9 @@ class AsyncContext(Context):
         message: str
             The ID of the message to edit.
             If omitted, edits the original message.
+        progress: Callable[[int, int], None]
+            Called with the number of bytes uploaded so far and the total
+            (or ``None`` if unknown) while attached files are uploaded.
         """
 
         updated = Message.from_return_value(updated)
@@ -555,12 +730,15 @@ class AsyncContext(Context):
         if not self.app or self.app.config["DONT_REGISTER_WITH_DISCORD"]:
             return
 
-        response, mimetype = updated.encode(followup=True)
-        await self.session.patch(
-            self.followup_url(message),
-            data=response,
-            headers={"Content-Type": mimetype},
-        )
+        response, mimetype = self.encode_followup(updated, progress)
+        start = time.perf_counter()
+        with tracing.span("discord.followup.edit", interaction_id=self.id):
+            updated = await self.session.patch(
+                self.followup_url(message),
+                data=response,
+                headers=self.followup_headers(response, mimetype),
+            )
+        self.observe_followup("edit", updated.status, updated.headers, start)
 
     async def delete(self, message: str = "@original"):
         """
@@ -576,9 +754,17 @@ class AsyncContext(Context):
         if not self.app or self.app.config["DONT_REGISTER_WITH_DISCORD"]:
             return
 
-        await self.session.delete(self.followup_url(message))
+        start = time.perf_counter()
+        with tracing.span("discord.followup.delete", interaction_id=self.id):
+            response = await self.session.delete(self.followup_url(message))
+        self.observe_followup("delete", response.status, response.headers, start)
 
-    async def send(self, message: Union[Message, str]):
+    async def send(
+        self,
+        message: Union[Message, str],
+        *,
+        progress: Callable[[int, int], None] = None,
+    ):
         """
         Send a new followup message.
 
@@ -586,6 +772,9 @@ class AsyncContext(Context):
         ----------
         message: Union[Message, str]
             The Message object to send as a followup message.
+        progress: Callable[[int, int], None]
+            Called with the number of bytes uploaded so far and the total
+            (or ``None`` if unknown) while attached files are uploaded.
         """
 
         message = Message.from_return_value(message)
@@ -593,10 +782,13 @@ class AsyncContext(Context):
         if not self.app or self.app.config["DONT_REGISTER_WITH_DISCORD"]:
             return
 
-        response, mimetype = message.encode(followup=True)
-        async with self.session.post(
-            self.followup_url(),
-            data=response,
-            headers={"Content-Type": mimetype},
-        ) as message:
-            return (await message.json())["id"]
+        response, mimetype = self.encode_followup(message, progress)
+        start = time.perf_counter()
+        with tracing.span("discord.followup.send", interaction_id=self.id):
+            async with self.session.post(
+                self.followup_url(),
+                data=response,
+                headers=self.followup_headers(response, mimetype),
+            ) as message:
+                self.observe_followup("send", message.status, message.headers, start)
+                return (await message.json())["id"]
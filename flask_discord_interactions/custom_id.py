@@ -0,0 +1,427 @@
+import re
+import enum
+import uuid
+import base64
+import hashlib
+import struct
+import inspect
+import itertools
+from typing import Callable, Union
+
+from flask_discord_interactions.state import State
+
+# Backreferences and conditionals refer to groups that move when a pattern is
+# combined with others
+_BACKREFERENCE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?P=|\(\?\(")
+
+
+def handler_id(handler: Callable, length: int = 8):
+    """
+    Derive a short, deterministic custom ID from a handler's qualified name.
+
+    Unlike a random ID, this is the same in every worker process and across
+    restarts, so components sent by one worker can be handled by another.
+
+    Parameters
+    ----------
+    handler: Callable
+        The custom ID handler.
+    length: int
+        The number of characters in the ID. Each character carries 6 bits
+        of the hash.
+
+    Returns
+    -------
+    str
+        The custom ID.
+    """
+    name = f"{handler.__module__}.{handler.__qualname__}"
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=(length * 3 + 3) // 4)
+    return base64.urlsafe_b64encode(digest.digest()).decode("ascii")[:length]
+
+
+class CustomIDRouter:
+    """
+    Routes custom IDs to handlers by prefix or regular expression.
+
+    Prefix patterns end with ``*`` (e.g. ``"page:*"``) and are stored in a
+    character trie, so a custom ID is routed in time proportional to its
+    length no matter how many prefixes are registered. When several
+    prefixes match, the longest one wins.
+
+    Regular expressions must match the entire primary ID. They are combined
+    into a single alternation (except those with backreferences, which are
+    tried on their own) and tried in registration order, after the prefixes.
+
+    You normally don't use this class directly: pass a pattern as the
+    ``custom_id`` of :meth:`.DiscordInteractionsBlueprint.custom_handler`.
+    """
+
+    _HANDLER = object()
+
+    def __init__(self):
+        self.trie = {}
+        self.prefixes = {}
+        self.regexes = []
+        self._steps = None
+
+    @staticmethod
+    def is_pattern(custom_id):
+        "Whether the given custom ID should be routed by this class."
+        return isinstance(custom_id, re.Pattern) or (
+            isinstance(custom_id, str) and custom_id.endswith("*")
+        )
+
+    def add(self, pattern: Union[str, re.Pattern], handler: Callable):
+        """
+        Register a handler for a prefix or regular expression.
+
+        Parameters
+        ----------
+        pattern
+            A string ending with ``*``, or a compiled regular expression.
+        handler
+            The custom ID handler.
+
+        Raises
+        ------
+        ValueError
+            If the pattern is already registered to a different handler.
+        """
+        if isinstance(pattern, re.Pattern):
+            for existing, existing_handler in self.regexes:
+                if existing == pattern:
+                    if existing_handler is not handler:
+                        raise ValueError(
+                            f"Pattern {pattern.pattern!r} is already registered "
+                            f"to {existing_handler.__qualname__}."
+                        )
+                    return
+
+            self.regexes.append((pattern, handler))
+            self._steps = None
+            return
+
+        if not self.is_pattern(pattern):
+            raise ValueError(f"Not a prefix pattern: {pattern!r}")
+
+        prefix = pattern[:-1]
+        existing_handler = self.prefixes.get(prefix)
+        if existing_handler is not None and existing_handler is not handler:
+            raise ValueError(
+                f"Prefix {prefix!r} is already registered to "
+                f"{existing_handler.__qualname__}."
+            )
+
+        node = self.trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[self._HANDLER] = handler
+        self.prefixes[prefix] = handler
+
+    def update(self, other: "CustomIDRouter"):
+        "Add every pattern from another router."
+        for prefix, handler in other.prefixes.items():
+            self.add(prefix + "*", handler)
+        for pattern, handler in other.regexes:
+            self.add(pattern, handler)
+
+    def match(self, custom_id: str):
+        """
+        Find the handler for a primary custom ID.
+
+        Parameters
+        ----------
+        custom_id
+            The primary custom ID (without any handler state).
+
+        Returns
+        -------
+        Callable
+            The handler, or ``None`` if no pattern matches.
+        """
+        handler = self.trie.get(self._HANDLER)
+        node = self.trie
+        for char in custom_id:
+            node = node.get(char)
+            if node is None:
+                break
+            handler = node.get(self._HANDLER, handler)
+
+        if handler is not None or not self.regexes:
+            return handler
+
+        # Read the compiled steps once, since another thread may replace them
+        steps = self._steps
+        if steps is None:
+            steps = self._steps = self._compile()
+
+        for regex, groups in steps:
+            match = regex.fullmatch(custom_id)
+            if match is not None:
+                for group, handler in groups:
+                    if match.group(group) is not None:
+                        return handler
+
+        return None
+
+    def _compile(self):
+        # Combine runs of patterns into one alternation, wrapping each in its
+        # own group so that we can tell which one matched. That renumbers
+        # their groups, so patterns with backreferences are tried on their
+        # own, as are runs with differing flags or clashing group names.
+        steps = []
+        run = []
+
+        def flush():
+            if not run:
+                return
+
+            parts = []
+            groups = []
+            group = 1
+            for pattern, handler in run:
+                parts.append(f"({pattern.pattern})")
+                groups.append((group, handler))
+                group += pattern.groups + 1
+
+            try:
+                steps.append((re.compile("|".join(parts), run[0][0].flags), groups))
+            except re.error:
+                steps.extend((pattern, [(0, handler)]) for pattern, handler in run)
+            run.clear()
+
+        for pattern, handler in self.regexes:
+            if _BACKREFERENCE.search(pattern.pattern):
+                flush()
+                steps.append((pattern, [(0, handler)]))
+                continue
+
+            if run and run[0][0].flags != pattern.flags:
+                flush()
+            run.append((pattern, handler))
+        flush()
+
+        return steps
+
+
+def _zigzag(n: int):
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n: int):
+    return n // 2 if n % 2 == 0 else -(n + 1) // 2
+
+
+def _write_varint(n: int, out: bytearray):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data: bytes, pos: int):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class _Field:
+    "Packs and unpacks a single handler argument."
+
+    def pack(self, value, out: bytearray):
+        raise NotImplementedError
+
+    def unpack(self, data: bytes, pos: int):
+        raise NotImplementedError
+
+
+class _IntField(_Field):
+    def pack(self, value, out):
+        _write_varint(_zigzag(int(value)), out)
+
+    def unpack(self, data, pos):
+        n, pos = _read_varint(data, pos)
+        return _unzigzag(n), pos
+
+
+class _BoolField(_Field):
+    def pack(self, value, out):
+        out.append(1 if value else 0)
+
+    def unpack(self, data, pos):
+        return bool(data[pos]), pos + 1
+
+
+class _FloatField(_Field):
+    def pack(self, value, out):
+        out += struct.pack("<d", value)
+
+    def unpack(self, data, pos):
+        return struct.unpack_from("<d", data, pos)[0], pos + 8
+
+
+class _StrField(_Field):
+    def pack(self, value, out):
+        encoded = str(value).encode("utf-8")
+        _write_varint(len(encoded), out)
+        out += encoded
+
+    def unpack(self, data, pos):
+        length, pos = _read_varint(data, pos)
+        return bytes(data[pos : pos + length]).decode("utf-8"), pos + length
+
+
+class _UUIDField(_Field):
+    def pack(self, value, out):
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        out += value.bytes
+
+    def unpack(self, data, pos):
+        return uuid.UUID(bytes=bytes(data[pos : pos + 16])), pos + 16
+
+
+class _EnumField(_Field):
+    def __init__(self, enum_type):
+        self.enum_type = enum_type
+        self.members = list(enum_type)
+        self.indices = {member: i for i, member in enumerate(self.members)}
+
+    def pack(self, value, out):
+        if not isinstance(value, self.enum_type):
+            value = self.enum_type(value)
+        _write_varint(self.indices[value], out)
+
+    def unpack(self, data, pos):
+        i, pos = _read_varint(data, pos)
+        return self.members[i], pos
+
+
+class _OptionalField(_Field):
+    def __init__(self, field: _Field):
+        self.field = field
+
+    def pack(self, value, out):
+        if value is None:
+            out.append(0)
+        else:
+            out.append(1)
+            self.field.pack(value, out)
+
+    def unpack(self, data, pos):
+        if not data[pos]:
+            return None, pos + 1
+        return self.field.unpack(data, pos + 1)
+
+
+def _field_for(annotation):
+    if getattr(annotation, "__origin__", None) is Union:
+        types = [t for t in annotation.__args__ if t is not type(None)]  # noqa: E721
+        if len(types) == 1 and len(annotation.__args__) == 2:
+            return _OptionalField(_field_for(types[0]))
+        raise ValueError(f"Unsupported annotation for packed state: {annotation}")
+
+    if annotation is bool:
+        return _BoolField()
+    elif annotation is int:
+        return _IntField()
+    elif annotation is float:
+        return _FloatField()
+    elif annotation is uuid.UUID:
+        return _UUIDField()
+    elif inspect.isclass(annotation) and issubclass(annotation, enum.Enum):
+        return _EnumField(annotation)
+    elif annotation in [str, State, inspect.Parameter.empty]:
+        return _StrField()
+    else:
+        raise ValueError(f"Unsupported annotation for packed state: {annotation}")
+
+
+class StateCodec:
+    """
+    Packs the state arguments of a custom ID handler into a compact string.
+
+    By default, state is stored in the custom ID as newline-separated decimal
+    strings. A codec instead packs each argument into a dense binary form
+    based on the handler's type annotations, and encodes the result with
+    base85. A 64-bit snowflake takes 12 characters instead of 19, and a
+    UUID takes 20 characters instead of 36.
+
+    Supported annotations are ``int``, ``bool``, ``float``, ``str``,
+    :class:`uuid.UUID`, :class:`enum.Enum` subclasses, :class:`.State` and
+    ``Optional`` versions of these. Unannotated arguments are packed as
+    strings.
+
+    You normally don't create this yourself: pass ``packed=True`` to
+    :meth:`.DiscordInteractionsBlueprint.custom_handler` and use
+    :meth:`.DiscordInteractionsBlueprint.pack_custom_id` to build the ID.
+
+    Parameters
+    ----------
+    handler: Callable
+        The custom ID handler whose arguments should be packed.
+    """
+
+    def __init__(self, handler: Callable):
+        parameters = itertools.islice(
+            inspect.signature(handler).parameters.values(), 1, None
+        )
+        self.fields = [_field_for(parameter.annotation) for parameter in parameters]
+
+    def encode(self, *args):
+        """
+        Pack the given handler arguments into a string.
+
+        Parameters
+        ----------
+        *args
+            The arguments to pass to the handler, in order.
+
+        Returns
+        -------
+        str
+            The packed arguments.
+        """
+        if len(args) > len(self.fields):
+            raise ValueError(
+                f"Too many arguments: the handler accepts {len(self.fields)}"
+            )
+
+        out = bytearray()
+        for field, value in zip(self.fields, args):
+            field.pack(value, out)
+
+        return base64.b85encode(bytes(out)).decode("ascii")
+
+    def decode(self, text: str):
+        """
+        Unpack a string produced by :meth:`encode`.
+
+        Parameters
+        ----------
+        text: str
+            The packed arguments.
+
+        Returns
+        -------
+        list
+            The handler arguments.
+        """
+        data = base64.b85decode(text)
+        args = []
+        pos = 0
+
+        for field in self.fields:
+            if pos >= len(data):
+                break
+            value, pos = field.unpack(data, pos)
+            args.append(value)
+
+        return args
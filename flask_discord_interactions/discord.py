@@ -1,10 +1,12 @@
 import time
 import inspect
-from typing import Callable, Dict, List
-import uuid
+import contextvars
+from typing import Callable, Dict, List, Pattern, Union
 import atexit
 import asyncio
 import warnings
+import threading
+import concurrent.futures
 
 import requests
 
@@ -15,6 +17,27 @@ from nacl.signing import VerifyKey
 
 from flask_discord_interactions.models.autocomplete import AutocompleteResult
 from flask_discord_interactions.models.option import Option
+from flask_discord_interactions.cache import (
+    AutocompleteCache,
+    ResponseCache,
+    SingleFlight,
+)
+from flask_discord_interactions.state import StateStore, MemoryStateStore
+from flask_discord_interactions.metrics import (
+    MetricsSink,
+    collect,
+    phase,
+    set_labels,
+)
+from flask_discord_interactions.profiling import Profiler
+from flask_discord_interactions.journal import Journal
+from flask_discord_interactions.idempotency import IdempotencyCache
+from flask_discord_interactions import tracing
+from flask_discord_interactions.custom_id import (
+    CustomIDRouter,
+    StateCodec,
+    handler_id,
+)
 
 try:
     import aiohttp
@@ -22,9 +45,19 @@ except ImportError:
     aiohttp = None
 
 from flask_discord_interactions.command import Command, SlashCommandGroup
-from flask_discord_interactions.context import Context, ApplicationCommandType
-from flask_discord_interactions.models import Message, Modal, ResponseType, Permission
-from flask_discord_interactions.utils import static_or_instance
+from flask_discord_interactions.context import (
+    Context,
+    AsyncContext,
+    ApplicationCommandType,
+)
+from flask_discord_interactions.models import (
+    Message,
+    Modal,
+    ResponseType,
+    Permission,
+    EncodedResponse,
+)
+from flask_discord_interactions.utils import static_or_instance, snowflake_time
 
 
 class InteractionType:
@@ -35,6 +68,14 @@ class InteractionType:
     MODAL_SUBMIT = 5
 
 
+# Used to label metrics by interaction type
+_INTERACTION_TYPE_NAMES = {
+    value: name.lower()
+    for name, value in vars(InteractionType).items()
+    if not name.startswith("_")
+}
+
+
 class DiscordInteractionsBlueprint:
     """
     Represents a collection of :class:`ApplicationCommand` s.
@@ -45,7 +86,11 @@ class DiscordInteractionsBlueprint:
     def __init__(self):
         self.discord_commands = {}
         self.custom_id_handlers = {}
+        self.custom_id_codecs = {}
+        self.custom_id_routes = CustomIDRouter()
         self.autocomplete_handlers = {}
+        self.autocomplete_caches = {}
+        self.autocomplete_timeouts = {}
 
     def add_command(
         self,
@@ -60,6 +105,7 @@ class DiscordInteractionsBlueprint:
         dm_permission: bool = None,
         name_localizations: Dict[str, str] = None,
         description_localizations: Dict[str, str] = None,
+        cache: ResponseCache = None,
     ):
         """
         Create and add a new :class:`ApplicationCommand`.
@@ -88,7 +134,16 @@ class DiscordInteractionsBlueprint:
             A permission integer defining the required permissions a user must have to run the command.
         dm_permission: bool
             Indicates whether the command can be used in DMs.
+        cache: ResponseCache
+            A :class:`.ResponseCache` used to store the encoded responses of
+            the command, or ``True`` to use one with the default settings.
+            Only use this if the response depends on nothing but the options.
         """
+        if cache is True:
+            cache = ResponseCache()
+        elif cache is False:
+            cache = None
+
         command = Command(
             command=command,
             name=name,
@@ -101,6 +156,7 @@ class DiscordInteractionsBlueprint:
             name_localizations=name_localizations,
             description_localizations=description_localizations,
             discord=self,
+            cache=cache,
         )
         self.discord_commands[command.name] = command
         return command
@@ -117,6 +173,7 @@ class DiscordInteractionsBlueprint:
         dm_permission: bool = None,
         name_localizations: Dict[str, str] = None,
         description_localizations: Dict[str, str] = None,
+        cache: ResponseCache = None,
     ):
         """
         Decorator to create a new :class:`Command`.
@@ -143,6 +200,9 @@ class DiscordInteractionsBlueprint:
             A permission integer defining the required permissions a user must have to run the command
         dm_permission: bool
             Indicates whether the command can be used in DMs
+        cache: ResponseCache
+            A :class:`.ResponseCache` used to store the encoded responses of
+            the command, or ``True`` to use one with the default settings.
 
         Returns
         -------
@@ -162,6 +222,7 @@ class DiscordInteractionsBlueprint:
                 dm_permission=dm_permission,
                 name_localizations=name_localizations,
                 description_localizations=description_localizations,
+                cache=cache,
             )
             return command
 
@@ -218,7 +279,13 @@ class DiscordInteractionsBlueprint:
         self.discord_commands[name] = group
         return group
 
-    def add_custom_handler(self, handler: Callable, custom_id: str = None):
+    def add_custom_handler(
+        self,
+        handler: Callable,
+        custom_id: Union[str, Pattern] = None,
+        *,
+        packed: bool = False,
+    ):
         """
         Add a handler for an incoming interaction with the specified custom ID.
 
@@ -226,9 +293,20 @@ class DiscordInteractionsBlueprint:
         ----------
         handler: Callable
             The function to call to handle the incoming interaction.
-        custom_id: str
-            The custom ID to respond to. If not specified, the ID will be
-            generated randomly.
+        custom_id: Union[str, re.Pattern]
+            The custom ID to respond to. If not specified, a short ID is
+            derived from the handler's module and qualified name, so that it
+            is the same across workers and restarts.
+
+            A string ending with ``*`` (e.g. ``"page:*"``) responds to every
+            custom ID starting with that prefix, and a compiled regular
+            expression responds to every custom ID it fully matches (see
+            :class:`.CustomIDRouter`). Exact custom IDs take precedence over
+            patterns.
+        packed: bool
+            Whether the handler's state is packed into a compact binary form
+            based on its type annotations (see :class:`.StateCodec`). Build
+            custom IDs for packed handlers with :meth:`pack_custom_id`.
 
         Returns
         -------
@@ -236,20 +314,48 @@ class DiscordInteractionsBlueprint:
             The custom ID that the handler will respond to.
         """
         if custom_id is None:
-            custom_id = str(uuid.uuid4())
+            custom_id = handler_id(handler)
+
+            existing = self.custom_id_handlers.get(custom_id)
+            if existing is not None and existing is not handler:
+                raise ValueError(
+                    f"Error adding custom ID handler {handler.__qualname__}: "
+                    f"the generated ID {custom_id} is already used by "
+                    f"{existing.__qualname__}. (Is the handler defined more "
+                    "than once, e.g. in a loop?) Pass an explicit custom_id."
+                )
+
+        if CustomIDRouter.is_pattern(custom_id):
+            if packed:
+                raise ValueError("Pattern custom IDs cannot be packed.")
+
+            self.custom_id_routes.add(custom_id, handler)
+            return custom_id
 
         self.custom_id_handlers[custom_id] = handler
+
+        if packed:
+            self.custom_id_codecs[custom_id] = StateCodec(handler)
+        else:
+            self.custom_id_codecs.pop(custom_id, None)
+
         return custom_id
 
-    def custom_handler(self, custom_id: str = None):
+    def custom_handler(
+        self, custom_id: Union[str, Pattern] = None, *, packed: bool = False
+    ):
         """
         Returns a decorator to register a handler for a custom ID.
 
         Parameters
         ----------
         custom_id
-            The custom ID to respond to. If not specified, the ID will be
-            generated randomly.
+            The custom ID to respond to. If not specified, a short ID is
+            derived from the handler's qualified name. May also be a prefix
+            pattern or regular expression (see :meth:`add_custom_handler`).
+        packed
+            Whether the handler's state is packed into a compact binary form
+            (see :meth:`add_custom_handler`).
 
         Returns
         -------
@@ -258,24 +364,111 @@ class DiscordInteractionsBlueprint:
 
         def decorator(func):
             nonlocal custom_id
-            custom_id = self.add_custom_handler(func, custom_id)
+            custom_id = self.add_custom_handler(func, custom_id, packed=packed)
             return custom_id
 
         return decorator
 
-    def add_autocomplete_handler(self, handler: Callable, command_name: str):
+    def pack_custom_id(self, custom_id: str, *args):
+        """
+        Build a custom ID for a handler registered with ``packed=True``,
+        packing the given state into as few characters as possible.
+
+        .. code-block:: python
+
+            @discord.custom_handler(packed=True)
+            def handle_vote(ctx, poll: uuid.UUID, user_id: int, choice: Color):
+                ...
+
+            Button(custom_id=discord.pack_custom_id(handle_vote, poll, 1234, Color.RED))
+
+        Parameters
+        ----------
+        custom_id: str
+            The custom ID of the handler.
+        *args
+            The state to pass to the handler.
+
+        Returns
+        -------
+        str
+            The custom ID, including the packed state.
+        """
+        codec = self.custom_id_codecs.get(custom_id)
+        if codec is None:
+            raise ValueError(f"Handler {custom_id} was not registered as packed.")
+
+        return f"{custom_id}\n{codec.encode(*args)}"
+
+    def get_custom_handler(self, custom_id: str):
+        """
+        Find the handler for a primary custom ID, trying exact custom IDs
+        first and then prefix and regular expression patterns.
+
+        Parameters
+        ----------
+        custom_id: str
+            The primary custom ID (without any handler state).
+
+        Returns
+        -------
+        Callable
+            The custom ID handler.
+        """
+        handler = self.custom_id_handlers.get(custom_id)
+        if handler is None:
+            handler = self.custom_id_routes.match(custom_id)
+
+        if handler is None:
+            raise ValueError(f"Invalid custom ID: {custom_id}")
+
+        return handler
+
+    def add_autocomplete_handler(
+        self,
+        handler: Callable,
+        command_name: str,
+        *,
+        cache: AutocompleteCache = None,
+        timeout: float = None,
+    ):
         """
         Add a handler for an incoming autocomplete request.
 
         Parameters
         ----------
         handler: Callable
-            The function to call to handle the incoming autocomplete request.
+            The function (or coroutine function) to call to handle the
+            incoming autocomplete request.
         command_name: str
             The name of the command to autocomplete.
+        cache: AutocompleteCache
+            An :class:`.AutocompleteCache` used to store the encoded results
+            of this handler. Pass ``True`` to use a cache with the default
+            settings. If omitted, the handler runs on every request.
+        timeout: float
+            The number of seconds the handler may take. If it overruns, the
+            last cached result (or an empty result) is returned instead, so
+            that Discord does not time out the request. Synchronous handlers
+            with a timeout run in a worker thread.
         """
+        if cache is True:
+            cache = AutocompleteCache()
+        elif cache is False:
+            cache = None
+
         self.autocomplete_handlers[command_name] = handler
 
+        if cache is not None:
+            self.autocomplete_caches[command_name] = cache
+        else:
+            self.autocomplete_caches.pop(command_name, None)
+
+        if timeout is not None:
+            self.autocomplete_timeouts[command_name] = timeout
+        else:
+            self.autocomplete_timeouts.pop(command_name, None)
+
 
 class DiscordInteractions(DiscordInteractionsBlueprint):
     """
@@ -287,12 +480,46 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
     ----------
     app: Flask
         The Flask application to bind to.
+    state_store: StateStore
+        The :class:`.StateStore` used for server-side component state
+        (available as :attr:`.Context.state`). Defaults to a
+        :class:`.MemoryStateStore`.
+    metrics: MetricsSink
+        A :class:`.MetricsSink` that receives the time spent in each phase of
+        handling every interaction, and the duration of followup requests.
+        If omitted, no timings are collected.
+    profiler: Profiler
+        A :class:`.Profiler` that samples the call stacks of slow or randomly
+        selected interactions.
+    journal: Journal
+        A :class:`.Journal` that records every interaction handled, to
+        replay later.
+    idempotency: IdempotencyCache
+        An :class:`.IdempotencyCache` that stops duplicate deliveries of an
+        interaction from running its command again.
     """
 
-    def __init__(self, app: Flask = None):
+    def __init__(
+        self,
+        app: Flask = None,
+        *,
+        state_store: StateStore = None,
+        metrics: MetricsSink = None,
+        profiler: Profiler = None,
+        journal: Journal = None,
+        idempotency: IdempotencyCache = None,
+    ):
         super().__init__()
 
         self.app = app
+        self.state_store = state_store or MemoryStateStore()
+        self.metrics = metrics
+        self.profiler = profiler
+        self.journal = journal
+        self.idempotency = idempotency
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._autocomplete_flights = SingleFlight()
         if app is not None:
             self.init_app(app)
 
@@ -314,9 +541,15 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
         app.config.setdefault("DISCORD_SCOPE", "applications.commands.update")
         app.config.setdefault("DONT_VALIDATE_SIGNATURE", False)
         app.config.setdefault("DONT_REGISTER_WITH_DISCORD", False)
+        app.config.setdefault("DISCORD_SERVER_TIMING", False)
+        app.config.setdefault("DISCORD_MAX_INTERACTION_AGE", None)
         app.discord_commands = self.discord_commands
         app.custom_id_handlers = self.custom_id_handlers
+        app.custom_id_codecs = self.custom_id_codecs
+        app.custom_id_routes = self.custom_id_routes
         app.autocomplete_handlers = self.autocomplete_handlers
+        app.autocomplete_caches = self.autocomplete_caches
+        app.autocomplete_timeouts = self.autocomplete_timeouts
         app.discord_token = None
 
     @static_or_instance
@@ -347,15 +580,19 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
             )
             return
 
-        response = requests.post(
-            app.config["DISCORD_BASE_URL"] + "/oauth2/token",
-            data={
-                "grant_type": "client_credentials",
-                "scope": app.config["DISCORD_SCOPE"],
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-            auth=(app.config["DISCORD_CLIENT_ID"], app.config["DISCORD_CLIENT_SECRET"]),
-        )
+        with tracing.span("discord.fetch_token"):
+            response = requests.post(
+                app.config["DISCORD_BASE_URL"] + "/oauth2/token",
+                data={
+                    "grant_type": "client_credentials",
+                    "scope": app.config["DISCORD_SCOPE"],
+                },
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                auth=(
+                    app.config["DISCORD_CLIENT_ID"],
+                    app.config["DISCORD_CLIENT_SECRET"],
+                ),
+            )
 
         response.raise_for_status()
         app.discord_token = response.json()
@@ -421,9 +658,12 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
         overwrite_data = [command.dump() for command in app.discord_commands.values()]
 
         if not app.config["DONT_REGISTER_WITH_DISCORD"]:
-            response = requests.put(
-                url, json=overwrite_data, headers=self.auth_headers(app)
-            )
+            with tracing.span(
+                "discord.update_commands", {"discord.guild.id": guild_id}
+            ):
+                response = requests.put(
+                    url, json=overwrite_data, headers=self.auth_headers(app)
+                )
 
             try:
                 response.raise_for_status()
@@ -575,10 +815,10 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
             base_url=base_url,
         )
 
-        response = requests.get(
-            url,
-            headers=auth,
-        )
+        with tracing.span(
+            "discord.get_permission_overwrites", {"discord.guild.id": guild_id}
+        ):
+            response = requests.get(url, headers=auth)
         response.raise_for_status()
 
         return [Permission.from_dict(perm) for perm in response.json()]
@@ -636,11 +876,14 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
             base_url=base_url,
         )
 
-        response = requests.put(
-            url,
-            headers=auth,
-            json={"permissions": [perm.dump() for perm in permissions]},
-        )
+        with tracing.span(
+            "discord.set_permission_overwrites", {"discord.guild.id": guild_id}
+        ):
+            response = requests.put(
+                url,
+                headers=auth,
+                json={"permissions": [perm.dump() for perm in permissions]},
+            )
         response.raise_for_status()
 
     def throttle(self, response: requests.Response):
@@ -690,7 +933,11 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
 
         app.discord_commands.update(blueprint.discord_commands)
         app.custom_id_handlers.update(blueprint.custom_id_handlers)
+        app.custom_id_codecs.update(blueprint.custom_id_codecs)
+        app.custom_id_routes.update(blueprint.custom_id_routes)
         app.autocomplete_handlers.update(blueprint.autocomplete_handlers)
+        app.autocomplete_caches.update(blueprint.autocomplete_caches)
+        app.autocomplete_timeouts.update(blueprint.autocomplete_timeouts)
 
     def run_command(self, data: dict):
         """
@@ -709,6 +956,7 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
         """
 
         command_name = data["data"]["name"]
+        set_labels(command=command_name)
 
         command = current_app.discord_commands.get(command_name)
 
@@ -722,6 +970,9 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
         Run the corresponding custom ID handler given incoming interaction
         data.
 
+        If the handler is a coroutine function, it receives an
+        :class:`.AsyncContext` and a coroutine is returned.
+
         Parameters
         ----------
         data
@@ -733,11 +984,34 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
             The resulting message.
         """
 
-        context = Context.from_data(self, current_app, data)
-        handler = self.custom_id_handlers[context.primary_id]
-        args = context.create_handler_args(handler)
-        result = handler(context, *args)
+        primary_id = (data["data"].get("custom_id") or "").split("\n", 1)[0]
+        handler = self.get_custom_handler(primary_id)
+        set_labels(command=handler.__name__)
+
+        with phase("context"):
+            if inspect.iscoroutinefunction(handler):
+                context = AsyncContext.from_data(self, current_app, data)
+            else:
+                context = Context.from_data(self, current_app, data)
+
+            args = context.create_handler_args(handler)
+
+        with phase("command"):
+            result = tracing.call(
+                "discord.custom_handler",
+                handler,
+                (context, *args),
+                attributes={"discord.handler.name": handler.__name__},
+                interaction_id=context.id,
+            )
 
+        if inspect.isawaitable(result):
+            return self._finish_handler_async(result, allow_modal)
+
+        return self._finish_handler(result, allow_modal)
+
+    @staticmethod
+    def _finish_handler(result, allow_modal: bool):
         if isinstance(result, Modal):
             if allow_modal:
                 return result
@@ -746,11 +1020,21 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
 
         return Message.from_return_value(result)
 
+    async def _finish_handler_async(self, result, allow_modal: bool):
+        return self._finish_handler(await result, allow_modal)
+
     def run_autocomplete(self, data: dict):
         """
         Run the corresponding autocomplete handler given incoming interaction
         data.
 
+        If the handler is a coroutine function, it receives an
+        :class:`.AsyncContext` and a coroutine is returned.
+
+        If the handler has a cache, concurrent identical requests are
+        coalesced: they share a single run of the handler and its encoded
+        result.
+
         Parameters
         ----------
         data
@@ -758,21 +1042,145 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
 
         Returns
         -------
-        AutocompleteResult
-            The result of the autocomplete handler.
+        Union[AutocompleteResult, EncodedResponse]
+            The result of the autocomplete handler. If the handler has a
+            cache, this is the encoded result.
         """
 
-        context = Context.from_data(self, current_app, data)
-        handler = self.autocomplete_handlers[context.command_name]
+        command_name = data["data"]["name"]
+        cache = self.autocomplete_caches.get(command_name)
+        key = None
+
+        if cache is not None:
+            key = cache.make_key(data)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        handler = self.autocomplete_handlers[command_name]
+        timeout = self.autocomplete_timeouts.get(command_name)
+        app = current_app._get_current_object()
+
+        if inspect.iscoroutinefunction(handler):
+            context = AsyncContext.from_data(self, app, data)
+            return self._run_autocomplete_async(
+                handler, context, command_name, cache, key, timeout
+            )
+
+        def run():
+            context = Context.from_data(self, app, data)
+            return self._call_autocomplete(handler, context, cache, key)
+
+        if timeout is None:
+            if cache is None:
+                return run()
+            return self._autocomplete_flights.run(key, run)
+
+        def start():
+            # Copy the context so that spans in the handler have the right parent
+            return self._get_executor().submit(
+                contextvars.copy_context().run, self._call_in_app_context, app, run
+            )
+
+        if cache is None:
+            future = start()
+        else:
+            future = self._autocomplete_flights.future(key, start)
+
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            return self._autocomplete_deadline_exceeded(command_name, cache, key)
+
+    async def _run_autocomplete_async(
+        self, handler, context, command_name, cache, key, timeout
+    ):
+        def start():
+            return asyncio.ensure_future(
+                self._call_autocomplete_async(handler, context, cache, key)
+            )
+
+        if cache is None:
+            task = start()
+        else:
+            loop = asyncio.get_event_loop()
+            task = self._autocomplete_flights.future((loop, key), start)
+
+        try:
+            # Shield the task so that one caller timing out doesn't cancel
+            # it for every other caller waiting on the same result
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            if cache is None:
+                task.cancel()
+            return self._autocomplete_deadline_exceeded(command_name, cache, key)
+
+    def _call_autocomplete(self, handler, context, cache, key):
+        args = context.create_autocomplete_args()
+        result = tracing.call(
+            "discord.autocomplete",
+            handler,
+            (context, *args),
+            attributes={"discord.command.name": context.command_name},
+            interaction_id=context.id,
+        )
+        return self._finish_autocomplete(result, cache, key)
+
+    async def _call_autocomplete_async(self, handler, context, cache, key):
         args = context.create_autocomplete_args()
-        result = handler(context, *args)
+        result = await tracing.call(
+            "discord.autocomplete",
+            handler,
+            (context, *args),
+            attributes={"discord.command.name": context.command_name},
+            interaction_id=context.id,
+        )
+        return self._finish_autocomplete(result, cache, key)
 
-        return AutocompleteResult.from_return_value(result)
+    @staticmethod
+    def _finish_autocomplete(result, cache: AutocompleteCache, key):
+        result = AutocompleteResult.from_return_value(result)
+
+        if cache is not None:
+            result = EncodedResponse.from_response(result)
+            cache.set(key, result)
+
+        return result
+
+    @staticmethod
+    def _autocomplete_deadline_exceeded(command_name, cache: AutocompleteCache, key):
+        warnings.warn(f"Autocomplete handler for {command_name} exceeded its deadline.")
+
+        if cache is not None:
+            stale = cache.get(key, stale=True)
+            if stale is not None:
+                return stale
+
+        return AutocompleteResult([])
+
+    @staticmethod
+    def _call_in_app_context(app: Flask, func: Callable, *args):
+        with app.app_context():
+            return func(*args)
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    thread_name_prefix="discord-interactions"
+                )
+            return self._executor
 
     def verify_signature(self, request):
         """
         Verify the signature sent by Discord with incoming interactions.
 
+        If the ``DISCORD_MAX_INTERACTION_AGE`` config option is set, also
+        reject interactions signed more than that many seconds ago, such as
+        those that sat in a queue past Discord's response window. Each
+        rejected interaction's age is reported to the metrics sink as
+        ``stale_interaction_seconds``.
+
         Parameters
         ----------
         request
@@ -788,15 +1196,33 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
         if signature is None or timestamp is None:
             abort(401, "Missing signature or timestamp")
 
-        message = timestamp.encode() + request.data
-        verify_key = VerifyKey(bytes.fromhex(current_app.config["DISCORD_PUBLIC_KEY"]))
-        try:
-            verify_key.verify(message, bytes.fromhex(signature))
-        except BadSignatureError:
-            abort(401, "Incorrect Signature")
-
-        if not request.json:
-            abort(400, "Request JSON required")
+        with phase("verify"), tracing.span("discord.verify_signature"):
+            message = timestamp.encode() + request.data
+            verify_key = VerifyKey(
+                bytes.fromhex(current_app.config["DISCORD_PUBLIC_KEY"])
+            )
+            try:
+                verify_key.verify(message, bytes.fromhex(signature))
+            except BadSignatureError:
+                abort(401, "Incorrect Signature")
+
+        max_age = current_app.config["DISCORD_MAX_INTERACTION_AGE"]
+        if max_age is not None:
+            if not timestamp.isdigit():
+                abort(400, "Invalid signature timestamp")
+
+            # The timestamp only has second precision
+            # Timestamps from the future are rejected too, e.g. if the clocks
+            # are out of sync
+            age = abs(time.time() - int(timestamp))
+            if age > max_age:
+                if self.metrics is not None:
+                    self.metrics.observe("stale_interaction_seconds", age, {})
+                abort(401, "Stale signature timestamp")
+
+        with phase("parse"):
+            if not request.json:
+                abort(400, "Request JSON required")
 
     def handle_request(self):
         """
@@ -810,21 +1236,143 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
         """
         self.verify_signature(request)
 
-        interaction_type = request.json.get("type")
+        # Already parsed (and timed) if the signature was verified
+        with phase("parse"):
+            data = request.json
+
+        interaction_type = data.get("type")
+        set_labels(type=_INTERACTION_TYPE_NAMES.get(interaction_type, "unknown"))
+
+        interaction_id = data.get("id")
+        claimed = False
+        if (
+            self.idempotency is not None
+            and interaction_type != InteractionType.PING
+            and interaction_id is not None
+        ):
+            with phase("deduplicate"):
+                claimed = self.idempotency.claim(interaction_id)
+                if not claimed:
+                    response = self.idempotency.get(interaction_id)
+                    if response is None:
+                        abort(409, "Duplicate interaction")
+                    return response
+
         if interaction_type == InteractionType.PING:
             abort(jsonify({"type": ResponseType.PONG}))
-        elif interaction_type == InteractionType.APPLICATION_COMMAND:
-            return self.run_command(request.json)
-        elif interaction_type == InteractionType.MESSAGE_COMPONENT:
-            return self.run_handler(request.json)
-        elif interaction_type == InteractionType.APPLICATION_COMMAND_AUTOCOMPLETE:
-            return self.run_autocomplete(request.json)
-        elif interaction_type == InteractionType.MODAL_SUBMIT:
-            return self.run_handler(request.json, allow_modal=False)
-        else:
-            raise RuntimeWarning(
-                f"Interaction type {interaction_type} is not yet supported"
-            )
+
+        try:
+            if interaction_type == InteractionType.APPLICATION_COMMAND:
+                result = self.run_command(data)
+            elif interaction_type == InteractionType.MESSAGE_COMPONENT:
+                result = self.run_handler(data)
+            elif interaction_type == InteractionType.APPLICATION_COMMAND_AUTOCOMPLETE:
+                set_labels(command=data["data"]["name"])
+                with phase("command"):
+                    result = self.run_autocomplete(data)
+            elif interaction_type == InteractionType.MODAL_SUBMIT:
+                result = self.run_handler(data, allow_modal=False)
+            else:
+                raise RuntimeWarning(
+                    f"Interaction type {interaction_type} is not yet supported"
+                )
+        except Exception:
+            # Let a retry of the failed interaction run again
+            if claimed:
+                self.idempotency.release(interaction_id)
+            raise
+
+        if claimed and inspect.isawaitable(result):
+            return self._release_on_error(result, interaction_id)
+
+        return result
+
+    async def _release_on_error(self, result, interaction_id: str):
+        try:
+            return await result
+        except Exception:
+            self.idempotency.release(interaction_id)
+            raise
+
+    def record_journal(self, timings, response: bytes):
+        """
+        Record the current request to the :class:`.Journal`, if there is
+        one.
+
+        Parameters
+        ----------
+        timings: Timings
+            The timings collected while handling the request.
+        response: bytes
+            The encoded response body.
+        """
+        if self.journal is None:
+            return
+
+        self.journal.record(
+            request.json,
+            signature_timestamp=request.headers.get("X-Signature-Timestamp"),
+            timings=timings,
+            response_size=len(response),
+        )
+
+    def remember_response(self, response: bytes, mimetype: str):
+        """
+        Store the response to the current request in the
+        :class:`.IdempotencyCache`, if there is one, to send again if the
+        interaction is delivered twice.
+
+        Parameters
+        ----------
+        response: bytes
+            The encoded response body.
+        mimetype: str
+            The mimetype of the response body.
+        """
+        if self.idempotency is None:
+            return
+
+        interaction_id = request.json.get("id")
+        if interaction_id is not None:
+            self.idempotency.set(interaction_id, response, mimetype)
+
+    @staticmethod
+    def server_timing_headers(timings):
+        """
+        Return the ``Server-Timing`` header for the response to the current
+        request, if enabled with the ``DISCORD_SERVER_TIMING`` config option.
+
+        Besides each phase and the ``total``, the header includes the
+        ``age`` of the interaction (since the time in its snowflake ID) and
+        the ``signature_age`` (since the ``X-Signature-Timestamp``, which
+        only has second precision). Both are measured against the local
+        clock.
+
+        Parameters
+        ----------
+        timings: Timings
+            The timings collected while handling the request.
+
+        Returns
+        -------
+        dict
+            The headers, or ``None`` if disabled.
+        """
+        if timings is None or not current_app.config["DISCORD_SERVER_TIMING"]:
+            return None
+
+        now = time.time()
+        ages = {}
+
+        created_at = snowflake_time(request.json.get("id"))
+        if created_at is not None:
+            ages["age"] = now - created_at
+
+        signed_at = request.headers.get("X-Signature-Timestamp")
+        if signed_at is not None and signed_at.isdigit():
+            ages["signature_age"] = now - int(signed_at)
+
+        return {"Server-Timing": timings.server_timing(**ages)}
 
     def set_route(self, route: str, app: Flask = None):
         """
@@ -847,9 +1395,19 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
 
         @app.route(route, methods=["POST"])
         def interactions():
-            result = self.handle_request()
-            response, mimetype = result.encode()
-            return Response(response, mimetype=mimetype)
+            always = (
+                current_app.config["DISCORD_SERVER_TIMING"] or self.journal is not None
+            )
+            with collect(
+                self.metrics, always=always, profiler=self.profiler
+            ) as timings:
+                result = self.handle_request()
+                with phase("encode"):
+                    response, mimetype = result.encode()
+                self.record_journal(timings, response)
+                self.remember_response(response, mimetype)
+                headers = self.server_timing_headers(timings)
+            return Response(response, mimetype=mimetype, headers=headers)
 
     def set_route_async(self, route: str, app: Flask = None):
         """
@@ -877,13 +1435,24 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
 
         @app.route(route, methods=["POST"])
         async def interactions():
-            result = self.handle_request()
-
-            if inspect.isawaitable(result):
-                result = await result
-
-            response, mimetype = result.encode()
-            return Response(response, mimetype=mimetype)
+            always = (
+                current_app.config["DISCORD_SERVER_TIMING"] or self.journal is not None
+            )
+            with collect(
+                self.metrics, always=always, profiler=self.profiler
+            ) as timings:
+                result = self.handle_request()
+
+                if inspect.isawaitable(result):
+                    with phase("command"):
+                        result = await result
+
+                with phase("encode"):
+                    response, mimetype = result.encode()
+                self.record_journal(timings, response)
+                self.remember_response(response, mimetype)
+                headers = self.server_timing_headers(timings)
+            return Response(response, mimetype=mimetype, headers=headers)
 
         # Set up the aiohttp ClientSession
 
@@ -891,9 +1460,12 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
             app.discord_client_session = aiohttp.ClientSession(
                 headers=self.auth_headers(app), raise_for_status=True
             )
+            # Attachment downloads don't need (and shouldn't send) credentials
+            app.discord_download_session = aiohttp.ClientSession()
 
         async def close_session():
             await app.discord_client_session.close()
+            await app.discord_download_session.close()
 
         if hasattr(app, "before_serving"):
             # Quart apps
@@ -905,3 +1477,32 @@ class DiscordInteractions(DiscordInteractionsBlueprint):
             atexit.register(
                 lambda: asyncio.get_event_loop().run_until_complete(close_session())
             )
+
+    def set_metrics_route(self, route: str, app: Flask = None):
+        """
+        Add a route to the Flask app that exposes the collected metrics in
+        the Prometheus text format.
+
+        Parameters
+        ----------
+        route: str
+            The URL path to expose metrics on.
+        app: Flask
+            The Flask app to add the route to.
+        """
+
+        if app is None:
+            app = self.app
+
+        if not hasattr(self.metrics, "render_prometheus"):
+            raise ValueError(
+                "The metrics sink must be able to render Prometheus metrics, "
+                "e.g. an InMemoryMetrics."
+            )
+
+        @app.route(route, methods=["GET"])
+        def metrics():
+            return Response(
+                self.metrics.render_prometheus(),
+                mimetype="text/plain; version=0.0.4",
+            )
@@ -0,0 +1,378 @@
+import json
+import time
+import random
+import hashlib
+import argparse
+import itertools
+import threading
+from typing import Tuple, Union
+
+from flask import Flask, request, jsonify, abort, g
+
+from flask_discord_interactions.utils import make_snowflake
+
+
+class DiscordEmulator:
+    """
+    Emulates the OAuth2, application command, command permission and
+    interaction webhook routes of the Discord API, including its rate
+    limits.
+
+    Each route has a rate limit bucket, shared between requests for the same
+    application, guild or interaction token, like Discord's per-route
+    limits. Every response carries the ``X-RateLimit-*`` headers. Requests
+    beyond a bucket's limit, or beyond the global limit, get a ``429`` with
+    a ``retry_after``.
+
+    Run it in-process for tests and benchmarks:
+
+    .. code-block:: python
+
+        with DiscordEmulator(latency=0.05) as emulator:
+            app.config["DISCORD_BASE_URL"] = emulator.base_url
+            ...
+
+    or on its own, and point ``DISCORD_BASE_URL`` at it::
+
+        python -m flask_discord_interactions.emulator --port 8000
+
+    Parameters
+    ----------
+    latency: Union[float, Tuple[float, float]]
+        The number of seconds to wait before handling each request, or a
+        range to pick a random delay from.
+    bucket_limit: int
+        The number of requests allowed per bucket in each window.
+    bucket_window: float
+        The length of a bucket's window, in seconds.
+    global_limit: int
+        The number of requests allowed per second across all routes.
+        ``None`` to disable the global limit.
+
+    Attributes
+    ----------
+    commands: dict
+        The registered commands, by guild ID (``None`` for global commands)
+        and command name.
+    messages: dict
+        The messages sent through each interaction token, by message ID.
+        The original response is stored as ``"@original"``.
+    permissions: dict
+        The permission overwrites, by guild ID and command ID.
+    requests: list
+        A ``(method, path, status)`` tuple for every request received.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: Union[float, Tuple[float, float]] = 0,
+        bucket_limit: int = 5,
+        bucket_window: float = 2.0,
+        global_limit: int = 50,
+    ):
+        self.latency = latency
+        self.bucket_limit = bucket_limit
+        self.bucket_window = bucket_window
+        self.global_limit = global_limit
+
+        self.commands = {}
+        self.messages = {}
+        self.permissions = {}
+        self.requests = []
+
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.global_window = [0.0, 0]
+        self.counter = itertools.count()
+
+        self.app = self.create_app()
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        "The URL to set as ``DISCORD_BASE_URL`` while the server is running."
+        if self.server is None:
+            raise ValueError("The emulator is not running.")
+        return f"http://{self.server.host}:{self.server.port}/api/v10"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Serve the emulator from a background thread.
+
+        Parameters
+        ----------
+        host: str
+            The address to listen on.
+        port: int
+            The port to listen on. By default, a free port is picked.
+
+        Returns
+        -------
+        str
+            The :attr:`base_url`.
+        """
+        from werkzeug.serving import make_server
+
+        self.server = make_server(host, port, self.app, threaded=True)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name="discord-emulator", daemon=True
+        )
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        "Stop the background server."
+        if self.server is not None:
+            self.server.shutdown()
+            self.thread.join()
+            self.server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def snowflake(self):
+        return make_snowflake(increment=next(self.counter))
+
+    def _rate_limit(self, bucket: str):
+        now = time.time()
+
+        with self.lock:
+            if self.global_limit is not None:
+                if now - self.global_window[0] >= 1:
+                    self.global_window[:] = [now, 0]
+                if self.global_window[1] >= self.global_limit:
+                    retry_after = self.global_window[0] + 1 - now
+                    response = jsonify(
+                        {
+                            "message": "You are being rate limited.",
+                            "retry_after": retry_after,
+                            "global": True,
+                        }
+                    )
+                    response.status_code = 429
+                    response.headers["Retry-After"] = str(retry_after)
+                    response.headers["X-RateLimit-Global"] = "true"
+                    response.headers["X-RateLimit-Scope"] = "global"
+                    return response, {}
+                self.global_window[1] += 1
+
+            window = self.buckets.get(bucket)
+            if window is None or now >= window[0]:
+                window = self.buckets[bucket] = [now + self.bucket_window, 0]
+
+            reset, count = window
+            headers = {
+                "X-RateLimit-Limit": str(self.bucket_limit),
+                "X-RateLimit-Remaining": str(max(self.bucket_limit - count - 1, 0)),
+                "X-RateLimit-Reset": f"{reset:.3f}",
+                "X-RateLimit-Reset-After": f"{reset - now:.3f}",
+                "X-RateLimit-Bucket": hashlib.md5(
+                    bucket.split(":", 1)[0].encode()
+                ).hexdigest(),
+            }
+
+            if count >= self.bucket_limit:
+                response = jsonify(
+                    {
+                        "message": "You are being rate limited.",
+                        "retry_after": reset - now,
+                        "global": False,
+                    }
+                )
+                response.status_code = 429
+                response.headers["Retry-After"] = f"{reset - now:.3f}"
+                response.headers["X-RateLimit-Scope"] = "user"
+                return response, headers
+
+            window[1] += 1
+            return None, headers
+
+    def create_app(self):
+        "Create the Flask app serving the emulated API."
+        app = Flask(__name__)
+
+        @app.before_request
+        def before_request():
+            if isinstance(self.latency, tuple):
+                time.sleep(random.uniform(*self.latency))
+            elif self.latency:
+                time.sleep(self.latency)
+
+            if request.url_rule is None:
+                return None
+
+            # Requests to the same route share a bucket if their "major
+            # parameter" (application, guild or interaction token) matches
+            args = request.view_args
+            major = (
+                args.get("token")
+                or args.get("guild_id")
+                or args.get("application_id", "")
+            )
+            bucket = f"{request.method} {request.url_rule.rule}:{major}"
+
+            response, g.rate_limit_headers = self._rate_limit(bucket)
+            return response
+
+        @app.after_request
+        def after_request(response):
+            response.headers.update(g.get("rate_limit_headers", {}))
+            with self.lock:
+                self.requests.append(
+                    (request.method, request.path, response.status_code)
+                )
+            return response
+
+        def require_auth():
+            if not request.headers.get("Authorization"):
+                abort(401)
+
+        @app.route("/api/v10/oauth2/token", methods=["POST"])
+        def token():
+            if request.authorization is None:
+                abort(401)
+
+            return jsonify(
+                access_token=self.snowflake(),
+                token_type="Bearer",
+                expires_in=604800,
+                scope=request.form.get("scope", "applications.commands.update"),
+            )
+
+        def commands_view(application_id, guild_id=None):
+            require_auth()
+
+            if request.method == "PUT":
+                commands = {}
+                for command in request.get_json():
+                    command = dict(
+                        command,
+                        id=self.snowflake(),
+                        application_id=application_id,
+                        version=self.snowflake(),
+                    )
+                    if guild_id is not None:
+                        command["guild_id"] = guild_id
+                    commands[command["name"]] = command
+
+                with self.lock:
+                    self.commands[guild_id] = commands
+
+            return jsonify(list(self.commands.get(guild_id, {}).values()))
+
+        app.add_url_rule(
+            "/api/v10/applications/<application_id>/commands",
+            "global_commands",
+            commands_view,
+            methods=["GET", "PUT"],
+        )
+        app.add_url_rule(
+            "/api/v10/applications/<application_id>/guilds/<guild_id>/commands",
+            "guild_commands",
+            commands_view,
+            methods=["GET", "PUT"],
+        )
+
+        @app.route(
+            "/api/v10/applications/<application_id>/guilds/<guild_id>"
+            "/commands/<command_id>/permissions",
+            methods=["GET", "PUT"],
+        )
+        def permissions(application_id, guild_id, command_id):
+            require_auth()
+
+            key = (guild_id, command_id)
+            if request.method == "PUT":
+                with self.lock:
+                    self.permissions[key] = request.get_json()["permissions"]
+
+            return jsonify(self.permissions.get(key, []))
+
+        def message_payload():
+            if request.mimetype == "multipart/form-data":
+                data = json.loads(request.form["payload_json"])
+                data["attachments"] = [
+                    {
+                        "id": str(i),
+                        "filename": file.filename,
+                        "size": len(file.read()),
+                    }
+                    for i, file in enumerate(request.files.values())
+                ]
+                return data
+
+            return request.get_json()
+
+        @app.route("/api/v10/webhooks/<application_id>/<token>", methods=["POST"])
+        def send(application_id, token):
+            message = dict(
+                message_payload(), id=self.snowflake(), webhook_id=application_id
+            )
+
+            with self.lock:
+                self.messages.setdefault(token, {})[message["id"]] = message
+
+            return jsonify(message)
+
+        @app.route(
+            "/api/v10/webhooks/<application_id>/<token>/messages/<message_id>",
+            methods=["PATCH", "DELETE"],
+        )
+        def message(application_id, token, message_id):
+            with self.lock:
+                messages = self.messages.setdefault(token, {})
+
+                if request.method == "DELETE":
+                    # The original response isn't sent through the API, so
+                    # it may not be known here
+                    found = messages.pop(message_id, None) is not None
+                    if not found and message_id != "@original":
+                        abort(404)
+                    return "", 204
+
+                if message_id != "@original" and message_id not in messages:
+                    abort(404)
+
+                message = messages.get(message_id, {"id": self.snowflake()})
+                message = messages[message_id] = dict(message, **message_payload())
+
+            return jsonify(message)
+
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulate the Discord API locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        nargs="+",
+        default=[0],
+        help="seconds to delay each request, or a minimum and maximum",
+    )
+    parser.add_argument("--bucket-limit", type=int, default=5)
+    parser.add_argument("--bucket-window", type=float, default=2.0)
+    parser.add_argument("--global-limit", type=int, default=50)
+    args = parser.parse_args()
+
+    emulator = DiscordEmulator(
+        latency=tuple(args.latency) if len(args.latency) > 1 else args.latency[0],
+        bucket_limit=args.bucket_limit,
+        bucket_window=args.bucket_window,
+        global_limit=args.global_limit or None,
+    )
+
+    print(f"Set DISCORD_BASE_URL to http://{args.host}:{args.port}/api/v10")
+    emulator.app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
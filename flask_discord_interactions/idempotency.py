@@ -0,0 +1,91 @@
+from typing import Optional
+
+from flask_discord_interactions.models import EncodedResponse
+from flask_discord_interactions.state import StateStore, MemoryStateStore
+from flask_discord_interactions.utils import RESPONSE_WINDOW
+
+
+class IdempotencyCache:
+    """
+    Remembers the IDs of recently handled interactions, so that duplicate
+    deliveries of the same interaction (e.g. retried by a proxy) don't run
+    the command again.
+
+    The first request with an ID claims it. A duplicate that arrives after
+    the response was sent gets the same encoded response again, and one
+    that arrives while the first is still being handled is rejected with
+    ``409 Conflict``. Either way, duplicates are answered before a
+    :class:`.Context` is created.
+
+    The claim on an interaction whose handler raises an exception is
+    released, so that a retry after an error is handled again. A claim whose
+    interaction fails to respond within Discord's 3 second window expires.
+
+    .. code-block:: python
+
+        discord = DiscordInteractions(
+            app, idempotency=IdempotencyCache(RedisStateStore(redis.Redis()))
+        )
+
+    Parameters
+    ----------
+    store: StateStore
+        The store for seen IDs and their responses. Use a
+        :class:`.SQLiteStateStore` or :class:`.RedisStateStore` to detect
+        duplicates delivered to different worker processes. Defaults to a
+        :class:`.MemoryStateStore` holding up to 10000 interactions.
+    ttl: float
+        The number of seconds to remember each response for.
+    """
+
+    def __init__(self, store: StateStore = None, ttl: float = 5 * 60):
+        self.store = store or MemoryStateStore(maxsize=10000, ttl=ttl)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(interaction_id: str):
+        return f"interaction:{interaction_id}"
+
+    def claim(self, interaction_id: str):
+        """
+        Mark an interaction as being handled.
+
+        Returns
+        -------
+        bool
+            ``True`` if the interaction hasn't been seen before.
+        """
+        return self.store.add(self._key(interaction_id), None, RESPONSE_WINDOW)
+
+    def release(self, interaction_id: str):
+        """
+        Forget an interaction that failed to be handled, so that a retry of
+        it is handled again.
+        """
+        self.store.delete(self._key(interaction_id))
+
+    def get(self, interaction_id: str) -> Optional[EncodedResponse]:
+        """
+        Return the response sent to an interaction, or ``None`` if it is
+        unknown or still being handled.
+        """
+        value = self.store.get(self._key(interaction_id))
+        if value is None:
+            return None
+
+        return EncodedResponse(*value)
+
+    def set(self, interaction_id: str, data: bytes, mimetype: str):
+        """
+        Remember the response sent to an interaction.
+
+        Parameters
+        ----------
+        interaction_id: str
+            The ID of the interaction.
+        data: bytes
+            The encoded response body.
+        mimetype: str
+            The mimetype of the response body.
+        """
+        self.store.set(self._key(interaction_id), (data, mimetype), self.ttl)
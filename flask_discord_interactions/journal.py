@@ -0,0 +1,216 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, Iterable, Iterator
+
+from flask_discord_interactions.metrics import Timings
+from flask_discord_interactions.payloads import payload_label
+from flask_discord_interactions.stats import Stats
+from flask_discord_interactions.utils import make_snowflake
+
+
+def _redact(data: dict, path: str):
+    "Return a copy of ``data`` with the field at the dotted ``path`` replaced."
+    key, _, rest = path.partition(".")
+    if not isinstance(data, dict) or key not in data:
+        return data
+
+    data = dict(data)
+    if rest:
+        data[key] = _redact(data[key], rest)
+    elif data[key] is not None:
+        data[key] = "REDACTED"
+    return data
+
+
+class Journal:
+    """
+    Records every interaction handled by :class:`.DiscordInteractions` to
+    an append-only file, to replay real traffic later with :func:`replay`
+    or the load test.
+
+    Each line of the journal is a compact JSON object with the following
+    keys:
+
+    - ``time``: the Unix time the interaction was handled.
+    - ``signed``: the ``X-Signature-Timestamp`` of the request.
+    - ``command`` and ``type``: the command name and interaction type.
+    - ``ms``: the total time spent handling the interaction, and ``phases``,
+      the time spent in each phase, both in milliseconds.
+    - ``size``: the size of the response body in bytes.
+    - ``payload``: the verified interaction payload, with the ``redact``
+      fields replaced by ``"REDACTED"``.
+
+    Interactions that raise an exception are not recorded.
+
+    .. code-block:: python
+
+        discord = DiscordInteractions(app, journal=Journal("interactions.jsonl"))
+
+    Parameters
+    ----------
+    path: str
+        The file to append to. ``{pid}`` is replaced with the process ID, so
+        that each worker process can write its own journal.
+    max_bytes: int
+        The size at which the journal is rotated: the file is renamed with
+        a ``.1`` suffix, shifting older journals to ``.2``, ``.3``...
+    backups: int
+        The number of rotated journals to keep.
+    redact: Iterable[str]
+        Dotted paths of the payload fields to redact, such as ``"token"`` or
+        ``"member.user.username"``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        backups: int = 5,
+        redact: Iterable[str] = ("token",),
+    ):
+        self.path = path.format(pid=os.getpid())
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.redact = list(redact)
+
+        self._file = None
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        payload: dict,
+        *,
+        signature_timestamp: str = None,
+        timings: Timings = None,
+        response_size: int = None,
+    ):
+        """
+        Append an interaction to the journal.
+
+        Parameters
+        ----------
+        payload: dict
+            The verified interaction payload.
+        signature_timestamp: str
+            The ``X-Signature-Timestamp`` of the request.
+        timings: Timings
+            The timings collected while handling the interaction.
+        response_size: int
+            The size of the response body in bytes.
+        """
+        for path in self.redact:
+            payload = _redact(payload, path)
+
+        entry = {"time": round(time.time(), 3), "signed": signature_timestamp}
+        if timings is not None:
+            entry.update(timings.labels)
+            entry["ms"] = round(timings.total * 1000, 3)
+            entry["phases"] = {
+                name: round(seconds * 1000, 3)
+                for name, seconds in timings.phases.items()
+            }
+        entry["size"] = response_size
+        entry["payload"] = payload
+
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            elif self._file.tell() + len(line) > self.max_bytes:
+                self.rotate()
+
+            self._file.write(line)
+            self._file.flush()
+
+    def rotate(self):
+        "Start a new journal, keeping the previous ones as numbered backups."
+        if self._file is not None:
+            self._file.close()
+
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0 and os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.1")
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        "Close the journal file."
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_journal(*paths: str) -> Iterator[dict]:
+    """
+    Read the entries of one or more journals, in order.
+
+    Parameters
+    ----------
+    *paths: str
+        The journal files to read.
+    """
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def replay(app, *paths: str, route: str = "/interactions", signer=None):
+    """
+    Send the interactions from one or more journals through a bot with
+    Flask's test client, and measure how long each takes.
+
+    Each interaction is sent with a fresh ID. Unless a ``signer`` matching
+    the app's ``DISCORD_PUBLIC_KEY`` is given, set the
+    ``DONT_VALIDATE_SIGNATURE`` config option. Since tokens are redacted,
+    point ``DISCORD_BASE_URL`` at a :class:`.emulator.DiscordEmulator` if
+    commands send followup messages.
+
+    Parameters
+    ----------
+    app: Flask
+        The app to send the interactions to.
+    *paths: str
+        The journal files to replay.
+    route: str
+        The route the app receives interactions on.
+    signer: Signer
+        A :class:`.payloads.Signer` to sign the interactions with.
+
+    Returns
+    -------
+    Dict[str, Stats]
+        The :class:`.stats.Stats` for each command, as from
+        :func:`.loadtest.run`.
+    """
+    results: Dict[str, Stats] = {}
+    client = app.test_client()
+
+    for i, entry in enumerate(read_journal(*paths)):
+        payload = dict(entry["payload"], id=make_snowflake(increment=i))
+
+        if signer is not None:
+            body, headers = signer.sign(payload)
+        else:
+            body = json.dumps(payload)
+            headers = {"Content-Type": "application/json"}
+
+        start = time.perf_counter()
+        response = client.post(route, data=body, headers=headers)
+        latency = time.perf_counter() - start
+
+        label = entry.get("command") or payload_label(payload)
+        results.setdefault(label, Stats()).record(latency, response.status_code == 200)
+
+    return results
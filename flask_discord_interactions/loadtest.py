@@ -0,0 +1,270 @@
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import threading
+from typing import Iterable, List, Tuple
+
+import requests
+
+from flask_discord_interactions.payloads import (
+    InteractionFactory,
+    Signer,
+    payload_label,
+)
+from flask_discord_interactions.stats import Stats
+
+
+def parse_command(spec: str, factory: InteractionFactory):
+    """
+    Build a slash command payload from a command line specification.
+
+    The specification lists the command and subcommand names, followed by
+    ``option=value`` pairs. Values are parsed as JSON if possible, and used
+    as strings otherwise, e.g. ``"admin roles assign days=3 reason=spam"``.
+
+    Returns
+    -------
+    Tuple[str, dict]
+        The label for the command, and the payload.
+    """
+    names = []
+    options = {}
+    for part in spec.split():
+        if "=" in part:
+            name, value = part.split("=", 1)
+            try:
+                options[name] = json.loads(value)
+            except ValueError:
+                options[name] = value
+        else:
+            names.append(part)
+
+    return " ".join(names), factory.slash_command(*names, **options)
+
+
+def run(
+    url: str,
+    payloads: List[Tuple[str, dict]],
+    *,
+    signer: Signer,
+    concurrency: int = 10,
+    rate: float = None,
+    requests_count: int = None,
+    duration: float = None,
+    timeout: float = 10,
+):
+    """
+    Send signed interactions to a running bot and measure the responses.
+
+    Payloads are sent in turn, each with a fresh interaction ID and
+    signature timestamp. If a ``rate`` is set, requests are started on a
+    fixed schedule, and latency is measured from the scheduled start, so
+    that queueing delay caused by a slow server is counted too.
+
+    Parameters
+    ----------
+    url: str
+        The URL of the bot's interactions route.
+    payloads: List[Tuple[str, dict]]
+        The label and payload of each interaction to send.
+    signer: Signer
+        The signer whose public key the bot is configured with.
+    concurrency: int
+        The number of requests to have in flight at once.
+    rate: float
+        The number of requests to start per second. If ``None``, requests
+        are sent as fast as the concurrency allows.
+    requests_count: int
+        The total number of requests to send.
+    duration: float
+        The number of seconds to send requests for.
+    timeout: float
+        The number of seconds to wait for each response.
+
+    Returns
+    -------
+    Dict[str, Stats]
+        The results for each label.
+    """
+    if requests_count is None and duration is None:
+        raise ValueError("Either requests_count or duration is required.")
+
+    factory = InteractionFactory()
+    results = {label: Stats() for label, payload in payloads}
+    lock = threading.Lock()
+    counter = itertools.count()
+    start = time.perf_counter()
+
+    def worker():
+        session = requests.Session()
+
+        while True:
+            # Incrementing an itertools.count is atomic
+            i = next(counter)
+            if requests_count is not None and i >= requests_count:
+                return
+
+            if rate is None:
+                scheduled = time.perf_counter()
+            else:
+                scheduled = start + i / rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            if duration is not None and scheduled - start >= duration:
+                return
+
+            label, payload = payloads[i % len(payloads)]
+            payload = dict(payload, id=factory.snowflake())
+            body, headers = signer.sign(payload)
+
+            try:
+                response = session.post(
+                    url, data=body, headers=headers, timeout=timeout
+                )
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+
+            latency = time.perf_counter() - scheduled
+            with lock:
+                results[label].record(latency, ok)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+def load_payloads(path: str) -> Iterable[dict]:
+    """
+    Read interaction payloads from a file with one JSON object per line,
+    such as a :class:`.Journal`.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entry = json.loads(line)
+                # Journal entries wrap the payload with timing metadata
+                yield entry.get("payload", entry)
+
+
+def print_results(results, elapsed: float, out=None):
+    "Print a table of the results for each command."
+    if out is None:
+        out = sys.stdout
+
+    total = sum(len(stats.latencies) + stats.errors for stats in results.values())
+    print(f"{total} requests in {elapsed:.1f}s ({total / elapsed:.1f}/s)\n", file=out)
+    print(
+        f"{'command':<24}{'requests':>10}{'errors':>10}{'p50':>10}{'p90':>10}"
+        f"{'p99':>10}{'max':>10}{'>3s':>8}",
+        file=out,
+    )
+
+    def ms(value):
+        return "-" if value is None else f"{value:.0f}ms"
+
+    for label, stats in results.items():
+        summary = stats.summary()
+        print(
+            f"{label:<24}{summary['requests']:>10}"
+            f"{summary['error_rate'] * 100:>9.1f}%"
+            f"{ms(summary['p50_ms']):>10}{ms(summary['p90_ms']):>10}"
+            f"{ms(summary['p99_ms']):>10}{ms(summary['max_ms']):>10}"
+            f"{summary['sla_misses']:>8}",
+            file=out,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m flask_discord_interactions.loadtest",
+        description="Send signed interactions to a running bot and report "
+        "latency percentiles, error rates and 3 second deadline misses.",
+    )
+    parser.add_argument("url", help="the URL of the bot's interactions route")
+    parser.add_argument(
+        "-c",
+        "--command",
+        action="append",
+        default=[],
+        help="a slash command to send, e.g. 'admin ban user=1 days=3' "
+        "(may be repeated)",
+    )
+    parser.add_argument(
+        "-p",
+        "--payloads",
+        help="a file of interaction payloads to replay, one JSON object per line, "
+        "or a journal",
+    )
+    parser.add_argument(
+        "--private-key",
+        default=os.environ.get("DISCORD_TEST_PRIVATE_KEY"),
+        help="the hex Ed25519 private key matching the bot's DISCORD_PUBLIC_KEY "
+        "(default: $DISCORD_TEST_PRIVATE_KEY, or a new key)",
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rate", type=float, help="requests to start per second")
+    parser.add_argument("-n", "--requests", type=int, help="total requests to send")
+    parser.add_argument(
+        "-d", "--duration", type=float, help="seconds to send requests for"
+    )
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--json", help="also save the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.requests is None and args.duration is None:
+        args.duration = 10
+
+    signer = Signer(args.private_key)
+    if args.private_key is None:
+        print(
+            f"Generated a new key. Set DISCORD_PUBLIC_KEY to {signer.public_key}\n",
+            file=sys.stderr,
+        )
+
+    factory = InteractionFactory()
+    payloads = [parse_command(spec, factory) for spec in args.command]
+    if args.payloads:
+        payloads.extend(
+            (payload_label(payload), payload)
+            for payload in load_payloads(args.payloads)
+        )
+    if not payloads:
+        parser.error("Pass at least one --command or a --payloads file.")
+
+    start = time.perf_counter()
+    results = run(
+        args.url,
+        payloads,
+        signer=signer,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        requests_count=args.requests,
+        duration=args.duration,
+        timeout=args.timeout,
+    )
+    elapsed = time.perf_counter() - start
+
+    print_results(results, elapsed)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {label: stats.summary() for label, stats in results.items()},
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
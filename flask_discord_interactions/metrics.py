@@ -0,0 +1,387 @@
+import time
+import bisect
+import socket
+import threading
+import contextlib
+import contextvars
+from typing import Dict, Iterable, Optional
+
+_current = contextvars.ContextVar("timings", default=None)
+_no_phase = contextlib.nullcontext()
+
+
+class Timings:
+    """
+    The time spent in each phase of handling a single interaction.
+
+    Attributes
+    ----------
+    phases: Dict[str, float]
+        The number of seconds spent in each phase, in the order the phases
+        started.
+    labels: Dict[str, str]
+        Labels describing the interaction, such as the command name and the
+        interaction type.
+    start: float
+        The :func:`time.perf_counter` value when handling started.
+    """
+
+    __slots__ = ("phases", "labels", "start")
+
+    def __init__(self):
+        self.phases = {}
+        self.labels = {}
+        self.start = time.perf_counter()
+
+    def add(self, phase: str, seconds: float):
+        "Add time spent in a phase."
+        self.phases[phase] = self.phases.get(phase, 0) + seconds
+
+    @property
+    def total(self):
+        "The number of seconds since handling started."
+        return time.perf_counter() - self.start
+
+    def server_timing(self, **extra: float):
+        """
+        Format the timings as a ``Server-Timing`` header value, in
+        milliseconds.
+
+        Parameters
+        ----------
+        **extra: float
+            Additional durations (in seconds) to include, after the phases
+            and the total.
+        """
+        entries = {**self.phases, "total": self.total, **extra}
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in entries.items()
+        )
+
+
+class _Phase:
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings: Timings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, time.perf_counter() - self.start)
+
+
+def current_timings() -> Optional[Timings]:
+    "Return the :class:`Timings` of the interaction being handled, if any."
+    return _current.get()
+
+
+def phase(name: str):
+    """
+    Time a phase of handling the current interaction.
+
+    If timings are not being collected, this returns a shared no-op context
+    manager, so instrumentation costs a single context variable lookup.
+
+    .. code-block:: python
+
+        with phase("database"):
+            rows = fetch_rows()
+
+    Parameters
+    ----------
+    name: str
+        The name of the phase.
+    """
+    timings = _current.get()
+    if timings is None:
+        return _no_phase
+    return _Phase(timings, name)
+
+
+def set_labels(**labels: str):
+    "Set labels on the :class:`Timings` of the current interaction, if any."
+    timings = _current.get()
+    if timings is not None:
+        timings.labels.update(labels)
+
+
+class _Collector:
+    __slots__ = ("sink", "profiler", "timings", "token", "capture")
+
+    def __init__(self, sink: Optional["MetricsSink"], profiler):
+        self.sink = sink
+        self.profiler = profiler
+
+    def __enter__(self):
+        self.timings = Timings()
+        self.token = _current.set(self.timings)
+        if self.profiler is not None:
+            self.capture = self.profiler.start()
+        return self.timings
+
+    def __exit__(self, *exc_info):
+        _current.reset(self.token)
+        if self.profiler is not None:
+            self.profiler.finish(self.capture, self.timings)
+        if self.sink is not None:
+            self.sink.report(self.timings)
+
+
+def collect(sink: Optional["MetricsSink"], *, always: bool = False, profiler=None):
+    """
+    Collect the timings of the interaction handled inside the ``with``
+    block, and report them to a sink when it exits.
+
+    The ``with`` statement binds the :class:`Timings`, or ``None`` if
+    nothing is collected.
+
+    Parameters
+    ----------
+    sink: MetricsSink
+        The sink to report to.
+    always: bool
+        Whether to collect timings even if ``sink`` is ``None``. Otherwise,
+        nothing is collected without a sink or a profiler.
+    profiler: Profiler
+        A :class:`.Profiler` to profile the interaction with.
+    """
+    if sink is None and profiler is None and not always:
+        return _no_phase
+    return _Collector(sink, profiler)
+
+
+class MetricsSink:
+    """
+    Receives metrics from :class:`.DiscordInteractions`. Subclass this to
+    send metrics to your monitoring system.
+
+    The following metrics are reported, all in seconds:
+
+    - ``phase_seconds``: the time spent in each phase of handling an
+      interaction (``verify``, ``parse``, ``context``, ``command``,
+      ``encode``, ...), labeled with ``phase``, ``command`` and ``type``.
+    - ``request_seconds``: the total time spent handling an interaction,
+      labeled with ``command`` and ``type``.
+    - ``followup_seconds``: the duration of each followup HTTP request,
+      labeled with ``method``, ``bucket`` (the ``X-RateLimit-Bucket``
+      header) and ``status``.
+    - ``stale_interaction_seconds``: the age of each interaction rejected
+      for exceeding ``DISCORD_MAX_INTERACTION_AGE``. Its count is the
+      number of interactions dropped.
+    """
+
+    def observe(self, name: str, value: float, labels: Dict[str, str]):
+        """
+        Record a single observation of a metric.
+
+        Parameters
+        ----------
+        name: str
+            The name of the metric.
+        value: float
+            The observed value.
+        labels: Dict[str, str]
+            The labels of the observation.
+        """
+        raise NotImplementedError
+
+    def report(self, timings: Timings):
+        "Record the timings of a handled interaction."
+        for name, seconds in timings.phases.items():
+            self.observe("phase_seconds", seconds, {"phase": name, **timings.labels})
+        self.observe("request_seconds", timings.total, timings.labels)
+
+
+class InMemoryMetrics(MetricsSink):
+    """
+    Keeps histograms of every metric in process memory. They can be
+    inspected with :meth:`histogram`, or exposed to Prometheus with
+    :meth:`render_prometheus` (see
+    :meth:`.DiscordInteractions.set_metrics_route`).
+
+    Attributes
+    ----------
+    buckets: List[float]
+        The upper bounds of the histogram buckets, in seconds.
+    namespace: str
+        The prefix of the metric names in the Prometheus exposition.
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10)
+
+    def __init__(
+        self,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        *,
+        namespace: str = "discord_interactions",
+    ):
+        self.buckets = sorted(buckets)
+        self.namespace = namespace
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name: str, value: float, labels: Dict[str, str]):
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(self.buckets), 0, 0.0]
+            if index < len(self.buckets):
+                histogram[0][index] += 1
+            histogram[1] += 1
+            histogram[2] += value
+
+    def histogram(self, name: str, **labels: str):
+        """
+        Return the observations of a metric, summed over every label set
+        that includes the given labels.
+
+        Returns
+        -------
+        dict
+            The ``count`` and ``sum`` of the observations, and the cumulative
+            count for each bucket in ``buckets``.
+        """
+        counts = [0] * len(self.buckets)
+        count = 0
+        total = 0.0
+
+        with self.lock:
+            for (metric, key_labels), (buckets, n, s) in self.histograms.items():
+                if metric != name or not labels.items() <= dict(key_labels).items():
+                    continue
+                counts = [a + b for a, b in zip(counts, buckets)]
+                count += n
+                total += s
+
+        cumulative = []
+        running = 0
+        for bucket in counts:
+            running += bucket
+            cumulative.append(running)
+
+        return {
+            "count": count,
+            "sum": total,
+            "buckets": dict(zip(self.buckets, cumulative)),
+        }
+
+    def render_prometheus(self):
+        """
+        Render every histogram in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            The exposition text.
+        """
+
+        def format_labels(labels):
+            return ",".join(
+                '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                for k, v in labels
+            )
+
+        with self.lock:
+            items = sorted(
+                (key, (list(buckets), n, s))
+                for key, (buckets, n, s) in self.histograms.items()
+            )
+
+        lines = []
+        previous = None
+        for (name, labels), (buckets, count, total) in items:
+            metric = f"{self.namespace}_{name}"
+            if metric != previous:
+                lines.append(f"# TYPE {metric} histogram")
+                previous = metric
+
+            running = 0
+            for bound, bucket in zip(self.buckets, buckets):
+                running += bucket
+                bucket_labels = format_labels(labels + (("le", repr(float(bound))),))
+                lines.append(f"{metric}_bucket{{{bucket_labels}}} {running}")
+            bucket_labels = format_labels(labels + (("le", "+Inf"),))
+            lines.append(f"{metric}_bucket{{{bucket_labels}}} {count}")
+
+            label_text = f"{{{format_labels(labels)}}}" if labels else ""
+            lines.append(f"{metric}_sum{label_text} {total}")
+            lines.append(f"{metric}_count{label_text} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+class StatsDMetrics(MetricsSink):
+    """
+    Sends every observation to a StatsD server over UDP, as a timer in
+    milliseconds. Labels are sent as DogStatsD-style tags.
+
+    Sending never blocks or raises, so an unavailable server doesn't affect
+    interactions.
+
+    Attributes
+    ----------
+    host: str
+        The hostname of the StatsD server.
+    port: int
+        The port of the StatsD server.
+    prefix: str
+        The prefix of the metric names.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8125,
+        *,
+        prefix: str = "discord_interactions.",
+    ):
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+    def observe(self, name: str, value: float, labels: Dict[str, str]):
+        line = f"{self.prefix}{name}:{value * 1000:.3f}|ms"
+        if labels:
+            line += "|#" + ",".join(f"{k}:{v}" for k, v in labels.items())
+
+        try:
+            self.socket.sendto(line.encode("utf-8"), (self.host, self.port))
+        except OSError:
+            pass
+
+
+def record_followup(sink: MetricsSink, method: str, status: int, headers, start: float):
+    """
+    Record the duration of a followup HTTP request.
+
+    Parameters
+    ----------
+    sink: MetricsSink
+        The sink to record to.
+    method: str
+        The kind of request, e.g. ``send``.
+    status: int
+        The HTTP status of the response.
+    headers
+        The headers of the response.
+    start: float
+        The :func:`time.perf_counter` value when the request started.
+    """
+    sink.observe(
+        "followup_seconds",
+        time.perf_counter() - start,
+        {
+            "method": method,
+            "bucket": headers.get("X-RateLimit-Bucket", "none"),
+            "status": str(status),
+        },
+    )
@@ -3,6 +3,9 @@ from flask_discord_interactions.models.user import User, Member
 from flask_discord_interactions.models.attachment import Attachment
 from flask_discord_interactions.models.message import Message, ResponseType
 from flask_discord_interactions.models.embed import Embed
+from flask_discord_interactions.models.template import MessageTemplate, RenderedMessage
+from flask_discord_interactions.models.multipart import MultipartBody
+from flask_discord_interactions.models.file import File
 from flask_discord_interactions.models.component import (
     ComponentType,
     ActionRow,
@@ -18,10 +21,16 @@ from flask_discord_interactions.models.modal import Modal
 from flask_discord_interactions.models.command import ApplicationCommandType
 from flask_discord_interactions.models.permission import Permission
 from flask_discord_interactions.models.role import Role
-from flask_discord_interactions.models.utils import LoadableDataclass
+from flask_discord_interactions.models.utils import (
+    LoadableDataclass,
+    EncodedResponse,
+    set_validation,
+    trusted,
+)
 from flask_discord_interactions.models.autocomplete import (
     Autocomplete,
     AutocompleteResult,
+    AutocompleteIndex,
 )
 from flask_discord_interactions.models.option import Option, CommandOptionType
 
@@ -33,6 +42,10 @@ __all__ = [
     "Message",
     "ResponseType",
     "Embed",
+    "MessageTemplate",
+    "RenderedMessage",
+    "MultipartBody",
+    "File",
     "ComponentType",
     "ActionRow",
     "Button",
@@ -48,8 +61,12 @@ __all__ = [
     "Permission",
     "Role",
     "LoadableDataclass",
+    "EncodedResponse",
+    "set_validation",
+    "trusted",
     "Autocomplete",
     "AutocompleteResult",
+    "AutocompleteIndex",
     "Option",
     "Attachment",
 ]
@@ -1,8 +1,45 @@
+import os
+import tempfile
+import threading
 import dataclasses
-from typing import Optional
+from typing import BinaryIO, Optional, Union
+
+import requests
+from flask import current_app
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 from flask_discord_interactions.models.utils import LoadableDataclass
 
+#: The default maximum number of bytes to download from an attachment.
+MAX_DOWNLOAD_SIZE = 25 * 1024 * 1024
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def download_session():
+    """
+    Return the :class:`requests.Session` shared by attachment downloads, so
+    that connections to Discord's CDN are reused.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = requests.Session()
+    return _session
+
+
+def _check_size(size, max_size):
+    if max_size is not None and size is not None and int(size) > max_size:
+        raise ValueError(
+            f"Attachment is larger than the maximum size of {max_size} bytes"
+        )
+
 
 @dataclasses.dataclass
 class Attachment(LoadableDataclass):
@@ -42,3 +79,177 @@ class Attachment(LoadableDataclass):
     height: Optional[int] = None
     width: Optional[int] = None
     ephemeral: Optional[bool] = None
+
+    def iter_chunks(
+        self,
+        chunk_size: int = 64 * 1024,
+        *,
+        max_size: Optional[int] = MAX_DOWNLOAD_SIZE,
+        session: requests.Session = None,
+    ):
+        """
+        Download the attachment, yielding its contents in chunks.
+
+        Parameters
+        ----------
+        chunk_size: int
+            The maximum number of bytes per chunk.
+        max_size: int
+            The maximum number of bytes to download. A :class:`ValueError` is
+            raised if the attachment is larger. ``None`` disables the limit.
+        session: requests.Session
+            The session to download with. Defaults to a shared session.
+        """
+        _check_size(self.size, max_size)
+
+        if session is None:
+            session = download_session()
+
+        with session.get(self.url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            _check_size(response.headers.get("Content-Length"), max_size)
+
+            received = 0
+            for chunk in response.iter_content(chunk_size):
+                received += len(chunk)
+                _check_size(received, max_size)
+                yield chunk
+
+    def save(
+        self,
+        destination: Union[str, os.PathLike, BinaryIO],
+        *,
+        max_size: Optional[int] = MAX_DOWNLOAD_SIZE,
+        session: requests.Session = None,
+    ):
+        """
+        Download the attachment to a file, without holding all of it in
+        memory.
+
+        Parameters
+        ----------
+        destination: Union[str, os.PathLike, BinaryIO]
+            The path to save the attachment to, or a binary file object to
+            write it to. If the download fails, a partially written path is
+            removed.
+        max_size: int
+            The maximum number of bytes to download (see :meth:`iter_chunks`).
+        session: requests.Session
+            The session to download with. Defaults to a shared session.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+        """
+        if not isinstance(destination, (str, os.PathLike)):
+            written = 0
+            for chunk in self.iter_chunks(max_size=max_size, session=session):
+                destination.write(chunk)
+                written += len(chunk)
+            return written
+
+        f = open(destination, "wb")
+        try:
+            with f:
+                return self.save(f, max_size=max_size, session=session)
+        except BaseException:
+            os.remove(destination)
+            raise
+
+    def open(
+        self,
+        *,
+        max_size: Optional[int] = MAX_DOWNLOAD_SIZE,
+        spool_size: int = 1024 * 1024,
+        session: requests.Session = None,
+    ):
+        """
+        Download the attachment into a temporary file, which stays in memory
+        while it is small and moves to disk once it grows past
+        ``spool_size`` bytes.
+
+        .. code-block:: python
+
+            @discord.command()
+            def lines(ctx, file: Attachment):
+                with file.open() as f:
+                    return f"{sum(1 for line in f)} lines"
+
+        Parameters
+        ----------
+        max_size: int
+            The maximum number of bytes to download (see :meth:`iter_chunks`).
+        spool_size: int
+            The number of bytes to keep in memory before moving to disk.
+        session: requests.Session
+            The session to download with. Defaults to a shared session.
+
+        Returns
+        -------
+        tempfile.SpooledTemporaryFile
+            The downloaded file, positioned at the start.
+        """
+        f = tempfile.SpooledTemporaryFile(max_size=spool_size)
+        try:
+            self.save(f, max_size=max_size, session=session)
+        except BaseException:
+            f.close()
+            raise
+
+        f.seek(0)
+        return f
+
+    async def read_chunks(
+        self,
+        chunk_size: int = 64 * 1024,
+        *,
+        max_size: Optional[int] = MAX_DOWNLOAD_SIZE,
+        session: "aiohttp.ClientSession" = None,
+    ):
+        """
+        Download the attachment asynchronously, yielding its contents in
+        chunks.
+
+        .. code-block:: python
+
+            async for chunk in attachment.read_chunks():
+                digest.update(chunk)
+
+        Parameters
+        ----------
+        chunk_size: int
+            The maximum number of bytes per chunk.
+        max_size: int
+            The maximum number of bytes to download (see :meth:`iter_chunks`).
+        session: aiohttp.ClientSession
+            The session to download with. Defaults to the session set up by
+            :meth:`.DiscordInteractions.set_route_async`, or a temporary one.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "The aiohttp module is required for async usage of this library"
+            )
+
+        _check_size(self.size, max_size)
+
+        if session is None:
+            try:
+                session = current_app.discord_download_session
+            except (RuntimeError, AttributeError):
+                async with aiohttp.ClientSession() as session:
+                    async for chunk in self.read_chunks(
+                        chunk_size, max_size=max_size, session=session
+                    ):
+                        yield chunk
+                return
+
+        async with session.get(self.url) as response:
+            response.raise_for_status()
+            _check_size(response.content_length, max_size)
+
+            received = 0
+            async for chunk in response.content.iter_chunked(chunk_size):
+                received += len(chunk)
+                _check_size(received, max_size)
+                yield chunk
@@ -1,4 +1,8 @@
+import array
+import bisect
+import heapq
 import json
+import math
 from typing import Union
 from flask_discord_interactions.models.message import ResponseType
 from flask_discord_interactions.models.option import Choice
@@ -82,3 +86,321 @@ class AutocompleteResult:
             return AutocompleteResult(
                 [{"name": str(choice), "value": choice} for choice in value]
             )
+
+
+_ID_MASK = (1 << 31) - 1
+
+# The maximum number of candidates scored by a fuzzy query
+_FUZZY_CANDIDATES = 400
+
+
+class AutocompleteIndex:
+    """
+    A search index over a large, mostly static set of autocomplete choices.
+
+    The index is built once and then answers prefix and substring queries
+    without scanning every choice. Names are kept in a sorted array for
+    prefix lookups. Every substring of up to ``ngram`` characters has a
+    posting list of the choices containing it, ordered by where it first
+    appears, so substring queries only look at the first few entries of a
+    single posting list, and n-grams are also used for fuzzy matching.
+
+    .. code-block:: python
+
+        index = AutocompleteIndex(ALL_CITIES)
+
+        @city.autocomplete()
+        def city_autocomplete(ctx, name=None):
+            return index.query(name.value)
+
+    Parameters
+    ----------
+    choices
+        An iterable of choices. Each choice may be a string (used as both
+        the name and the value), a ``(name, value)`` tuple, a dict with
+        ``name`` and ``value`` keys, or a :class:`.Choice`.
+    limit
+        The maximum number of choices to return from a query. Discord
+        accepts at most 25.
+    ngram
+        The length of the substrings stored in the inverted index.
+    fuzzy
+        Whether to fill up the results with approximate matches (choices
+        that share most n-grams with the query) if there are not enough
+        exact prefix or substring matches. To keep queries fast, only a few
+        hundred candidates are scored, so in very large indexes the best
+        approximate matches may be missed.
+    """
+
+    def __init__(self, choices=(), *, limit: int = 25, ngram: int = 3, fuzzy=True):
+        self.limit = limit
+        self.ngram = ngram
+        self.fuzzy = fuzzy
+
+        self._choices = {}
+        self._keys = {}
+        self._ids = {}
+        self._values = {}
+        self._next_id = 0
+        self._sorted = []
+        self._postings = {}
+
+        items = [self._coerce(choice) for choice in choices]
+        for choice in items:
+            if choice.value in self._choices:
+                self.remove(choice.value)
+            self._insert(choice)
+
+        self._sorted.sort()
+        for gram, posting in self._postings.items():
+            self._postings[gram] = array.array("q", sorted(posting))
+
+    def __len__(self):
+        return len(self._choices)
+
+    def __contains__(self, value):
+        return value in self._choices
+
+    @staticmethod
+    def _coerce(choice):
+        if isinstance(choice, Choice):
+            return choice
+        elif isinstance(choice, dict):
+            return Choice(**choice)
+        elif isinstance(choice, tuple):
+            return Choice(*choice)
+        else:
+            return Choice(str(choice), choice)
+
+    @staticmethod
+    def _normalize(text: str):
+        return str(text).casefold()
+
+    def _ngrams(self, text: str):
+        if len(text) <= self.ngram:
+            return {text}
+        return {text[i : i + self.ngram] for i in range(len(text) - self.ngram + 1)}
+
+    def _substrings(self, key: str):
+        "Return where each substring of up to ``ngram`` characters first appears."
+        positions = {}
+        # Going backwards, so that the first position is the one kept
+        for size in range(1, self.ngram + 1):
+            for i in range(len(key) - size, -1, -1):
+                positions[key[i : i + size]] = min(i, 0xFFFF)
+        return positions
+
+    @staticmethod
+    def _entry(position: int, key: str, id: int):
+        # Posting entries are ints ordered by the position of the substring,
+        # then the length of the name, then insertion order
+        return (position << 47) | (min(len(key), 0xFFFF) << 31) | id
+
+    def _insert(self, choice: Choice, *, keep_sorted: bool = False):
+        key = self._normalize(choice.name)
+        id = self._next_id
+        self._next_id += 1
+
+        self._choices[choice.value] = choice
+        self._keys[choice.value] = key
+        self._ids[choice.value] = id
+        self._values[id] = choice.value
+
+        entry = (key, self._sort_value(choice.value))
+        if keep_sorted:
+            bisect.insort(self._sorted, entry)
+        else:
+            self._sorted.append(entry)
+
+        postings = self._postings
+        base = self._entry(0, key, id)
+        for gram, position in self._substrings(key).items():
+            entry = base | (position << 47)
+            posting = postings.get(gram)
+            if keep_sorted:
+                if posting is None:
+                    posting = postings[gram] = array.array("q")
+                posting.insert(bisect.bisect_left(posting, entry), entry)
+            elif posting is None:
+                # Sorted once the index is built
+                postings[gram] = [entry]
+            else:
+                posting.append(entry)
+
+    @staticmethod
+    def _sort_value(value):
+        # Values may be a mix of ints and strings, which can't be compared
+        return (isinstance(value, str), value)
+
+    def add(self, choice):
+        """
+        Add a choice to the index, replacing any choice with the same value.
+
+        Parameters
+        ----------
+        choice
+            The choice to add, in any of the forms accepted by the
+            constructor.
+        """
+        choice = self._coerce(choice)
+        if choice.value in self._choices:
+            self.remove(choice.value)
+        self._insert(choice, keep_sorted=True)
+
+    def remove(self, value):
+        """
+        Remove the choice with the given value from the index.
+
+        Parameters
+        ----------
+        value
+            The value of the choice to remove.
+
+        Raises
+        ------
+        KeyError
+            If there is no choice with that value.
+        """
+        key = self._keys.pop(value)
+        id = self._ids.pop(value)
+        del self._choices[value]
+        del self._values[id]
+
+        entry = (key, self._sort_value(value))
+        i = bisect.bisect_left(self._sorted, entry)
+        if i < len(self._sorted) and self._sorted[i] == entry:
+            del self._sorted[i]
+        else:
+            self._sorted.remove(entry)
+
+        for gram, position in self._substrings(key).items():
+            posting = self._postings[gram]
+            entry = self._entry(position, key, id)
+            i = bisect.bisect_left(posting, entry)
+            if i < len(posting) and posting[i] == entry:
+                del posting[i]
+            else:
+                # Postings aren't sorted yet while the index is being built
+                posting.remove(entry)
+            if not posting:
+                del self._postings[gram]
+
+    def _prefix_matches(self, query: str, limit: int):
+        results = []
+        i = bisect.bisect_left(self._sorted, (query,))
+        while i < len(self._sorted) and len(results) < limit:
+            key, (_, value) = self._sorted[i]
+            if not key.startswith(query):
+                break
+            results.append(value)
+            i += 1
+        return results
+
+    def _substring_matches(self, query: str, limit: int, exclude: set):
+        if len(query) <= self.ngram:
+            # Ordered by match position, so the first entries are the best
+            posting = self._postings.get(query, ())
+        else:
+            # Every match contains each n-gram of the query, so check the
+            # choices containing the rarest one
+            posting = min(
+                (self._postings.get(gram, ()) for gram in self._ngrams(query)),
+                key=len,
+            )
+
+        matches = []
+        for entry in posting:
+            value = self._values[entry & _ID_MASK]
+            if value in exclude:
+                continue
+            key = self._keys[value]
+            position = key.find(query)
+            if position >= 0:
+                matches.append((position, len(key), key, self._sort_value(value)))
+                if len(matches) == limit:
+                    break
+
+        matches.sort()
+        return [match[-1][1] for match in matches]
+
+    def _fuzzy_matches(self, query: str, limit: int, exclude: set):
+        grams = self._ngrams(query)
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+
+        # Require a reasonable share of the query's n-grams to match, so
+        # short queries don't match everything sharing a single n-gram
+        threshold = max(2, math.ceil(len(grams) * 0.4))
+
+        # A choice sharing at least ``threshold`` n-grams with the query is
+        # in at least one of the rarest ``len(grams) - threshold + 1``
+        # posting lists, so only those are read, rarest first, and each
+        # candidate is scored once. The search stops once the best matches
+        # can't be beaten by choices in the lists not read yet. To bound the
+        # work, only a fixed number of candidates are scored, shared between
+        # the lists: long lists are cut short, keeping the entries where the
+        # n-gram appears earliest.
+        postings = postings[: len(grams) - threshold + 1]
+        budget = max(_FUZZY_CANDIDATES, limit)
+        seen = set()
+        matches = []
+        for i, posting in enumerate(postings):
+            stop = len(seen) + (budget - len(seen)) // (len(postings) - i)
+            for entry in posting:
+                value = self._values[entry & _ID_MASK]
+                if value in seen or value in exclude:
+                    continue
+                seen.add(value)
+
+                key = self._keys[value]
+                score = sum(map(key.__contains__, grams))
+                if score >= threshold:
+                    matches.append((-score, len(key), key, self._sort_value(value)))
+
+                if len(seen) >= stop:
+                    break
+
+            # Choices in none of the lists read so far share fewer n-grams
+            best = len(grams) - i - 1
+            if sum(-match[0] > best for match in matches) >= limit:
+                break
+
+        return [match[-1][1] for match in heapq.nsmallest(limit, matches)]
+
+    def query(self, text: str = None, limit: int = None):
+        """
+        Find the choices best matching what the user has typed so far.
+
+        Choices whose name starts with the text come first (in alphabetical
+        order), then choices containing the text (earliest and shortest
+        match first), then approximate matches if ``fuzzy`` is enabled.
+
+        Parameters
+        ----------
+        text
+            The text typed so far, e.g. ``option.value``. Matching is
+            case-insensitive.
+        limit
+            The maximum number of choices to return. Defaults to the limit
+            given when the index was created.
+
+        Returns
+        -------
+        List[Choice]
+            The matching choices.
+        """
+        if limit is None:
+            limit = self.limit
+
+        query = self._normalize(text or "")
+
+        values = self._prefix_matches(query, limit)
+
+        if query and len(values) < limit:
+            seen = set(values)
+            values += self._substring_matches(query, limit - len(values), seen)
+
+            if self.fuzzy and len(values) < limit and len(query) > self.ngram + 1:
+                seen = set(values)
+                values += self._fuzzy_matches(query, limit - len(values), seen)
+
+        return [self._choices[value] for value in values]
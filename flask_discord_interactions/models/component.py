@@ -1,6 +1,11 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import List, Union
 
+from flask_discord_interactions.models.utils import (
+    dump_dataclass,
+    validation_enabled,
+)
+
 
 class ComponentType:
     ACTION_ROW = 1
@@ -14,16 +19,7 @@ class Component:
 
     def dump(self):
         "Returns this Component as a dictionary, removing fields which are None."
-
-        def filter_none(d):
-            if isinstance(d, dict):
-                return {k: filter_none(v) for k, v in d.items() if v is not None}
-            elif isinstance(d, list):
-                return [filter_none(v) for v in d if v is not None]
-            else:
-                return d
-
-        return filter_none(asdict(self))
+        return dump_dataclass(self)
 
     @staticmethod
     def from_dict(data):
@@ -57,6 +53,15 @@ class CustomIdComponent(Component):
         if isinstance(self.custom_id, list) or isinstance(self.custom_id, tuple):
             self.custom_id = "\n".join(str(item) for item in self.custom_id)
 
+        if validation_enabled():
+            self.validate()
+
+    def validate(self):
+        """
+        Check that this component is valid, raising a :class:`ValueError`
+        otherwise. Called on construction unless validation is disabled (see
+        :func:`.set_validation`).
+        """
         if self.custom_id and len(self.custom_id) > 100:
             raise ValueError("custom_id has maximum 100 characters")
 
@@ -87,6 +92,14 @@ class ActionRow(Component):
         return ActionRow(components=components)
 
     def __post_init__(self):
+        if validation_enabled():
+            self.validate()
+
+    def validate(self):
+        """
+        Check that this action row is valid, raising a :class:`ValueError`
+        otherwise.
+        """
         if self.components:
             if len(self.components) > 5:
                 raise ValueError("ActionRow can have at most 5 components")
@@ -143,8 +156,8 @@ class Button(CustomIdComponent):
 
     type: int = ComponentType.BUTTON
 
-    def __post_init__(self):
-        super().__post_init__()
+    def validate(self):
+        super().validate()
 
         if self.style == ButtonStyles.LINK:
             if self.url is None:
@@ -153,12 +166,6 @@ class Button(CustomIdComponent):
             if self.custom_id is None:
                 raise ValueError("Buttons require custom_id")
 
-        if isinstance(self.custom_id, list) or isinstance(self.custom_id, tuple):
-            self.custom_id = "\n".join(str(item) for item in self.custom_id)
-
-        if self.custom_id and len(self.custom_id) > 100:
-            raise ValueError("custom_id has maximum 100 characters")
-
 
 @dataclass
 class SelectMenuOption:
@@ -218,8 +225,8 @@ class SelectMenu(CustomIdComponent):
 
     type: int = ComponentType.SELECT_MENU
 
-    def __post_init__(self):
-        super().__post_init__()
+    def validate(self):
+        super().validate()
 
         if self.options and len(self.options) > 25:
             raise ValueError("Select is limited to 25 options")
@@ -276,8 +283,8 @@ class TextInput(CustomIdComponent):
 
     type: int = ComponentType.TEXT_INPUT
 
-    def __post_init__(self):
-        super().__post_init__()
+    def validate(self):
+        super().validate()
 
         if self.min_length > self.max_length:
             raise ValueError("min_length must be less than or equal to max_length")
@@ -1,7 +1,7 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import List
 
-from flask_discord_interactions.models.utils import LoadableDataclass
+from flask_discord_interactions.models.utils import LoadableDataclass, dump_dataclass
 
 
 @dataclass
@@ -101,11 +101,4 @@ class Embed(LoadableDataclass):
         dict
             A dictionary representation of this Embed.
         """
-
-        def filter_none(d):
-            if isinstance(d, dict):
-                return {k: filter_none(v) for k, v in d.items() if v is not None}
-            else:
-                return d
-
-        return filter_none(asdict(self))
+        return dump_dataclass(self)
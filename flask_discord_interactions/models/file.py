@@ -0,0 +1,134 @@
+import os
+import mmap
+import functools
+import mimetypes
+from typing import Union
+
+# Escape names like browsers do (and urllib3 did for requests_toolbelt), so
+# that quotes and line breaks can't end the parameter or the header early
+_ESCAPES = str.maketrans(
+    {
+        '"': "%22",
+        "\\": "\\\\",
+        **{chr(c): f"%{c:02X}" for c in range(0x20) if c != 0x1B},
+    }
+)
+
+
+@functools.lru_cache(maxsize=256)
+def part_header(name: str, filename: str = None, content_type: str = None):
+    """
+    Build the headers of a ``multipart/form-data`` part. Cached, so that
+    sending the same asset repeatedly doesn't rebuild them.
+
+    Parameters
+    ----------
+    name: str
+        The name of the form field.
+    filename: str
+        The name of the file, if the part is a file.
+    content_type: str
+        The content type of the part. Guessed from the filename if omitted.
+
+    Returns
+    -------
+    bytes
+        The encoded headers, including the blank line which ends them.
+    """
+    disposition = f'form-data; name="{name.translate(_ESCAPES)}"'
+    if filename is not None:
+        disposition += f'; filename="{filename.translate(_ESCAPES)}"'
+        if content_type is None:
+            content_type = (
+                mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            )
+
+    header = f"Content-Disposition: {disposition}\r\n"
+    if content_type is not None:
+        if "\r" in content_type or "\n" in content_type:
+            raise ValueError(f"Invalid content type: {content_type!r}")
+        header += f"Content-Type: {content_type}\r\n"
+    return (header + "\r\n").encode("utf-8")
+
+
+class File:
+    """
+    A file to attach to a :class:`.Message`, read from memory or disk
+    without intermediate copies.
+
+    In-memory data is sent as slices of a :class:`memoryview`, and files on
+    disk are memory-mapped while they are sent, so the contents go straight
+    from the source to the socket.
+
+    .. code-block:: python
+
+        # Generated in memory
+        Message(file=File(png_bytes, "chart.png"))
+
+        # Served from disk (the filename defaults to the file's name)
+        Message(file=File("assets/banner.png"))
+
+    Parameters
+    ----------
+    source: Union[bytes, bytearray, memoryview, mmap.mmap, str, os.PathLike]
+        The contents of the file, or the path to it. Paths are opened each
+        time the file is sent, so the same ``File`` can be reused.
+    filename: str
+        The name of the file shown in Discord. Required unless ``source``
+        is a path.
+    content_type: str
+        The content type of the file. Guessed from the filename if omitted.
+    """
+
+    def __init__(
+        self,
+        source: Union[bytes, bytearray, memoryview, mmap.mmap, str, os.PathLike],
+        filename: str = None,
+        *,
+        content_type: str = None,
+    ):
+        if isinstance(source, (str, os.PathLike)):
+            self.path = os.fspath(source)
+            self.data = None
+            if filename is None:
+                filename = os.path.basename(self.path)
+        elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            self.path = None
+            self.data = memoryview(source).cast("B")
+        else:
+            raise ValueError(f"Unsupported file source: {type(source).__name__}")
+
+        if filename is None:
+            raise ValueError("A filename is required for in-memory files")
+
+        self.filename = filename
+        self.content_type = content_type
+
+    def __len__(self):
+        if self.path is not None:
+            return os.stat(self.path).st_size
+        return len(self.data)
+
+    def iter_chunks(self, chunk_size: int = 64 * 1024):
+        """
+        Iterate over the contents of the file as :class:`memoryview` slices.
+
+        Parameters
+        ----------
+        chunk_size: int
+            The maximum size of each slice.
+        """
+        data = self.data
+        if data is None:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
+                # The mapping stays valid after the file is closed, and is
+                # unmapped once the last slice is garbage collected
+                data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size]
+
+    def __repr__(self):
+        return f"File({self.path or '<memory>'!r}, {self.filename!r})"
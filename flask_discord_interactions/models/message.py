@@ -4,11 +4,16 @@ import inspect
 from typing import List, Union
 import json
 from datetime import datetime
-import requests_toolbelt
 
-from flask_discord_interactions.models.utils import LoadableDataclass
+from flask_discord_interactions.models.utils import (
+    LoadableDataclass,
+    validation_enabled,
+)
 from flask_discord_interactions.models.component import Component
 from flask_discord_interactions.models.embed import Embed
+from flask_discord_interactions.models.template import RenderedMessage
+from flask_discord_interactions.models.multipart import MultipartBody
+from flask_discord_interactions.models.file import File
 
 from flask_discord_interactions.enums import ResponseType
 
@@ -52,6 +57,8 @@ class Message(LoadableDataclass):
             ("README.md", open("README.md", "rb"))
 
         See the ``files`` parameter of :func:`requests.request` for details.
+        You can also pass a :class:`.File`, which sends bytes, memoryviews,
+        mmaps and paths without copying them.
     files
         A list of files to attach to the message. Specify just one of
         ``file`` or ``files``. Only valid for outgoing webhooks.
@@ -70,8 +77,8 @@ class Message(LoadableDataclass):
     deferred: bool = False
     ephemeral: bool = False
     update: bool = False
-    file: tuple = None
-    files: List[tuple] = None
+    file: Union[tuple, File] = None
+    files: List[Union[tuple, File]] = None
     components: List[Component] = None
 
     # These fields are only set on incoming messages
@@ -82,19 +89,22 @@ class Message(LoadableDataclass):
     author: Member = None
 
     def __post_init__(self):
-        if self.embed is not None and self.embeds is not None:
-            raise ValueError("Specify only one of embed or embeds")
+        if validation_enabled():
+            if self.embed is not None and self.embeds is not None:
+                raise ValueError("Specify only one of embed or embeds")
+
+            if self.file is not None and self.files is not None:
+                raise ValueError("Specify only one of file or files")
+
+            if self.ephemeral and (self.file is not None or self.files is not None):
+                raise ValueError("Ephemeral Messages cannot include files.")
+
         if self.embed is not None:
             self.embeds = [self.embed]
 
-        if self.file is not None and self.files is not None:
-            raise ValueError("Specify only one of file or files")
         if self.file is not None:
             self.files = [self.file]
 
-        if self.ephemeral and self.files is not None:
-            raise ValueError("Ephemeral Messages cannot include files.")
-
         if self.embeds is not None:
             for i, embed in enumerate(self.embeds):
                 if not dataclasses.is_dataclass(embed):
@@ -164,7 +174,8 @@ class Message(LoadableDataclass):
         """
         Convert a function return value into a Message object.
         Converts ``None`` to an empty Message, or any other type to ``str``
-        as message content.
+        as message content. Rendered :class:`.MessageTemplate` s are passed
+        through unchanged.
 
         Parameters
         ----------
@@ -184,20 +195,14 @@ class Message(LoadableDataclass):
             return cls()
         elif inspect.isawaitable(result):
             return construct_async(result)
-        elif isinstance(result, cls):
+        elif isinstance(result, (cls, RenderedMessage)):
             return result
         else:
             return cls(str(result))
 
-    def encode(self, followup=False):
+    def dump(self, followup=False):
         """
-        Return this ``Message`` as a string/mimetype pair for sending to Discord.
-
-        If the message contains no files, the string will be a serialized
-        JSON object and the mimetype will be ``application/json``.
-
-        If the message contains attachments, the string will be a multipart
-        encoded response and the mimetype will be ``multipart/form-data``.
+        Returns the JSON payload of this ``Message`` as a dict.
 
         Parameters
         ----------
@@ -206,10 +211,8 @@ class Message(LoadableDataclass):
 
         Returns
         -------
-        bytes
-            Bytes containing the message data (either JSON or multipart).
-        string
-            The mimetype of the message data.
+        dict
+            The payload to send to Discord (without any files).
         """
 
         payload = {
@@ -227,7 +230,39 @@ class Message(LoadableDataclass):
                 "data": payload,
             }
 
-        payload_json = json.dumps(payload)
+        return payload
+
+    def encode(self, followup=False, *, stream=False, progress=None):
+        """
+        Return this ``Message`` as a string/mimetype pair for sending to Discord.
+
+        If the message contains no files, the string will be a serialized
+        JSON object and the mimetype will be ``application/json``.
+
+        If the message contains attachments, the string will be a multipart
+        encoded response and the mimetype will be ``multipart/form-data``.
+
+        Parameters
+        ----------
+        followup: bool
+            Whether this is a followup message.
+        stream: bool
+            If the message contains attachments, return a
+            :class:`.MultipartBody` which reads the files while it is sent,
+            instead of reading them into memory up front.
+        progress: Callable[[int, int], None]
+            With ``stream``, called with the number of bytes sent so far and
+            the total length (if known) as the body is sent.
+
+        Returns
+        -------
+        bytes
+            Bytes containing the message data (either JSON or multipart).
+        string
+            The mimetype of the message data.
+        """
+
+        payload_json = json.dumps(self.dump(followup))
 
         if self.files:
             fields = [
@@ -237,10 +272,11 @@ class Message(LoadableDataclass):
             for i, file in enumerate(self.files):
                 fields.append((f"files[{i}]", file))
 
-            multipart = requests_toolbelt.MultipartEncoder(
-                fields=fields,
-            )
+            multipart = MultipartBody(fields, progress=progress)
 
-            return (multipart.to_string(), multipart.content_type)
+            if stream:
+                return (multipart, multipart.content_type)
+            else:
+                return (multipart.to_bytes(), multipart.content_type)
         else:
             return (payload_json.encode("utf-8"), "application/json")
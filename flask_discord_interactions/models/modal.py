@@ -3,7 +3,10 @@ import json
 from dataclasses import dataclass
 from typing import List, Union
 
-from flask_discord_interactions.models.utils import LoadableDataclass
+from flask_discord_interactions.models.utils import (
+    LoadableDataclass,
+    validation_enabled,
+)
 from flask_discord_interactions.models.component import Component, ComponentType
 from flask_discord_interactions.enums import ResponseType
 
@@ -29,13 +32,22 @@ class Modal(LoadableDataclass):
     components: List[Component] = None
 
     def __post_init__(self):
+        if isinstance(self.custom_id, list) or isinstance(self.custom_id, tuple):
+            self.custom_id = "\n".join(str(item) for item in self.custom_id)
+
+        if validation_enabled():
+            self.validate()
+
+    def validate(self):
+        """
+        Check that this modal is valid, raising a :class:`ValueError`
+        otherwise. Called on construction unless validation is disabled (see
+        :func:`.set_validation`).
+        """
         # Verify Custom ID
         if self.custom_id is None:
             raise ValueError("Modals require custom_id")
 
-        if isinstance(self.custom_id, list) or isinstance(self.custom_id, tuple):
-            self.custom_id = "\n".join(str(item) for item in self.custom_id)
-
         if len(self.custom_id) > 100:
             raise ValueError("custom_id has maximum 100 characters")
 
@@ -0,0 +1,159 @@
+import io
+import os
+import stat
+import uuid
+from typing import Callable, Iterable, List, Tuple
+
+from flask_discord_interactions.models.file import File, part_header
+
+
+def _file_length(fileobj):
+    "Return the number of bytes left to read from a file object, if known."
+    try:
+        st = os.fstat(fileobj.fileno())
+        if stat.S_ISREG(st.st_mode):
+            return st.st_size - fileobj.tell()
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        pass
+
+    try:
+        position = fileobj.tell()
+        end = fileobj.seek(0, io.SEEK_END)
+        fileobj.seek(position)
+        return end - position
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+
+
+class _Part:
+    "A single field of a multipart body."
+
+    def __init__(self, name: str, data, filename: str = None, content_type: str = None):
+        self.data = data
+        self.header = part_header(name, filename, content_type)
+
+        if isinstance(data, (bytes, bytearray, memoryview, File)):
+            self.length = len(data)
+        elif isinstance(data, str):
+            self.data = data.encode("utf-8")
+            self.length = len(self.data)
+        elif hasattr(data, "read"):
+            self.length = _file_length(data)
+        else:
+            # Any other iterable of bytes, e.g. requests' Response.iter_content
+            self.length = None
+
+    def iter_data(self, chunk_size: int):
+        if isinstance(self.data, File):
+            yield from self.data.iter_chunks(chunk_size)
+        elif isinstance(self.data, (bytes, bytearray, memoryview)):
+            view = memoryview(self.data)
+            for start in range(0, len(view), chunk_size):
+                yield view[start : start + chunk_size]
+        elif hasattr(self.data, "read"):
+            while True:
+                chunk = self.data.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            for chunk in self.data:
+                if chunk:
+                    yield chunk
+
+
+class MultipartBody:
+    """
+    A ``multipart/form-data`` request body which is generated while it is
+    sent, instead of being read into memory first.
+
+    File contents are read in chunks of ``chunk_size`` bytes, so sending a
+    large attachment takes a bounded amount of memory. The body can be passed
+    as ``data`` to :mod:`requests` (which iterates over it) and to
+    :mod:`aiohttp` (which iterates over it asynchronously).
+
+    Parameters
+    ----------
+    fields: List[Tuple[str, Any]]
+        The fields of the body, as ``(name, value)`` pairs. Values may be
+        ``bytes`` or ``str``, a :class:`.File`, or a tuple of
+        ``(filename, data)`` or ``(filename, data, content_type)`` in the
+        style of the ``files`` parameter of :func:`requests.request`. The
+        data may be bytes, a file object or an iterable of bytes.
+    boundary: str
+        The boundary separating the fields. Generated randomly if omitted.
+    chunk_size: int
+        The maximum number of bytes to read from a file at once.
+    progress: Callable[[int, int], None]
+        Called after each chunk is produced with the number of bytes sent so
+        far and the total length (or ``None`` if it isn't known in advance).
+
+    Attributes
+    ----------
+    content_type: str
+        The ``Content-Type`` header to send along with the body.
+    len: int
+        The total length of the body in bytes, or ``None`` if some of the
+        data comes from an iterator. In that case, the body is sent with
+        chunked transfer encoding. (This is an attribute rather than
+        ``__len__`` so that :mod:`requests` can handle both cases.)
+    """
+
+    def __init__(
+        self,
+        fields: List[Tuple[str, object]],
+        *,
+        boundary: str = None,
+        chunk_size: int = 64 * 1024,
+        progress: Callable[[int, int], None] = None,
+    ):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+
+        self.parts = []
+        for name, value in fields:
+            if isinstance(value, File):
+                self.parts.append(
+                    _Part(name, value, value.filename, value.content_type)
+                )
+            elif isinstance(value, tuple):
+                filename, data, *content_type = value
+                self.parts.append(_Part(name, data, filename, *content_type[:1]))
+            else:
+                self.parts.append(_Part(name, value))
+
+        self._delimiter = f"--{self.boundary}\r\n".encode("ascii")
+        self._closing = f"--{self.boundary}--\r\n".encode("ascii")
+
+        if any(part.length is None for part in self.parts):
+            self.len = None
+        else:
+            self.len = len(self._closing) + sum(
+                len(self._delimiter) + len(part.header) + part.length + 2
+                for part in self.parts
+            )
+
+    def __iter__(self):
+        sent = 0
+        for chunk in self._chunks():
+            sent += len(chunk)
+            yield chunk
+            if self.progress is not None:
+                self.progress(sent, self.len)
+
+    async def __aiter__(self):
+        for chunk in self:
+            yield chunk
+
+    def _chunks(self) -> Iterable[bytes]:
+        for part in self.parts:
+            yield self._delimiter + part.header
+            yield from part.iter_data(self.chunk_size)
+            yield b"\r\n"
+        yield self._closing
+
+    def to_bytes(self):
+        "Generate the whole body at once."
+        return b"".join(self)
@@ -0,0 +1,222 @@
+import re
+import json
+import string
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from flask_discord_interactions.models.message import Message
+
+
+_formatter = string.Formatter()
+
+# Templated strings are replaced by markers like "\u00002\u0000" in the JSON
+_MARKER = "\x00{}\x00"
+_MARKER_PATTERN = re.compile(r'"\\u0000(\d+)\\u0000"')
+
+
+class MessageTemplate:
+    """
+    A :class:`.Message` that is serialized once, with placeholders that are
+    filled in each time it is sent.
+
+    Placeholders use :meth:`str.format` syntax (``{name}``, ``{count:,}``)
+    and may appear in any string in the message, including embeds and
+    component custom IDs. Only strings that contain one of the declared
+    ``placeholders`` are templated. Every other string, such as a URL or a
+    packed custom ID that happens to contain braces, is sent as it is. In
+    templated strings, use ``{{`` and ``}}`` for literal braces.
+
+    .. code-block:: python
+
+        welcome = MessageTemplate(
+            Message(
+                embed=Embed(title="Welcome, {name}!", description="You are member #{count}"),
+                components=[ActionRow(components=[
+                    Button(label="Say hi", custom_id=[handle_hi, "{user_id}"])
+                ])],
+            ),
+            ["name", "count", "user_id"],
+        )
+
+        @discord.command()
+        def greet(ctx):
+            return welcome.render(name=ctx.author.display_name, count=42, user_id=ctx.author.id)
+
+    Rendering only formats the templated strings and splices them into the
+    pre-serialized JSON, so the :class:`.Embed` and :class:`.Component`
+    objects are never rebuilt. Note that filled-in values are not validated
+    (e.g. a custom ID could exceed 100 characters).
+
+    Parameters
+    ----------
+    message: Message
+        The message to use as a template. It may not include files.
+    placeholders: Iterable[str]
+        The names of the placeholders in the template.
+
+    Attributes
+    ----------
+    slots: Set[str]
+        The names of the placeholders in the template.
+    """
+
+    def __init__(self, message: "Message", placeholders: Iterable[str]):
+        if message.files:
+            raise ValueError("Message templates cannot include files.")
+
+        self.slots = set(placeholders)
+        self._initial = self._compile(message.dump(followup=False))
+        self._followup = self._compile(message.dump(followup=True))
+
+    def _compile(self, payload: dict):
+        strings = []
+
+        def replace_strings(value):
+            if isinstance(value, str):
+                parts = self._parse(value)
+                if parts is None:
+                    return value
+
+                strings.append(parts)
+                return _MARKER.format(len(strings) - 1)
+            elif isinstance(value, dict):
+                return {k: replace_strings(v) for k, v in value.items()}
+            elif isinstance(value, list):
+                return [replace_strings(v) for v in value]
+            else:
+                return value
+
+        pieces = _MARKER_PATTERN.split(json.dumps(replace_strings(payload)))
+
+        # Alternating JSON fragments and templated strings
+        fragments = pieces[::2]
+        templated = [strings[int(index)] for index in pieces[1::2]]
+        return fragments, templated
+
+    def _parse(self, value: str):
+        "Split a string into its format parts, or ``None`` if not templated."
+        if "{" not in value:
+            return None
+
+        try:
+            parts = list(_formatter.parse(value))
+        except ValueError:
+            # Not a format string, e.g. a packed custom ID
+            return None
+
+        names = {
+            re.match(r"[^.\[]*", field).group()
+            for _, field, _, _ in parts
+            if field is not None
+        }
+        if not names & self.slots:
+            return None
+
+        if "" in names:
+            raise ValueError(f"Positional placeholders are not supported: {value!r}")
+
+        unknown = names - self.slots
+        if unknown:
+            raise ValueError(
+                f"Undeclared placeholders {', '.join(sorted(unknown))} in {value!r}"
+            )
+
+        return parts
+
+    def render(self, **values):
+        """
+        Fill in the placeholders of this template.
+
+        Parameters
+        ----------
+        **values
+            The value for each placeholder.
+
+        Returns
+        -------
+        RenderedMessage
+            A response that can be returned from a command or handler, or
+            passed to :meth:`.Context.send` and :meth:`.Context.edit`.
+        """
+        missing = self.slots - values.keys()
+        if missing:
+            raise ValueError(f"Missing values for {', '.join(sorted(missing))}")
+
+        return RenderedMessage(self, values)
+
+    def encode_with(self, values: dict, followup: bool = False):
+        """
+        Fill in the placeholders and return the encoded message.
+
+        Parameters
+        ----------
+        values: dict
+            The value for each placeholder.
+        followup: bool
+            Whether this is a followup message.
+
+        Returns
+        -------
+        bytes
+            The JSON-encoded message.
+        str
+            The mimetype of the message (``application/json``).
+        """
+        fragments, templated = self._followup if followup else self._initial
+
+        out = [fragments[0]]
+        for parts, fragment in zip(templated, fragments[1:]):
+            out.append(json.dumps(self._format(parts, values)))
+            out.append(fragment)
+
+        return "".join(out).encode("utf-8"), "application/json"
+
+    @staticmethod
+    def _format(parts, values: dict):
+        result = []
+        for literal, field, spec, conversion in parts:
+            result.append(literal)
+            if field is not None:
+                value = _formatter.get_field(field, (), values)[0]
+                value = _formatter.convert_field(value, conversion)
+                result.append(_formatter.format_field(value, spec))
+        return "".join(result)
+
+
+class RenderedMessage:
+    """
+    A :class:`MessageTemplate` with its placeholders filled in. It is
+    encoded when it is sent, as either an initial response or a followup.
+
+    Attributes
+    ----------
+    template: MessageTemplate
+        The template that was rendered.
+    values: dict
+        The value for each placeholder.
+    """
+
+    __slots__ = ("template", "values")
+
+    def __init__(self, template: MessageTemplate, values: dict):
+        self.template = template
+        self.values = values
+
+    def encode(self, followup: bool = False):
+        """
+        Return the rendered message as a bytes/mimetype pair for sending to
+        Discord.
+
+        Parameters
+        ----------
+        followup: bool
+            Whether this is a followup message.
+
+        Returns
+        -------
+        bytes
+            The JSON-encoded message.
+        str
+            The mimetype of the message (``application/json``).
+        """
+        return self.template.encode_with(self.values, followup)
@@ -1,4 +1,64 @@
 import inspect
+import contextlib
+import contextvars
+import dataclasses
+
+_validate = True
+_trusted = contextvars.ContextVar("trusted", default=False)
+
+
+def set_validation(enabled: bool):
+    """
+    Enable or disable validation of models (:class:`.Message`,
+    :class:`.Component` s, :class:`.Modal` s) globally.
+
+    Validation is enabled by default, which catches mistakes like overlong
+    custom IDs or invalid component nesting as early as possible. In
+    production, once your responses are known to be valid, you can disable
+    it to make constructing models cheaper. Normalization (such as joining
+    list custom IDs) still happens either way.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether models should be validated when constructed.
+    """
+    global _validate
+    _validate = enabled
+
+
+def validation_enabled():
+    """
+    Whether models constructed right now should be validated.
+
+    Returns
+    -------
+    bool
+        ``False`` if validation is disabled globally or inside a
+        :func:`trusted` block.
+    """
+    return _validate and not _trusted.get()
+
+
+@contextlib.contextmanager
+def trusted():
+    """
+    Context manager that skips model validation for everything constructed
+    inside it, e.g. when parsing data that Discord has already validated.
+
+    .. code-block:: python
+
+        with trusted():
+            message = Message.from_dict(data["message"])
+    """
+    token = _trusted.set(True)
+    try:
+        yield
+    finally:
+        _trusted.reset(token)
+
+
+_parameters = {}
 
 
 class LoadableDataclass:
@@ -13,6 +73,124 @@ class LoadableDataclass:
         data: dict
             A dictionary of fields to set on the dataclass.
         """
-        return cls(
-            **{k: v for k, v in data.items() if k in inspect.signature(cls).parameters}
-        )
+        parameters = _parameters.get(cls)
+        if parameters is None:
+            parameters = _parameters[cls] = frozenset(inspect.signature(cls).parameters)
+
+        return cls(**{k: v for k, v in data.items() if k in parameters})
+
+
+class EncodedResponse:
+    """
+    Represents a response which has already been encoded, such as one
+    served from a cache.
+
+    Attributes
+    ----------
+    data: bytes
+        The encoded response body.
+    mimetype: str
+        The mimetype of the response body.
+    """
+
+    __slots__ = ("data", "mimetype")
+
+    def __init__(self, data: bytes, mimetype: str):
+        self.data = data
+        self.mimetype = mimetype
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Encode a response (e.g. a :class:`.Message` or
+        :class:`.AutocompleteResult`) once and keep the result.
+
+        Parameters
+        ----------
+        response
+            Any object with an ``encode()`` method.
+        """
+        data, mimetype = response.encode()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return cls(data, mimetype)
+
+    def encode(self):
+        """
+        Return the stored response body and mimetype.
+
+        Returns
+        -------
+        bytes
+            The encoded response body.
+        str
+            The mimetype of the response body.
+        """
+        return self.data, self.mimetype
+
+
+_dumpers = {}
+
+# Fields with these annotations are copied as-is, without inspecting the value
+_SCALAR_TYPES = (str, int, float, bool)
+
+
+def dump_dataclass(obj):
+    """
+    Convert a dataclass instance into a dictionary for sending to Discord,
+    recursively removing fields and list items which are ``None``.
+
+    This produces the same result as filtering the output of
+    :func:`dataclasses.asdict`, but in a single pass and without deep-copying
+    the instance. The conversion function for each class is generated the
+    first time an instance of it is dumped.
+
+    Parameters
+    ----------
+    obj
+        The dataclass instance to convert.
+
+    Returns
+    -------
+    dict
+        The dictionary representation of the instance.
+    """
+    cls = type(obj)
+    dumper = _dumpers.get(cls)
+    if dumper is None:
+        dumper = _dumpers[cls] = _compile_dumper(cls)
+    return dumper(obj)
+
+
+def _dump_value(value):
+    if isinstance(value, (str, int, float)):
+        return value
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dump_dataclass(value)
+    elif isinstance(value, (list, tuple)):
+        return [_dump_value(item) for item in value if item is not None]
+    elif isinstance(value, dict):
+        return {k: _dump_value(v) for k, v in value.items() if v is not None}
+    else:
+        return value
+
+
+def _compile_dumper(cls):
+    lines = ["def dump(self):", "    data = {}"]
+
+    for field in dataclasses.fields(cls):
+        lines.append(f"    value = self.{field.name}")
+        if field.type in _SCALAR_TYPES:
+            lines.append(f"    if value is not None: data[{field.name!r}] = value")
+        else:
+            lines.append(
+                f"    if value is not None: data[{field.name!r}] = _dump_value(value)"
+            )
+
+    lines.append("    return data")
+
+    namespace = {"_dump_value": _dump_value}
+    exec("\n".join(lines), namespace)
+    dumper = namespace["dump"]
+    dumper.__qualname__ = f"{cls.__qualname__}.dump"
+    return dumper
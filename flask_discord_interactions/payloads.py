@@ -0,0 +1,436 @@
+import json
+import time
+import random
+import itertools
+from typing import Union
+
+from nacl.signing import SigningKey
+
+from flask_discord_interactions.models.option import CommandOptionType
+from flask_discord_interactions.models.command import ApplicationCommandType
+from flask_discord_interactions.models.component import ComponentType
+from flask_discord_interactions.utils import make_snowflake
+
+
+def payload_label(payload: dict):
+    "Return the command name or custom ID handler an interaction is for."
+    data = payload.get("data") or {}
+    if "name" in data:
+        return data["name"]
+    if "custom_id" in data:
+        return data["custom_id"].split("\n", 1)[0]
+    return "ping"
+
+
+class Signer:
+    """
+    Signs interaction payloads the way Discord does, with an Ed25519 key.
+
+    Use this to send signed interactions to a bot under test. Set the bot's
+    ``DISCORD_PUBLIC_KEY`` config option to :attr:`public_key`.
+
+    Parameters
+    ----------
+    private_key: Union[str, bytes]
+        The 32-byte private key seed, as bytes or a hex string. If omitted,
+        a new key is generated.
+
+    Attributes
+    ----------
+    public_key: str
+        The public key, as a hex string.
+    """
+
+    def __init__(self, private_key: Union[str, bytes] = None):
+        if private_key is None:
+            self.signing_key = SigningKey.generate()
+        else:
+            if isinstance(private_key, str):
+                private_key = bytes.fromhex(private_key)
+            self.signing_key = SigningKey(private_key)
+
+        self.public_key = self.signing_key.verify_key.encode().hex()
+
+    @property
+    def private_key(self):
+        "The private key seed, as a hex string."
+        return self.signing_key.encode().hex()
+
+    def headers(self, body: bytes, timestamp: int = None):
+        """
+        Sign a request body.
+
+        Parameters
+        ----------
+        body: bytes
+            The request body.
+        timestamp: int
+            The Unix timestamp to sign the body with. Defaults to now.
+
+        Returns
+        -------
+        dict
+            The ``Content-Type``, ``X-Signature-Ed25519`` and
+            ``X-Signature-Timestamp`` headers.
+        """
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        timestamp = str(timestamp)
+        signature = self.signing_key.sign(timestamp.encode() + body).signature
+
+        return {
+            "Content-Type": "application/json",
+            "X-Signature-Ed25519": signature.hex(),
+            "X-Signature-Timestamp": timestamp,
+        }
+
+    def sign(self, payload: dict, timestamp: int = None):
+        """
+        Serialize and sign an interaction payload.
+
+        Returns
+        -------
+        bytes
+            The request body.
+        dict
+            The request headers.
+        """
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return body, self.headers(body, timestamp)
+
+
+class Mention:
+    """
+    A user, role or channel generated by :class:`InteractionFactory`, to
+    pass as a command option. It is added to the ``resolved`` data of the
+    interaction.
+    """
+
+    def __init__(self, option_type: int, id: str, data: dict, member: dict = None):
+        self.option_type = option_type
+        self.id = id
+        self.data = data
+        self.member = member
+
+
+class InteractionFactory:
+    """
+    Generates realistic interaction payloads, as Discord would send them,
+    for tests, benchmarks and load tests.
+
+    Every payload gets a fresh snowflake ID for the current time, and is
+    invoked by a guild member in a guild channel.
+
+    .. code-block:: python
+
+        factory = InteractionFactory()
+        payload = factory.slash_command(
+            "moderation", "ban", target=factory.user(), reason="spam", days=7
+        )
+
+    Parameters
+    ----------
+    seed
+        Seed for the generated names and IDs, for reproducible payloads.
+    locale: str
+        The locale of the invoking user.
+    """
+
+    def __init__(self, seed=None, *, locale: str = "en-US"):
+        self.random = random.Random(seed)
+        self.locale = locale
+        self.counter = itertools.count()
+        self.application_id = self.snowflake()
+        self.guild_id = self.snowflake()
+        self.channel_id = self.snowflake()
+        self.author = self.user()
+
+    def snowflake(self):
+        "Return a new snowflake for the current time."
+        return make_snowflake(increment=next(self.counter))
+
+    def user(self, username: str = None):
+        "Generate a guild member, to pass as a user option."
+        id = self.snowflake()
+        if username is None:
+            username = f"user{self.random.randrange(100000)}"
+
+        user = {
+            "id": id,
+            "username": username,
+            "discriminator": f"{self.random.randrange(10000):04}",
+            "avatar": "%032x" % self.random.getrandbits(128),
+            "public_flags": 0,
+        }
+        member = {
+            "roles": [],
+            "nick": None,
+            "joined_at": "2021-01-01T00:00:00.000000+00:00",
+            "premium_since": None,
+            "deaf": False,
+            "mute": False,
+            "pending": False,
+            "permissions": "2147483647",
+        }
+
+        return Mention(CommandOptionType.USER, id, user, member)
+
+    def role(self, name: str = None):
+        "Generate a role, to pass as a role option."
+        id = self.snowflake()
+        return Mention(
+            CommandOptionType.ROLE,
+            id,
+            {
+                "id": id,
+                "name": name or f"role{self.random.randrange(1000)}",
+                "color": self.random.randrange(0x1000000),
+                "hoist": False,
+                "position": self.random.randrange(50),
+                "permissions": "104324673",
+                "managed": False,
+                "mentionable": True,
+            },
+        )
+
+    def channel(self, name: str = None):
+        "Generate a text channel, to pass as a channel option."
+        id = self.snowflake()
+        return Mention(
+            CommandOptionType.CHANNEL,
+            id,
+            {
+                "id": id,
+                "name": name or f"channel{self.random.randrange(1000)}",
+                "type": 0,
+                "permissions": "2147483647",
+            },
+        )
+
+    def _base(self, interaction_type: int, data: dict):
+        member = dict(self.author.member, user=self.author.data)
+        return {
+            "type": interaction_type,
+            "id": self.snowflake(),
+            "application_id": self.application_id,
+            "token": "".join(
+                self.random.choice("abcdefghijklmnopqrstuvwxyz0123456789_-")
+                for _ in range(160)
+            ),
+            "version": 1,
+            "guild_id": self.guild_id,
+            "channel_id": self.channel_id,
+            "member": member,
+            "locale": self.locale,
+            "guild_locale": "en-US",
+            "app_permissions": "2147483647",
+            "data": data,
+        }
+
+    def _options(self, options: dict, resolved: dict, focused: str = None):
+        result = []
+        for name, value in options.items():
+            option = {"name": name}
+
+            if isinstance(value, Mention):
+                option["type"] = value.option_type
+                option["value"] = value.id
+                self._resolve(value, resolved)
+            elif isinstance(value, bool):
+                option["type"] = CommandOptionType.BOOLEAN
+                option["value"] = value
+            elif isinstance(value, int):
+                option["type"] = CommandOptionType.INTEGER
+                option["value"] = value
+            elif isinstance(value, float):
+                option["type"] = CommandOptionType.NUMBER
+                option["value"] = value
+            else:
+                option["type"] = CommandOptionType.STRING
+                option["value"] = str(value)
+
+            if name == focused:
+                option["focused"] = True
+
+            result.append(option)
+
+        return result
+
+    @staticmethod
+    def _resolve(mention: Mention, resolved: dict):
+        if mention.option_type == CommandOptionType.USER:
+            resolved.setdefault("users", {})[mention.id] = dict(mention.data)
+            resolved.setdefault("members", {})[mention.id] = dict(mention.member)
+        elif mention.option_type == CommandOptionType.ROLE:
+            resolved.setdefault("roles", {})[mention.id] = dict(mention.data)
+        else:
+            resolved.setdefault("channels", {})[mention.id] = dict(mention.data)
+
+    def _command_data(self, name, subcommands, options, focused=None):
+        resolved = {}
+        options = self._options(options, resolved, focused)
+
+        # Nest the options inside the subcommand (group) options
+        option_types = [
+            CommandOptionType.SUB_COMMAND_GROUP,
+            CommandOptionType.SUB_COMMAND,
+        ]
+        for subcommand, option_type in reversed(
+            list(zip(subcommands, option_types[-len(subcommands) :]))
+        ):
+            options = [{"type": option_type, "name": subcommand, "options": options}]
+
+        data = {
+            "id": self.snowflake(),
+            "name": name,
+            "type": ApplicationCommandType.CHAT_INPUT,
+            "options": options,
+        }
+        if resolved:
+            data["resolved"] = resolved
+
+        return data
+
+    def slash_command(self, *names: str, **options):
+        """
+        Generate a slash command interaction.
+
+        Parameters
+        ----------
+        *names: str
+            The names of the command, subcommand group and subcommand (if
+            present), like for :meth:`.Client.run`.
+        **options
+            The option values. Strings, integers, floats and booleans get
+            the corresponding option type. Pass the result of :meth:`user`,
+            :meth:`role` or :meth:`channel` for mention options.
+        """
+        return self._base(2, self._command_data(names[0], names[1:], options))
+
+    def autocomplete(self, *names: str, focused: str, **options):
+        """
+        Generate an autocomplete interaction.
+
+        Parameters
+        ----------
+        *names: str
+            The names of the command, subcommand group and subcommand (if
+            present).
+        focused: str
+            The name of the option being typed, which must be in ``options``.
+        **options
+            The option values, as for :meth:`slash_command`.
+        """
+        return self._base(4, self._command_data(names[0], names[1:], options, focused))
+
+    def user_command(self, name: str, target: Mention = None):
+        "Generate a user command interaction targeting a user."
+        if target is None:
+            target = self.user()
+
+        resolved = {}
+        self._resolve(target, resolved)
+
+        return self._base(
+            2,
+            {
+                "id": self.snowflake(),
+                "name": name,
+                "type": ApplicationCommandType.USER,
+                "target_id": target.id,
+                "resolved": resolved,
+            },
+        )
+
+    def message(self, content: str = "Hello!", components: list = None):
+        "Generate a message sent by the bot, e.g. to target or click on."
+        return {
+            "id": self.snowflake(),
+            "type": 0,
+            "channel_id": self.channel_id,
+            "content": content,
+            "author": {
+                "id": self.application_id,
+                "username": "Bot",
+                "discriminator": "0000",
+                "bot": True,
+            },
+            "embeds": [],
+            "components": components or [],
+            "timestamp": "2022-01-01T00:00:00.000000+00:00",
+        }
+
+    def message_command(self, name: str, message: dict = None):
+        "Generate a message command interaction targeting a message."
+        if message is None:
+            message = self.message()
+
+        return self._base(
+            2,
+            {
+                "id": self.snowflake(),
+                "name": name,
+                "type": ApplicationCommandType.MESSAGE,
+                "target_id": message["id"],
+                "resolved": {"messages": {message["id"]: message}},
+            },
+        )
+
+    def component(self, custom_id: str, *, values: list = None):
+        """
+        Generate a button click, or a select menu interaction if ``values``
+        are given. The clicked component is attached to a generated message.
+        """
+        component_type = (
+            ComponentType.BUTTON if values is None else ComponentType.SELECT_MENU
+        )
+
+        component = {"type": component_type, "custom_id": custom_id}
+        if values is None:
+            component.update(style=1, label="Click")
+        else:
+            component["options"] = [
+                {"label": value, "value": value} for value in values
+            ]
+
+        payload = self._base(
+            3, {"custom_id": custom_id, "component_type": component_type}
+        )
+        payload["message"] = self.message(
+            components=[{"type": ComponentType.ACTION_ROW, "components": [component]}]
+        )
+        if values is not None:
+            payload["data"]["values"] = list(values)
+
+        return payload
+
+    def modal_submit(self, custom_id: str, **fields: str):
+        "Generate a modal submission with a text input for each field."
+        return self._base(
+            5,
+            {
+                "custom_id": custom_id,
+                "components": [
+                    {
+                        "type": ComponentType.ACTION_ROW,
+                        "components": [
+                            {
+                                "type": ComponentType.TEXT_INPUT,
+                                "custom_id": name,
+                                "value": value,
+                            }
+                        ],
+                    }
+                    for name, value in fields.items()
+                ],
+            },
+        )
+
+    def ping(self):
+        "Generate a ping, as sent by Discord to check the endpoint."
+        return {
+            "type": 1,
+            "id": self.snowflake(),
+            "application_id": self.application_id,
+        }
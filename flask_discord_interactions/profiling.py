@@ -0,0 +1,214 @@
+import os
+import re
+import sys
+import json
+import time
+import itertools
+import threading
+import collections
+
+
+class _Capture:
+    __slots__ = ("thread", "sampled", "stacks", "started")
+
+    def __init__(self, thread: int, sampled: bool):
+        self.thread = thread
+        self.sampled = sampled
+        self.stacks = collections.Counter()
+        self.started = time.time()
+
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}"
+            f":{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Profiler:
+    """
+    Samples the call stack of interactions while they are handled, and
+    writes the stacks of selected interactions to a directory.
+
+    A background thread records the stack of every thread that is handling
+    a profiled interaction, every ``interval`` seconds. Nothing is sampled
+    while no interaction is being profiled.
+
+    For each captured interaction, two files are written:
+
+    - ``<name>.folded``: the collapsed stacks, one per line followed by the
+      number of samples, as read by `flamegraph.pl
+      <https://github.com/brendangregg/FlameGraph>`_ and `speedscope
+      <https://www.speedscope.app>`_.
+    - ``<name>.json``: the command name, interaction type, phase timings
+      and the reason the interaction was captured.
+
+    Under Quart, every task on the event loop shares a thread, so the stacks
+    of concurrently handled interactions are mixed together.
+
+    Parameters
+    ----------
+    directory: str
+        The directory to write profiles to. It is created if needed.
+    sample_every: int
+        Capture one in every ``sample_every`` interactions.
+    threshold: float
+        Capture every interaction that takes at least this many seconds.
+        Every interaction is sampled while it runs, since it isn't known in
+        advance which will be slow.
+    interval: float
+        The number of seconds between stack samples.
+    max_files: int
+        The maximum number of profiles to keep. The oldest profiles are
+        deleted first.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        sample_every: int = None,
+        threshold: float = None,
+        interval: float = 0.005,
+        max_files: int = 100,
+    ):
+        if sample_every is None and threshold is None:
+            raise ValueError("Either sample_every or threshold is required.")
+
+        self.directory = directory
+        self.sample_every = sample_every
+        self.threshold = threshold
+        self.interval = interval
+        self.max_files = max_files
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._count = itertools.count(1)
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start profiling the interaction handled by the current thread.
+
+        Returns
+        -------
+        object
+            An opaque capture to pass to :meth:`finish`, or ``None`` if this
+            interaction isn't profiled.
+        """
+        sampled = (
+            self.sample_every is not None and next(self._count) % self.sample_every == 0
+        )
+        if not sampled and self.threshold is None:
+            return None
+
+        capture = _Capture(threading.get_ident(), sampled)
+
+        with self._lock:
+            self._active.add(capture)
+            self._wakeup.set()
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="discord-interactions-profiler", daemon=True
+                )
+                self._thread.start()
+
+        return capture
+
+    def finish(self, capture, timings):
+        """
+        Stop profiling an interaction, and write its profile if it was
+        selected.
+
+        Parameters
+        ----------
+        capture
+            The value returned by :meth:`start`.
+        timings: Timings
+            The timings of the interaction.
+        """
+        if capture is None:
+            return
+
+        with self._lock:
+            self._active.discard(capture)
+
+        total = timings.total
+        if capture.sampled:
+            self.write(capture, timings, total, "sampled")
+        elif self.threshold is not None and total >= self.threshold:
+            self.write(capture, timings, total, "slow")
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._wakeup.clear()
+                    continue
+
+            frames = sys._current_frames()
+            for capture in active:
+                frame = frames.get(capture.thread)
+                if frame is not None:
+                    capture.stacks[_collapse(frame)] += 1
+            del frames
+
+            time.sleep(self.interval)
+
+    def write(self, capture, timings, total: float, reason: str):
+        "Write the profile of a captured interaction."
+        command = timings.labels.get("command", "unknown")
+        name = "{}-{}-{}".format(
+            time.strftime("%Y%m%dT%H%M%S", time.gmtime(capture.started)),
+            f"{capture.started % 1:.6f}"[2:],
+            re.sub(r"[^\w-]", "_", command),
+        )
+        path = os.path.join(self.directory, name)
+
+        with open(path + ".folded", "w", encoding="utf-8") as f:
+            for stack, count in capture.stacks.items():
+                f.write(f"{stack} {count}\n")
+
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "command": command,
+                    "type": timings.labels.get("type"),
+                    "reason": reason,
+                    "started": capture.started,
+                    "total": total,
+                    "phases": timings.phases,
+                    "samples": sum(capture.stacks.values()),
+                    "interval": self.interval,
+                },
+                f,
+            )
+
+        self.rotate()
+
+    def rotate(self):
+        "Delete the oldest profiles until at most ``max_files`` remain."
+        profiles = sorted(
+            name[: -len(".folded")]
+            for name in os.listdir(self.directory)
+            if name.endswith(".folded")
+        )
+
+        for name in profiles[: max(len(profiles) - self.max_files, 0)]:
+            for extension in [".folded", ".json"]:
+                try:
+                    os.remove(os.path.join(self.directory, name + extension))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,367 @@
+import time
+import pickle
+import secrets
+import sqlite3
+import threading
+from typing import Any
+
+from flask_discord_interactions.cache import TTLCache
+
+
+class State:
+    """
+    Marks a custom ID handler parameter as a key into the state store.
+
+    When the handler is invoked, the key found in the custom ID is replaced
+    with the value stored under it, or ``None`` if it has expired.
+
+    .. code-block:: python
+
+        @discord.custom_handler()
+        def handle_page(ctx, pages: State, pageno: int):
+            if pages is None:
+                return Message("This menu has expired.", ephemeral=True)
+            ...
+
+        @discord.command()
+        def paginate(ctx):
+            key = ctx.state.put(fetch_pages())
+            return Message(..., components=[Button(custom_id=[handle_page, key, 0])])
+    """
+
+
+class StateStore:
+    """
+    Base class for stores of server-side component state.
+
+    Large or sensitive state does not fit in the 100 characters of a custom
+    ID. Instead, it can be stored server-side with :meth:`put`, and only the
+    returned key is placed in the custom ID.
+
+    Subclasses implement :meth:`get`, :meth:`set` and :meth:`delete`, and
+    should implement :meth:`add` atomically if the store is shared between
+    workers.
+
+    Attributes
+    ----------
+    ttl: float
+        The default number of seconds to keep values for. If ``None``,
+        values are kept until they are evicted or deleted.
+    """
+
+    def __init__(self, ttl: float = None):
+        self.ttl = ttl
+
+    @staticmethod
+    def new_key():
+        "Generate a new random key, short enough to fit in a custom ID."
+        return secrets.token_urlsafe(12)
+
+    def put(self, value: Any, ttl: float = None):
+        """
+        Store a value under a new random key.
+
+        Parameters
+        ----------
+        value
+            The value to store.
+        ttl
+            The number of seconds to keep the value for. Defaults to the
+            store's ``ttl``.
+
+        Returns
+        -------
+        str
+            The key to place in the custom ID.
+        """
+        key = self.new_key()
+        self.set(key, value, ttl)
+        return key
+
+    def get(self, key: str, default: Any = None):
+        """
+        Look up a stored value.
+
+        Parameters
+        ----------
+        key
+            The key returned by :meth:`put`.
+        default
+            The value to return if the key is unknown or has expired.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        """
+        Store a value under the given key, replacing any existing value.
+
+        Parameters
+        ----------
+        key
+            The key to store the value under.
+        value
+            The value to store.
+        ttl
+            The number of seconds to keep the value for. Defaults to the
+            store's ``ttl``.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """
+        Remove a stored value, if it exists.
+
+        Parameters
+        ----------
+        key
+            The key of the value to remove.
+        """
+        raise NotImplementedError
+
+    def add(self, key: str, value: Any, ttl: float = None):
+        """
+        Store a value under the given key, unless a value is already stored
+        there.
+
+        The default implementation is not atomic.
+
+        Parameters
+        ----------
+        key
+            The key to store the value under.
+        value
+            The value to store.
+        ttl
+            The number of seconds to keep the value for. Defaults to the
+            store's ``ttl``.
+
+        Returns
+        -------
+        bool
+            Whether the value was stored.
+        """
+        missing = object()
+        if self.get(key, missing) is not missing:
+            return False
+
+        self.set(key, value, ttl)
+        return True
+
+
+class MemoryStateStore(StateStore):
+    """
+    Stores state in process memory, bounded by a maximum number of entries.
+
+    This is the default store. It is thread-safe, but it is not shared
+    between worker processes, so a component rendered by one worker can't
+    be handled by another. Use :class:`SQLiteStateStore` or
+    :class:`RedisStateStore` if you run multiple workers.
+
+    Attributes
+    ----------
+    maxsize: int
+        The maximum number of values to keep. The least recently used value
+        is evicted when the store is full.
+    ttl: float
+        The number of seconds to keep values for.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 15 * 60):
+        super().__init__(ttl)
+        self.cache = TTLCache(maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None):
+        entry = self.cache.get(key)
+        if entry is None:
+            return default
+
+        expires, value = entry
+        if expires is not None and expires <= time.monotonic():
+            self.cache.pop(key)
+            return default
+
+        return value
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        if ttl is None:
+            ttl = self.ttl
+
+        expires = None if ttl is None else time.monotonic() + ttl
+        self.cache.set(key, (expires, value))
+
+    def delete(self, key: str):
+        self.cache.pop(key)
+
+    def add(self, key: str, value: Any, ttl: float = None):
+        with self._lock:
+            return super().add(key, value, ttl)
+
+
+class SQLiteStateStore(StateStore):
+    """
+    Stores state in an SQLite database, which can be shared between worker
+    processes on the same machine and survives restarts.
+
+    Values are serialized with :mod:`pickle`, so only use a database file
+    that your application controls.
+
+    Attributes
+    ----------
+    path: str
+        The path to the database file.
+    ttl: float
+        The number of seconds to keep values for.
+    """
+
+    def __init__(self, path: str, ttl: float = 15 * 60, *, serializer=pickle):
+        super().__init__(ttl)
+        self.path = path
+        self.serializer = serializer
+        self._local = threading.local()
+        self._writes = 0
+
+        with self._connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS component_state "
+                "(key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+            )
+
+    def _connection(self):
+        # SQLite connections can't be shared between threads
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=10)
+        return db
+
+    def get(self, key: str, default: Any = None):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM component_state "
+                "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+
+        if row is None:
+            return default
+
+        return self.serializer.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        if ttl is None:
+            ttl = self.ttl
+
+        expires = None if ttl is None else time.time() + ttl
+
+        with self._connection() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO component_state VALUES (?, ?, ?)",
+                (key, self.serializer.dumps(value), expires),
+            )
+
+        # Purge expired values every so often to keep the database small
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.purge()
+
+    def delete(self, key: str):
+        with self._connection() as db:
+            db.execute("DELETE FROM component_state WHERE key = ?", (key,))
+
+    def add(self, key: str, value: Any, ttl: float = None):
+        if ttl is None:
+            ttl = self.ttl
+
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+
+        # Both statements run in one transaction
+        with self._connection() as db:
+            db.execute(
+                "DELETE FROM component_state WHERE key = ? AND expires <= ?",
+                (key, now),
+            )
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO component_state VALUES (?, ?, ?)",
+                (key, self.serializer.dumps(value), expires),
+            )
+
+        return cursor.rowcount == 1
+
+    def purge(self):
+        "Delete every expired value from the database."
+        with self._connection() as db:
+            db.execute(
+                "DELETE FROM component_state WHERE expires <= ?", (time.time(),)
+            )
+
+
+class RedisStateStore(StateStore):
+    """
+    Stores state in Redis (or any server speaking the Redis protocol), so
+    that it can be shared between every worker of a horizontally scaled
+    deployment. Expiry is handled by Redis itself.
+
+    Values are serialized with :mod:`pickle`, so only use a Redis server that
+    your application controls.
+
+    Attributes
+    ----------
+    client
+        A client object with ``get``, ``set`` and ``delete`` methods
+        compatible with ``redis.Redis``. :meth:`add` uses the ``nx`` option
+        of ``set``.
+    ttl: float
+        The number of seconds to keep values for.
+    prefix: str
+        A prefix added to every key.
+    """
+
+    def __init__(
+        self,
+        client,
+        ttl: float = 15 * 60,
+        *,
+        prefix: str = "discord-interactions:state:",
+        serializer=pickle,
+    ):
+        super().__init__(ttl)
+        self.client = client
+        self.prefix = prefix
+        self.serializer = serializer
+
+    def get(self, key: str, default: Any = None):
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return default
+
+        return self.serializer.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        if ttl is None:
+            ttl = self.ttl
+
+        self.client.set(
+            self.prefix + key,
+            self.serializer.dumps(value),
+            px=None if ttl is None else int(ttl * 1000),
+        )
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def add(self, key: str, value: Any, ttl: float = None):
+        if ttl is None:
+            ttl = self.ttl
+
+        return bool(
+            self.client.set(
+                self.prefix + key,
+                self.serializer.dumps(value),
+                px=None if ttl is None else int(ttl * 1000),
+                nx=True,
+            )
+        )
@@ -0,0 +1,53 @@
+from flask_discord_interactions.utils import RESPONSE_WINDOW
+
+
+class Stats:
+    """
+    The latencies and errors of the requests sent for a single command, by
+    the load test or when replaying a :class:`.Journal`.
+
+    Attributes
+    ----------
+    latencies: List[float]
+        The latency of each successful request, in seconds.
+    errors: int
+        The number of requests that failed or didn't return ``200``.
+    sla_misses: int
+        The number of requests that failed or took longer than Discord's
+        3 second response window.
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.sla_misses = 0
+
+    def record(self, latency: float, ok: bool):
+        if ok:
+            self.latencies.append(latency)
+        else:
+            self.errors += 1
+
+        if not ok or latency > RESPONSE_WINDOW:
+            self.sla_misses += 1
+
+    def summary(self):
+        "Summarize the results as a dict, with latencies in milliseconds."
+        latencies = sorted(self.latencies)
+        count = len(latencies) + self.errors
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000
+
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "sla_misses": self.sla_misses,
+            "p50_ms": percentile(0.5),
+            "p90_ms": percentile(0.9),
+            "p99_ms": percentile(0.99),
+            "max_ms": latencies[-1] * 1000 if latencies else None,
+        }
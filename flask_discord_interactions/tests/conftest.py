@@ -5,12 +5,19 @@ from flask import Flask
 from flask_discord_interactions import DiscordInteractions, Client
 
 
-@pytest.fixture(scope="module")
-def discord():
+@pytest.fixture()
+def app():
     app = Flask(__name__)
+    app.config["DONT_VALIDATE_SIGNATURE"] = True
+    app.config["DONT_REGISTER_WITH_DISCORD"] = True
+    return app
+
+
+@pytest.fixture()
+def discord(app):
     return DiscordInteractions(app)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture()
 def client(discord):
     return Client(discord)
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from flask_discord_interactions import Attachment
+
+
+CONTENT = bytes(range(256)) * 4096
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(CONTENT)))
+        self.end_headers()
+        self.wfile.write(CONTENT)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/file.bin"
+    server.shutdown()
+
+
+def test_attachment_save(url, tmp_path):
+    attachment = Attachment(url=url, filename="file.bin")
+
+    assert attachment.save(tmp_path / "file.bin") == len(CONTENT)
+    assert (tmp_path / "file.bin").read_bytes() == CONTENT
+
+    with attachment.open(spool_size=1024) as f:
+        assert f.read() == CONTENT
+
+
+def test_attachment_size_cap(url, tmp_path):
+    # The declared size is checked before downloading
+    with pytest.raises(ValueError):
+        Attachment(url=url, size=1000).save(tmp_path / "a.bin", max_size=100)
+
+    # The actual size is checked while downloading
+    with pytest.raises(ValueError):
+        Attachment(url=url).save(tmp_path / "b.bin", max_size=len(CONTENT) - 1)
+    assert not (tmp_path / "b.bin").exists()
+
+
+def test_attachment_read_chunks(url):
+    pytest.importorskip("aiohttp")
+
+    async def download():
+        chunks = []
+        async for chunk in Attachment(url=url).read_chunks(4096):
+            assert len(chunk) <= 4096
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    assert asyncio.run(download()) == CONTENT
@@ -0,0 +1,335 @@
+import time
+import asyncio
+import warnings
+import threading
+import itertools
+import concurrent.futures
+
+import pytest
+
+from flask_discord_interactions import (
+    ResponseType,
+    Autocomplete,
+    AutocompleteCache,
+    AutocompleteIndex,
+)
+from flask_discord_interactions.cache import SingleFlight
+from flask_discord_interactions.payloads import InteractionFactory
+
+factory = InteractionFactory()
+
+
+def test_autocomplete(app, discord):
+    @discord.command()
+    def fruit(ctx, name: Autocomplete(str)):
+        return name
+
+    @fruit.autocomplete()
+    def fruit_autocomplete(ctx, name=None):
+        return [f for f in ["apple", "apricot", "banana"] if f.startswith(name.value)]
+
+    discord.set_route("/interactions")
+
+    with app.test_client() as client:
+        response = client.post(
+            "/interactions",
+            json=factory.autocomplete("fruit", focused="name", name="ap"),
+        )
+
+    assert response.status_code == 200
+    assert (
+        response.get_json()["type"]
+        == ResponseType.APPLICATION_COMMAND_AUTOCOMPLETE_RESULT
+    )
+    assert response.get_json()["data"]["choices"] == [
+        {"name": "apple", "value": "apple"},
+        {"name": "apricot", "value": "apricot"},
+    ]
+
+
+def test_autocomplete_cache(app, discord):
+    cache = AutocompleteCache(maxsize=2)
+    calls = 0
+
+    @discord.command()
+    def city(ctx, country: Autocomplete(str), name: Autocomplete(str)):
+        return name
+
+    @city.autocomplete(cache=cache)
+    def city_autocomplete(ctx, country=None, name=None):
+        nonlocal calls
+        calls += 1
+        return [f"{name.value} ({country.value})"]
+
+    discord.set_route("/interactions")
+
+    def complete(value, country="DE"):
+        with app.test_client() as client:
+            response = client.post(
+                "/interactions",
+                json=factory.autocomplete(
+                    "city", focused="name", country=country, name=value
+                ),
+            )
+        return response.get_json()["data"]["choices"][0]["name"]
+
+    assert complete("Ber") == "Ber (DE)"
+    assert complete("Ber") == "Ber (DE)"
+    assert calls == 1
+
+    # Other option values are part of the key
+    assert complete("Ber", country="CH") == "Ber (CH)"
+    assert calls == 2
+
+    assert cache.hits == 1
+    assert cache.misses == 2
+    assert cache.hit_rate == pytest.approx(1 / 3)
+
+    # The least recently used entry is evicted
+    assert complete("Mun") == "Mun (DE)"
+    assert cache.evictions == 1
+    assert complete("Ber") == "Ber (DE)"
+    assert calls == 4
+
+
+def test_async_autocomplete(app, discord):
+    @discord.command()
+    def fruit(ctx, name: Autocomplete(str)):
+        return name
+
+    @fruit.autocomplete(timeout=0.05)
+    async def fruit_autocomplete(ctx, name=None):
+        if name.value == "slow":
+            await asyncio.sleep(1)
+        return [name.value]
+
+    async def complete(value):
+        with app.app_context():
+            result = discord.run_autocomplete(
+                factory.autocomplete("fruit", focused="name", name=value)
+            )
+            return (await result).choices
+
+    assert asyncio.run(complete("apple")) == [{"name": "apple", "value": "apple"}]
+
+    with pytest.warns(UserWarning):
+        assert asyncio.run(complete("slow")) == []
+
+
+def test_autocomplete_deadline(app, discord):
+    @discord.command()
+    def fruit(ctx, name: Autocomplete(str)):
+        return name
+
+    delay = 0.2
+
+    @fruit.autocomplete(cache=AutocompleteCache(ttl=0), timeout=0.05)
+    def fruit_autocomplete(ctx, name=None):
+        time.sleep(delay)
+        return [f"{name.value} after {delay}"]
+
+    discord.set_route("/interactions")
+
+    def complete():
+        with app.test_client() as client:
+            response = client.post(
+                "/interactions",
+                json=factory.autocomplete("fruit", focused="name", name="ap"),
+            )
+        return response.get_json()["data"]["choices"]
+
+    with pytest.warns(UserWarning):
+        assert complete() == []
+
+    # The overrunning handler still fills the cache once it finishes
+    time.sleep(0.3)
+    delay = 0.3
+    with pytest.warns(UserWarning):
+        assert complete() == [{"name": "ap after 0.2", "value": "ap after 0.2"}]
+
+    time.sleep(0.4)
+    delay = 0
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert complete() == [{"name": "ap after 0", "value": "ap after 0"}]
+
+
+def test_autocomplete_cache_expiry():
+    now = 0
+    cache = AutocompleteCache(ttl=10, timer=lambda: now)
+
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    now = 11
+    assert cache.get("key") is None
+    assert cache.get("key", stale=True) == "value"
+
+
+def test_autocomplete_index():
+    index = AutocompleteIndex(
+        ["Berlin", "Bern", "Bergen", "Hamburg", "Heidelberg", ("Munich", "muc")]
+    )
+
+    assert [c.name for c in index.query("ber")] == [
+        "Bergen",
+        "Berlin",
+        "Bern",
+        "Heidelberg",
+    ]
+    assert [c.value for c in index.query("MUN")] == ["muc"]
+    assert [c.name for c in index.query("burg")] == ["Hamburg"]
+    assert len(index.query("", limit=3)) == 3
+
+    # Approximate matches fill up the remaining results
+    assert "Hamburg" in [c.name for c in index.query("hamberg")]
+    assert index.query("xyz") == []
+
+    index.add("Bremen")
+    index.remove("Bern")
+    assert "Bern" not in index
+    assert [c.name for c in index.query("b")][:3] == ["Bergen", "Berlin", "Bremen"]
+
+
+def test_autocomplete_index_short_queries():
+    index = AutocompleteIndex(
+        ["Berlin", "Bern", "Bergen", "Heidelberg", "Bern", ("Erfurt", "erf")]
+    )
+    assert len(index) == 5
+
+    # Prefix matches first, then by match position and length
+    assert [c.name for c in index.query("er")] == [
+        "Erfurt",
+        "Bern",
+        "Bergen",
+        "Berlin",
+        "Heidelberg",
+    ]
+    assert [c.name for c in index.query("g", limit=2)] == ["Bergen", "Heidelberg"]
+
+    index.remove("Bern")
+    index.add("Herne")
+    assert [c.name for c in index.query("rn")] == ["Herne"]
+
+
+def test_autocomplete_index_limit():
+    index = AutocompleteIndex(f"item {i}" for i in range(1000))
+
+    assert len(index.query("item")) == 25
+    assert [c.name for c in index.query("m 99")] == [
+        "item 99",
+        "item 990",
+        "item 991",
+        "item 992",
+        "item 993",
+        "item 994",
+        "item 995",
+        "item 996",
+        "item 997",
+        "item 998",
+        "item 999",
+    ]
+
+
+def test_autocomplete_index_fuzzy_common_ngrams():
+    # Every name shares most of its n-grams with thousands of others
+    syllables = ["north", "west", "king", "ash", "mill", "brook", "ford", "ham"]
+    index = AutocompleteIndex(
+        f"{a}{b} {c}{d}" for a, b, c, d in itertools.product(syllables, repeat=4)
+    )
+
+    assert [c.name for c in index.query("kingbrok milford", limit=3)] == [
+        "kingbrook millford",
+        "kingbrook millash",
+        "kingbrook millham",
+    ]
+    assert len(index.query("kingbrok milford")) == 25
+
+
+def test_autocomplete_coalescing(app, discord):
+    calls = 0
+    release = threading.Event()
+
+    @discord.command()
+    def fruit(ctx, name: Autocomplete(str)):
+        return name
+
+    @fruit.autocomplete(cache=True)
+    def fruit_autocomplete(ctx, name=None):
+        nonlocal calls
+        calls += 1
+        release.wait(1)
+        return [name.value]
+
+    results = []
+
+    def complete():
+        with app.app_context():
+            result = discord.run_autocomplete(
+                factory.autocomplete("fruit", focused="name", name="ap")
+            )
+            results.append(result.encode())
+
+    threads = [threading.Thread(target=complete) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == 1
+    assert len(set(results)) == 1
+
+
+def test_single_flight_finished_future():
+    single_flight = SingleFlight()
+
+    def start():
+        future = concurrent.futures.Future()
+        future.set_result("done")
+        return future
+
+    # Run in a thread, so that a deadlock fails the test instead of hanging
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.extend(
+            single_flight.future(i, start).result() for i in range(3)
+        ),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(1)
+
+    assert results == ["done"] * 3
+    assert single_flight._futures == {}
+
+
+def test_async_autocomplete_coalescing(app, discord):
+    calls = 0
+
+    @discord.command()
+    def fruit(ctx, name: Autocomplete(str)):
+        return name
+
+    @fruit.autocomplete(cache=True)
+    async def fruit_autocomplete(ctx, name=None):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return [name.value]
+
+    async def complete_many():
+        with app.app_context():
+            return await asyncio.gather(
+                *[
+                    discord.run_autocomplete(
+                        factory.autocomplete("fruit", focused="name", name="ap")
+                    )
+                    for _ in range(5)
+                ]
+            )
+
+    results = asyncio.run(complete_many())
+    assert calls == 1
+    assert all(result is results[0] for result in results)
@@ -1,4 +1,7 @@
 import json
+import dataclasses
+
+import pytest
 
 from flask_discord_interactions import (
     Message,
@@ -9,6 +12,9 @@ from flask_discord_interactions import (
     ButtonStyles,
     SelectMenu,
     SelectMenuOption,
+    Context,
+    set_validation,
+    trusted,
 )
 
 
@@ -155,3 +161,92 @@ def test_select_menu(discord, client):
     result, mimetype = client.run("selectmenu").encode()
     assert json.loads(result) == expected
     assert mimetype == "application/json"
+
+
+def test_dump_matches_asdict():
+    def filter_none(d):
+        if isinstance(d, dict):
+            return {k: filter_none(v) for k, v in d.items() if v is not None}
+        elif isinstance(d, list):
+            return [filter_none(v) for v in d if v is not None]
+        else:
+            return d
+
+    components = [
+        ActionRow(
+            components=[
+                Button(
+                    style=ButtonStyles.SUCCESS,
+                    custom_id=["vote", row, column],
+                    emoji={"name": "⬆️", "id": None},
+                )
+                for column in range(5)
+            ]
+        )
+        for row in range(4)
+    ]
+    components.append(
+        ActionRow(
+            components=[
+                SelectMenu(
+                    custom_id="menu",
+                    options=[
+                        SelectMenuOption(label=f"Option {i}", value=str(i))
+                        for i in range(25)
+                    ],
+                )
+            ]
+        )
+    )
+
+    for component in components:
+        assert component.dump() == filter_none(dataclasses.asdict(component))
+        assert list(component.dump()) == list(
+            filter_none(dataclasses.asdict(component))
+        )
+
+
+def test_trusted_construction():
+    with pytest.raises(ValueError):
+        Button(custom_id="x" * 101)
+
+    with trusted():
+        button = Button(custom_id=["x" * 60, "y" * 60])
+        message = Message(content="hi", file=("a.txt", b""), ephemeral=True)
+
+    # Normalization still happens
+    assert button.custom_id == "x" * 60 + "\n" + "y" * 60
+    assert message.files == [("a.txt", b"")]
+
+    set_validation(False)
+    try:
+        Button(custom_id="x" * 101)
+    finally:
+        set_validation(True)
+
+    with pytest.raises(ValueError):
+        button.validate()
+
+
+def test_parse_incoming_without_validation(discord):
+    context = Context.from_data(
+        discord,
+        data={
+            "type": 5,
+            "data": {
+                "custom_id": "ok",
+                "components": [
+                    {
+                        "type": ComponentType.ACTION_ROW,
+                        "components": [
+                            {"type": ComponentType.BUTTON, "custom_id": "x" * 101}
+                        ],
+                    }
+                ],
+            },
+            "message": {"content": "hi", "file": ("a.txt", b""), "ephemeral": True},
+        },
+    )
+
+    assert context.message.content == "hi"
+    assert context.components[0].components[0].custom_id == "x" * 101
@@ -1,6 +1,10 @@
 import json
+import time
+
+import pytest
 
 from flask_discord_interactions import Context, Member, Message, ApplicationCommandType
+from flask_discord_interactions.utils import DISCORD_EPOCH
 
 
 def test_context_parsing():
@@ -304,3 +308,15 @@ def test_message_command_argument(discord, client):
 
     with client.context(Context(target=Message(content="This is a test."))):
         assert client.run("repeat").content == "I repeat, this is a test."
+
+
+def test_deadline():
+    created_at = time.time() - 1
+    snowflake = (int(created_at * 1000) - DISCORD_EPOCH) << 22
+    context = Context.from_data(data={"id": str(snowflake)})
+
+    assert context.created_at == pytest.approx(created_at, abs=0.001)
+    assert context.deadline == pytest.approx(created_at + 3, abs=0.001)
+    assert 1.5 < context.time_remaining() <= 2
+
+    assert Context().time_remaining() is None
@@ -0,0 +1,194 @@
+import re
+import enum
+import uuid
+from typing import Optional
+
+import pytest
+
+from flask_discord_interactions import StateCodec, Context, Button, CustomIDRouter
+from flask_discord_interactions.custom_id import handler_id
+
+
+class Color(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+def test_codec_roundtrip():
+    def handler(
+        ctx,
+        snowflake: int,
+        negative: int,
+        flag: bool,
+        color: Color,
+        name: str,
+        poll: uuid.UUID,
+        ratio: float,
+        maybe: Optional[int],
+        untyped,
+    ):
+        pass
+
+    codec = StateCodec(handler)
+    poll = uuid.uuid4()
+    args = [
+        1052345678901234567,
+        -42,
+        True,
+        Color.GREEN,
+        "héllo",
+        poll,
+        0.5,
+        None,
+        "raw",
+    ]
+
+    packed = codec.encode(*args)
+    assert "\n" not in packed
+    assert codec.decode(packed) == args
+
+    # Trailing arguments may be omitted
+    assert codec.decode(codec.encode(1, 2)) == [1, 2]
+
+
+def test_codec_is_compact():
+    def handler(ctx, guild_id: int, user_id: int, poll: uuid.UUID):
+        pass
+
+    codec = StateCodec(handler)
+    snowflake = 1052345678901234567
+    poll = uuid.uuid4()
+
+    packed = codec.encode(snowflake, snowflake, poll)
+    unpacked = "\n".join([str(snowflake), str(snowflake), str(poll)])
+    assert len(packed) < len(unpacked) * 0.7
+
+
+def test_codec_rejects_unknown_annotation():
+    def handler(ctx, value: dict):
+        pass
+
+    with pytest.raises(ValueError):
+        StateCodec(handler)
+
+
+def test_packed_handler(discord, client):
+    @discord.custom_handler(packed=True)
+    def handle_vote(ctx, user_id: int, color: Color, anonymous: bool = False):
+        return f"{user_id} voted {color.value} {'anonymously' if anonymous else ''}"
+
+    custom_id = discord.pack_custom_id(handle_vote, 1052345678901234567, Color.RED)
+    Button(custom_id=custom_id)
+
+    context = Context.from_data(
+        discord, data={"type": 3, "data": {"custom_id": custom_id}}
+    )
+    assert context.primary_id == handle_vote
+    assert context.create_handler_args(discord.custom_id_handlers[handle_vote]) == [
+        1052345678901234567,
+        Color.RED,
+    ]
+
+    assert (
+        client.run_handler(handle_vote, 1, Color.GREEN, True).content
+        == "1 voted green anonymously"
+    )
+
+    with pytest.raises(ValueError):
+        discord.pack_custom_id("unknown", 1)
+
+
+def test_generated_id_is_deterministic(discord):
+    def handle_click(ctx):
+        pass
+
+    custom_id = discord.add_custom_handler(handle_click)
+
+    assert len(custom_id) == 8
+    assert custom_id == handler_id(handle_click)
+    # Registering the same handler again is harmless
+    assert discord.add_custom_handler(handle_click) == custom_id
+
+
+def test_generated_id_collision(discord):
+    handlers = []
+    for i in range(2):
+
+        def handle_click(ctx):
+            pass
+
+        handlers.append(handle_click)
+
+    discord.add_custom_handler(handlers[0])
+    with pytest.raises(ValueError):
+        discord.add_custom_handler(handlers[1])
+
+    discord.add_custom_handler(handlers[1], "second")
+
+
+def test_pattern_routing(discord, client):
+    @discord.custom_handler("page:*")
+    def handle_page(ctx, user_id: int):
+        return f"{ctx.primary_id} for {user_id}"
+
+    @discord.custom_handler("page:admin:*")
+    def handle_admin_page(ctx):
+        return "admin"
+
+    @discord.custom_handler(re.compile(r"vote-(\d+)-(up|down)"))
+    def handle_vote(ctx):
+        return "vote"
+
+    @discord.custom_handler("page:exact")
+    def handle_exact(ctx):
+        return "exact"
+
+    assert client.run_handler("page:3", "42").content == "page:3 for 42"
+    assert client.run_handler("page:admin:1").content == "admin"
+    assert client.run_handler("page:exact").content == "exact"
+    assert client.run_handler("vote-12-up").content == "vote"
+
+    with pytest.raises(ValueError):
+        client.run_handler("vote-12-sideways")
+
+    # Conflicting registrations are caught up front
+    with pytest.raises(ValueError):
+        discord.add_custom_handler(handle_vote, "page:*")
+    with pytest.raises(ValueError):
+        discord.add_custom_handler(handle_page, re.compile(r"vote-(\d+)-(up|down)"))
+    with pytest.raises(ValueError):
+        discord.add_custom_handler(handle_page, "item:*", packed=True)
+
+
+def test_router_regex_order():
+    router = CustomIDRouter()
+    router.add(re.compile(r"(?P<kind>a)\w+"), "first")
+    router.add(re.compile(r"ab(c)"), "second")
+    router.add(re.compile(r"(?P<kind>x)y"), "third")
+
+    assert router.match("abc") == "first"
+    assert router.match("xy") == "third"
+    assert router.match("q") is None
+
+    router.add("*", "fallback")
+    assert router.match("q") == "fallback"
+
+
+def test_router_regex_backreferences():
+    router = CustomIDRouter()
+    router.add(re.compile(r"x(\d)"), "digit")
+    router.add(re.compile(r"(\w)\1"), "double")
+    router.add(re.compile(r"(?P<c>\w)-(?P=c)"), "named")
+    router.add(re.compile(r"\w\w"), "pair")
+
+    assert router.match("x1") == "digit"
+    assert router.match("aa") == "double"
+    assert router.match("b-b") == "named"
+    assert router.match("ab") == "pair"
+    assert router.match("b-c") is None
+
+    router.add(re.compile(r"(?i)a\+(b)"), "flags")
+    router.add(re.compile(r"q(q)"), "last")
+    assert router.match("A+B") == "flags"
+    assert router.match("aa") == "double"
+    assert router.match("qq") == "double"
@@ -0,0 +1,84 @@
+import pytest
+import requests
+from flask import Flask
+
+from flask_discord_interactions import DiscordInteractions, Context, Message, File
+from flask_discord_interactions.emulator import DiscordEmulator
+
+
+@pytest.fixture()
+def emulator():
+    with DiscordEmulator(bucket_limit=3, bucket_window=0.5) as emulator:
+        yield emulator
+
+
+@pytest.fixture()
+def app(emulator):
+    app = Flask(__name__)
+    app.config["DISCORD_BASE_URL"] = emulator.base_url
+    app.config["DISCORD_CLIENT_ID"] = "123"
+    app.config["DISCORD_CLIENT_SECRET"] = "secret"
+    return app
+
+
+def test_update_commands(app, emulator):
+    discord = DiscordInteractions(app)
+
+    @discord.command()
+    def ping(ctx):
+        return "Pong!"
+
+    discord.update_commands(guild_id="456")
+
+    assert list(emulator.commands["456"]) == ["ping"]
+    assert discord.discord_commands["ping"].id == emulator.commands["456"]["ping"]["id"]
+    assert [request[:2] for request in emulator.requests] == [
+        ("POST", "/api/v10/oauth2/token"),
+        ("PUT", "/api/v10/applications/123/guilds/456/commands"),
+    ]
+
+
+def test_followups(app, emulator):
+    discord = DiscordInteractions(app)
+    context = Context.from_data(discord, app, {"id": "1", "token": "abc"})
+
+    message_id = context.send(Message("Hello", file=File(b"data", "data.txt")))
+    context.edit("Edited", message_id)
+    context.edit("Original")
+
+    messages = emulator.messages["abc"]
+    assert messages[message_id]["content"] == "Edited"
+    assert messages[message_id]["attachments"][0]["filename"] == "data.txt"
+    assert messages["@original"]["content"] == "Original"
+
+    context.delete(message_id)
+    assert message_id not in emulator.messages["abc"]
+
+    with pytest.raises(requests.HTTPError):
+        context.edit("Missing", message_id)
+
+
+def test_rate_limits(app, emulator):
+    discord = DiscordInteractions(app)
+    context = Context.from_data(discord, app, {"id": "1", "token": "abc"})
+    url = context.followup_url()
+
+    responses = [requests.post(url, json={"content": "Hi"}) for _ in range(4)]
+    assert [r.status_code for r in responses] == [200, 200, 200, 429]
+    assert [r.headers["X-RateLimit-Remaining"] for r in responses] == [
+        "2",
+        "1",
+        "0",
+        "0",
+    ]
+    assert responses[3].json()["retry_after"] <= 0.5
+    assert len({r.headers["X-RateLimit-Bucket"] for r in responses}) == 1
+
+    # Other interaction tokens have their own buckets
+    other = requests.post(url.replace("abc", "def"), json={"content": "Hi"})
+    assert other.status_code == 200
+
+    emulator.global_limit = 0
+    response = requests.post(url.replace("abc", "ghi"), json={"content": "Hi"})
+    assert response.status_code == 429
+    assert response.json()["global"] is True
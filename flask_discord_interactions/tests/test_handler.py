@@ -1,4 +1,19 @@
-from flask_discord_interactions import Message, ActionRow, Button, ButtonStyles
+import asyncio
+
+import pytest
+from flask import Flask
+
+from flask_discord_interactions import (
+    DiscordInteractions,
+    InteractionType,
+    AsyncContext,
+    Message,
+    Modal,
+    ActionRow,
+    Button,
+    ButtonStyles,
+    TextInput,
+)
 
 
 def test_basic_handler(discord, client):
@@ -95,3 +110,35 @@ def test_stateful_handler(discord, client):
     client.run("click_counter")
     response = discord.custom_id_handlers[handle_click](None, 0)
     assert response.content == "1 clicks"
+
+
+def test_async_handler():
+    app = Flask(__name__)
+    app.config["DONT_VALIDATE_SIGNATURE"] = True
+    app.config["DONT_REGISTER_WITH_DISCORD"] = True
+    discord = DiscordInteractions(app)
+
+    @discord.custom_handler()
+    async def handler(ctx, count: int):
+        assert isinstance(ctx, AsyncContext)
+        await asyncio.sleep(0.01)
+        return Modal(
+            custom_id="modal",
+            title=f"Clicked {count + 1} times",
+            components=[ActionRow(components=[TextInput("name", "Name")])],
+        )
+
+    data = {
+        "type": InteractionType.MESSAGE_COMPONENT,
+        "id": 1,
+        "token": "",
+        "data": {"custom_id": f"{handler}\n1", "component_type": 2},
+    }
+
+    with app.app_context():
+        result = asyncio.run(discord.run_handler(data))
+        assert isinstance(result, Modal)
+        assert result.title == "Clicked 2 times"
+
+        with pytest.raises(ValueError):
+            asyncio.run(discord.run_handler(data, allow_modal=False))
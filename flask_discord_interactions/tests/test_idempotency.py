@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from flask import Flask
+
+from flask_discord_interactions import (
+    DiscordInteractions,
+    IdempotencyCache,
+    SQLiteStateStore,
+)
+from flask_discord_interactions.payloads import InteractionFactory
+
+
+def create_app(idempotency):
+    app = Flask(__name__)
+    app.config["DONT_VALIDATE_SIGNATURE"] = True
+    app.config["DONT_REGISTER_WITH_DISCORD"] = True
+    discord = DiscordInteractions(app, idempotency=idempotency)
+    app.calls = []
+    app.discord = discord
+
+    @discord.command()
+    def count(ctx):
+        app.calls.append(ctx.id)
+        return f"Call {len(app.calls)}"
+
+    @discord.command()
+    def fail(ctx):
+        app.calls.append(ctx.id)
+        raise ValueError("Oops")
+
+    @discord.command()
+    async def fail_async(ctx):
+        raise ValueError("Oops")
+
+    discord.set_route("/interactions")
+    return app
+
+
+def post(app, payload):
+    with app.test_client() as client:
+        return client.post("/interactions", json=payload)
+
+
+def test_duplicate_returns_cached_response():
+    app = create_app(IdempotencyCache())
+    payload = InteractionFactory().slash_command("count")
+
+    first = post(app, payload)
+    second = post(app, payload)
+
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert second.get_json()["data"]["content"] == "Call 1"
+    assert app.calls == [payload["id"]]
+
+    other = post(app, dict(payload, id="1"))
+    assert other.get_json()["data"]["content"] == "Call 2"
+
+
+def test_duplicate_while_pending():
+    idempotency = IdempotencyCache()
+    app = create_app(idempotency)
+    payload = InteractionFactory().slash_command("count")
+
+    assert idempotency.claim(payload["id"])
+    assert post(app, payload).status_code == 409
+    assert app.calls == []
+
+
+def test_failed_interaction_not_cached():
+    idempotency = IdempotencyCache()
+    app = create_app(idempotency)
+    payload = InteractionFactory().slash_command("fail")
+
+    assert post(app, payload).status_code == 500
+    assert post(app, payload).status_code == 500
+    assert app.calls == [payload["id"], payload["id"]]
+    assert idempotency.get(payload["id"]) is None
+
+
+def test_failed_async_interaction_released():
+    idempotency = IdempotencyCache()
+    app = create_app(idempotency)
+    payload = InteractionFactory().slash_command("fail_async")
+
+    with app.test_request_context("/interactions", method="POST", json=payload):
+        result = app.discord.handle_request()
+        with pytest.raises(ValueError):
+            asyncio.run(result)
+
+    assert idempotency.claim(payload["id"])
+
+
+def test_shared_store(tmp_path):
+    path = str(tmp_path / "seen.db")
+    first = create_app(IdempotencyCache(SQLiteStateStore(path)))
+    second = create_app(IdempotencyCache(SQLiteStateStore(path)))
+    payload = InteractionFactory().slash_command("count")
+
+    assert post(first, payload).get_json()["data"]["content"] == "Call 1"
+    assert post(second, payload).get_json()["data"]["content"] == "Call 1"
+    assert second.calls == []
+
+
+def test_ping_not_deduplicated():
+    app = create_app(IdempotencyCache())
+    payload = InteractionFactory().ping()
+
+    assert post(app, payload).get_json() == {"type": 1}
+    assert post(app, payload).get_json() == {"type": 1}
@@ -0,0 +1,107 @@
+import sys
+import subprocess
+
+import pytest
+from flask import Flask
+
+from flask_discord_interactions import DiscordInteractions, Journal
+from flask_discord_interactions.journal import read_journal, replay
+from flask_discord_interactions.payloads import InteractionFactory, Signer
+
+
+@pytest.fixture()
+def signer():
+    return Signer()
+
+
+def create_app(signer, journal=None):
+    app = Flask(__name__)
+    app.config["DISCORD_PUBLIC_KEY"] = signer.public_key
+    app.config["DONT_REGISTER_WITH_DISCORD"] = True
+    discord = DiscordInteractions(app, journal=journal)
+
+    @discord.command()
+    def ping(ctx, pong: str = "pong"):
+        return f"Ping {pong}"
+
+    discord.set_route("/interactions")
+    return app
+
+
+def test_record(signer, tmp_path):
+    journal = Journal(
+        str(tmp_path / "journal-{pid}.jsonl"), redact=["token", "member.user.username"]
+    )
+    app = create_app(signer, journal)
+    factory = InteractionFactory()
+
+    payload = factory.slash_command("ping", pong="ball")
+    body, headers = signer.sign(payload)
+    with app.test_client() as client:
+        response = client.post("/interactions", data=body, headers=headers)
+    journal.close()
+
+    [entry] = read_journal(journal.path)
+    assert entry["command"] == "ping"
+    assert entry["type"] == "application_command"
+    assert entry["signed"] == headers["X-Signature-Timestamp"]
+    assert entry["size"] == len(response.data)
+    assert entry["ms"] >= sum(entry["phases"].values())
+    assert "verify" in entry["phases"]
+
+    assert entry["payload"]["token"] == "REDACTED"
+    assert entry["payload"]["member"]["user"]["username"] == "REDACTED"
+    assert entry["payload"]["member"]["user"]["id"] == payload["member"]["user"]["id"]
+    assert entry["payload"]["data"] == payload["data"]
+    # The payload handled by the bot isn't modified
+    assert payload["token"] != "REDACTED"
+
+
+def test_rotate(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = Journal(path, max_bytes=1000, backups=2)
+    factory = InteractionFactory()
+
+    for _ in range(30):
+        journal.record(factory.ping())
+    journal.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "journal.jsonl",
+        "journal.jsonl.1",
+        "journal.jsonl.2",
+    ]
+    for p in tmp_path.iterdir():
+        assert p.stat().st_size <= 1000
+    assert len(list(read_journal(path + ".2", path + ".1", path))) < 30
+
+
+def test_replay(signer, tmp_path):
+    journal = Journal(str(tmp_path / "journal.jsonl"))
+    factory = InteractionFactory()
+    journal.record(factory.slash_command("ping", pong="ball"))
+    journal.record(factory.slash_command("ping"))
+    journal.record(factory.slash_command("missing"))
+    journal.close()
+
+    app = create_app(signer)
+    results = replay(app, journal.path, signer=signer)
+    assert results["ping"].summary()["requests"] == 2
+    assert results["ping"].errors == 0
+    assert results["missing"].errors == 1
+
+    app = create_app(signer)
+    app.config["DONT_VALIDATE_SIGNATURE"] = True
+    results = replay(app, journal.path)
+    assert results["ping"].errors == 0
+
+
+def test_core_does_not_import_loadtest():
+    code = (
+        "import sys, flask_discord_interactions; "
+        "print('flask_discord_interactions.loadtest' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
@@ -0,0 +1,110 @@
+import json
+import threading
+
+import pytest
+from flask import Flask
+from werkzeug.serving import make_server
+
+from flask_discord_interactions import DiscordInteractions
+from flask_discord_interactions.loadtest import main, parse_command, run
+from flask_discord_interactions.payloads import InteractionFactory, Signer
+
+
+@pytest.fixture()
+def signer():
+    return Signer()
+
+
+@pytest.fixture()
+def url(signer):
+    app = Flask(__name__)
+    app.config["DISCORD_PUBLIC_KEY"] = signer.public_key
+    app.config["DONT_REGISTER_WITH_DISCORD"] = True
+    discord = DiscordInteractions(app)
+
+    @discord.command()
+    def ping(ctx):
+        return "Pong!"
+
+    @discord.command()
+    def fail(ctx):
+        raise ValueError("Oops")
+
+    discord.set_route("/interactions")
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.port}/interactions"
+    server.shutdown()
+    thread.join()
+
+
+def test_parse_command():
+    label, payload = parse_command(
+        "admin roles assign days=3 reason=spam ok=true", InteractionFactory()
+    )
+
+    assert label == "admin roles assign"
+    assert payload["data"]["name"] == "admin"
+    options = payload["data"]["options"][0]["options"][0]["options"]
+    assert {option["name"]: option["value"] for option in options} == {
+        "days": 3,
+        "reason": "spam",
+        "ok": True,
+    }
+
+
+def test_run(url, signer):
+    factory = InteractionFactory()
+    payloads = [
+        ("ping", factory.slash_command("ping")),
+        ("fail", factory.slash_command("fail")),
+    ]
+
+    results = run(url, payloads, signer=signer, concurrency=3, requests_count=10)
+
+    ping = results["ping"].summary()
+    assert ping["requests"] == 5
+    assert ping["errors"] == 0
+    assert ping["sla_misses"] == 0
+    assert ping["p50_ms"] <= ping["p99_ms"] <= ping["max_ms"]
+
+    fail = results["fail"].summary()
+    assert fail["error_rate"] == 1.0
+    assert fail["sla_misses"] == 5
+
+
+def test_run_wrong_key(url):
+    payloads = [("ping", InteractionFactory().slash_command("ping"))]
+
+    results = run(url, payloads, signer=Signer(), concurrency=1, requests_count=2)
+
+    assert results["ping"].errors == 2
+
+
+def test_main(url, signer, tmp_path, capsys):
+    replay = tmp_path / "payloads.jsonl"
+    replay.write_text(json.dumps(InteractionFactory().slash_command("ping")) + "\n")
+    output = tmp_path / "results.json"
+
+    main(
+        [
+            url,
+            "--command",
+            "ping",
+            "--payloads",
+            str(replay),
+            "--private-key",
+            signer.private_key,
+            "--requests",
+            "4",
+            "--rate",
+            "100",
+            "--json",
+            str(output),
+        ]
+    )
+
+    assert "ping" in capsys.readouterr().out
+    assert json.loads(output.read_text())["ping"]["requests"] == 4
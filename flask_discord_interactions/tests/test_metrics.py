@@ -0,0 +1,144 @@
+import time
+import socket
+
+import pytest
+
+from flask_discord_interactions import (
+    DiscordInteractions,
+    Message,
+    InMemoryMetrics,
+    StatsDMetrics,
+)
+from flask_discord_interactions.metrics import phase, current_timings
+from flask_discord_interactions.payloads import InteractionFactory
+
+factory = InteractionFactory()
+
+
+def test_phase_timings(app):
+    metrics = InMemoryMetrics()
+    discord = DiscordInteractions(app, metrics=metrics)
+
+    @discord.command()
+    def ping(ctx):
+        with phase("database"):
+            pass
+        return "Pong!"
+
+    @discord.custom_handler()
+    def handle_click(ctx):
+        return Message(update=True, content="Clicked")
+
+    discord.set_route("/interactions")
+
+    with app.test_client() as client:
+        client.post("/interactions", json=factory.slash_command("ping"))
+        client.post("/interactions", json=factory.component(handle_click))
+
+    for name in ["parse", "context", "command", "database", "encode"]:
+        assert (
+            metrics.histogram("phase_seconds", phase=name, command="ping")["count"] == 1
+        )
+
+    assert (
+        metrics.histogram(
+            "request_seconds", command="handle_click", type="message_component"
+        )["count"]
+        == 1
+    )
+    assert metrics.histogram("request_seconds")["count"] == 2
+
+    # Timings are only collected while an interaction is being handled
+    assert current_timings() is None
+
+    text = metrics.render_prometheus()
+    assert "# TYPE discord_interactions_request_seconds histogram" in text
+    assert (
+        'discord_interactions_request_seconds_count{command="ping",'
+        'type="application_command"} 1'
+    ) in text
+
+
+def test_metrics_disabled(app, discord):
+
+    @discord.command()
+    def ping(ctx):
+        assert current_timings() is None
+        with phase("database"):
+            pass
+        return "Pong!"
+
+    discord.set_route("/interactions")
+
+    with app.test_client() as client:
+        response = client.post("/interactions", json=factory.slash_command("ping"))
+    assert response.get_json()["data"]["content"] == "Pong!"
+
+    with pytest.raises(ValueError):
+        discord.set_metrics_route("/metrics")
+
+
+def test_metrics_route(app):
+    discord = DiscordInteractions(app, metrics=InMemoryMetrics())
+
+    @discord.command()
+    def ping(ctx):
+        return "Pong!"
+
+    discord.set_route("/interactions")
+    discord.set_metrics_route("/metrics")
+
+    with app.test_client() as client:
+        client.post("/interactions", json=factory.slash_command("ping"))
+        response = client.get("/metrics")
+
+    assert response.mimetype == "text/plain"
+    assert b'phase="command"' in response.data
+
+
+def test_histogram_buckets():
+    metrics = InMemoryMetrics(buckets=[0.1, 1])
+    for value in [0.05, 0.1, 0.5, 5]:
+        metrics.observe("followup_seconds", value, {"method": "send"})
+
+    histogram = metrics.histogram("followup_seconds")
+    assert histogram["count"] == 4
+    assert histogram["sum"] == pytest.approx(5.65)
+    assert histogram["buckets"] == {0.1: 2, 1: 3}
+
+
+def test_statsd():
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(1)
+
+    metrics = StatsDMetrics(port=server.getsockname()[1])
+    metrics.observe("request_seconds", 0.25, {"command": "ping"})
+
+    packet = server.recv(1024)
+    server.close()
+    assert packet == b"discord_interactions.request_seconds:250.000|ms|#command:ping"
+
+
+def test_server_timing(app, discord):
+    app.config["DISCORD_SERVER_TIMING"] = True
+
+    @discord.command()
+    def ping(ctx):
+        return "Pong!"
+
+    discord.set_route("/interactions")
+
+    with app.test_client() as client:
+        response = client.post(
+            "/interactions",
+            json=factory.slash_command("ping"),
+            headers={"X-Signature-Timestamp": str(int(time.time()))},
+        )
+
+    entries = dict(
+        entry.split(";dur=") for entry in response.headers["Server-Timing"].split(", ")
+    )
+    assert list(entries)[:3] == ["parse", "context", "command"]
+    assert {"encode", "total", "age", "signature_age"} <= entries.keys()
+    assert float(entries["signature_age"]) < 2000
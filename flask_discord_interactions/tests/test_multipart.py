@@ -0,0 +1,131 @@
+import io
+import json
+import mmap
+import asyncio
+import email.parser
+import email.policy
+
+import pytest
+
+from flask_discord_interactions import Message, MultipartBody, File
+
+
+def parse(body: bytes, content_type: str):
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    return {
+        part.get_param("name", header="content-disposition"): part
+        for part in message.iter_parts()
+    }
+
+
+def test_multipart_message():
+    message = Message(
+        content="files!",
+        files=[
+            ("a.txt", io.BytesIO(b"hello")),
+            ("b.png", b"\x89PNG", "image/png"),
+        ],
+    )
+
+    body, content_type = message.encode(followup=True)
+    parts = parse(body, content_type)
+
+    assert json.loads(parts["payload_json"].get_content())["content"] == "files!"
+    assert parts["files[0]"].get_filename() == "a.txt"
+    assert parts["files[0]"].get_content_type() == "text/plain"
+    assert parts["files[0]"].get_payload(decode=True) == b"hello"
+    assert parts["files[1]"].get_content_type() == "image/png"
+    assert parts["files[1]"].get_payload(decode=True) == b"\x89PNG"
+
+
+def test_multipart_streaming(tmp_path):
+    path = tmp_path / "big.bin"
+    path.write_bytes(bytes(range(256)) * 1000)
+
+    progress = []
+    with open(path, "rb") as f:
+        body = MultipartBody(
+            [("files[0]", ("big.bin", f))],
+            chunk_size=4096,
+            progress=lambda sent, total: progress.append((sent, total)),
+        )
+        chunks = list(body)
+
+    assert max(len(chunk) for chunk in chunks) <= 4096 + 200
+    assert sum(len(chunk) for chunk in chunks) == body.len
+    assert progress[-1] == (body.len, body.len)
+
+    parts = parse(b"".join(chunks), body.content_type)
+    assert parts["files[0]"].get_payload(decode=True) == path.read_bytes()
+
+
+def test_multipart_unknown_length():
+    body = MultipartBody([("files[0]", ("x.txt", iter([b"a", b"b", b"c"])))])
+    assert body.len is None
+
+    async def collect():
+        return b"".join([chunk async for chunk in body])
+
+    parts = parse(asyncio.run(collect()), body.content_type)
+    assert parts["files[0]"].get_payload(decode=True) == b"abc"
+
+
+def test_file_sources(tmp_path):
+    path = tmp_path / "banner.png"
+    path.write_bytes(b"\x89PNG" * 1000)
+
+    data = bytearray(b"generated")
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    message = Message(
+        files=[
+            File(path),
+            File(data, "chart.txt"),
+            File(memoryview(data)[3:], "slice.txt"),
+            File(mapped, "mapped.png"),
+        ]
+    )
+
+    body, content_type = message.encode(followup=True, stream=True)
+    chunks = list(body)
+    assert all(isinstance(chunk, (bytes, memoryview)) for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == body.len
+
+    parts = parse(b"".join(chunks), content_type)
+    assert parts["files[0]"].get_filename() == "banner.png"
+    assert parts["files[0]"].get_content_type() == "image/png"
+    assert parts["files[0]"].get_payload(decode=True) == path.read_bytes()
+    assert parts["files[1]"].get_payload(decode=True) == b"generated"
+    assert parts["files[2]"].get_payload(decode=True) == b"erated"
+    assert parts["files[3]"].get_payload(decode=True) == path.read_bytes()
+
+    with pytest.raises(ValueError):
+        File(b"no name")
+
+
+def test_part_header_is_cached():
+    first = MultipartBody([("files[0]", File(b"a", "a.txt"))])
+    second = MultipartBody([("files[0]", File(b"b", "a.txt"))])
+    assert first.parts[0].header is second.parts[0].header
+
+
+def test_part_header_escapes_names():
+    body = MultipartBody(
+        [
+            ("files[0]", File(b"quoted", 'a "q".png')),
+            ("files[1]", File(b"injected", "a.png\r\nX-Injected: 1")),
+        ]
+    )
+    content = body.to_bytes()
+    assert b"X-Injected" not in content.split(b"\r\n")
+
+    parts = parse(content, body.content_type)
+    assert parts["files[0]"].get_filename() == "a %22q%22.png"
+    assert parts["files[0]"].get_payload(decode=True) == b"quoted"
+    assert parts["files[1]"].get_filename() == "a.png%0D%0AX-Injected: 1"
+
+    with pytest.raises(ValueError):
+        MultipartBody([("files[0]", File(b"a", "a.txt", content_type="a\r\nb: c"))])
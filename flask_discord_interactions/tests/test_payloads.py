@@ -0,0 +1,141 @@
+import time
+
+import pytest
+from flask import Flask
+
+from flask_discord_interactions import (
+    DiscordInteractions,
+    InMemoryMetrics,
+    Member,
+    Role,
+    Channel,
+    Autocomplete,
+)
+from flask_discord_interactions.payloads import InteractionFactory, Signer
+
+
+@pytest.fixture()
+def signer():
+    return Signer()
+
+
+@pytest.fixture()
+def app(signer):
+    app = Flask(__name__)
+    app.config["DISCORD_PUBLIC_KEY"] = signer.public_key
+    app.config["DONT_REGISTER_WITH_DISCORD"] = True
+    return app
+
+
+def test_signed_payloads(app, signer):
+    discord = DiscordInteractions(app)
+    factory = InteractionFactory(seed=1)
+
+    group = discord.command_group("admin")
+
+    @group.command()
+    def assign(ctx, user: Member, role: Role, channel: Channel, days: int, ok: bool):
+        return f"{user.username} {role.name} {channel.name} {days} {ok}"
+
+    @discord.command(type=3)
+    def quote(ctx, message):
+        return message.content
+
+    @discord.custom_handler("menu")
+    def menu(ctx):
+        return ctx.values[0]
+
+    @discord.custom_handler("form")
+    def form(ctx):
+        return ctx.get_component("text").value
+
+    @discord.command()
+    def fruit(ctx, name: Autocomplete(str)):
+        return name
+
+    @fruit.autocomplete()
+    def fruit_autocomplete(ctx, name=None):
+        return [name.value + "ple"]
+
+    discord.set_route("/interactions")
+
+    def post(payload):
+        body, headers = signer.sign(payload)
+        with app.test_client() as client:
+            response = client.post("/interactions", data=body, headers=headers)
+        assert response.status_code == 200
+        return response.get_json()["data"]
+
+    user, role, channel = factory.user("alice"), factory.role("mod"), factory.channel()
+    assert (
+        post(
+            factory.slash_command(
+                "admin",
+                "assign",
+                user=user,
+                role=role,
+                channel=channel,
+                days=3,
+                ok=True,
+            )
+        )["content"]
+        == f"alice mod {channel.data['name']} 3 True"
+    )
+
+    message = factory.message("Quotable")
+    assert post(factory.message_command("quote", message))["content"] == "Quotable"
+    assert post(factory.component("menu", values=["b"]))["content"] == "b"
+    assert post(factory.modal_submit("form", text="Hi"))["content"] == "Hi"
+    assert post(factory.autocomplete("fruit", focused="name", name="ap")) == {
+        "choices": [{"name": "apple", "value": "apple"}]
+    }
+
+    with app.test_client() as client:
+        body, headers = signer.sign(factory.ping())
+        assert client.post("/interactions", data=body, headers=headers).json == {
+            "type": 1
+        }
+
+        # Tampering with the body invalidates the signature
+        response = client.post("/interactions", data=body + b" ", headers=headers)
+        assert response.status_code == 401
+
+
+def test_stale_interactions(app, signer):
+    metrics = InMemoryMetrics()
+    discord = DiscordInteractions(app, metrics=metrics)
+    factory = InteractionFactory()
+
+    @discord.command()
+    def ping(ctx):
+        return "Pong!"
+
+    discord.set_route("/interactions")
+
+    def post(timestamp):
+        body, headers = signer.sign(factory.slash_command("ping"), timestamp)
+        with app.test_client() as client:
+            return client.post("/interactions", data=body, headers=headers)
+
+    # Disabled by default
+    assert post(int(time.time()) - 60).status_code == 200
+
+    app.config["DISCORD_MAX_INTERACTION_AGE"] = 5
+    assert post(int(time.time()) - 1).status_code == 200
+    assert post(int(time.time()) - 60).status_code == 401
+    assert post(int(time.time()) + 60).status_code == 401
+
+    stale = metrics.histogram("stale_interaction_seconds")
+    assert stale["count"] == 2
+    assert stale["sum"] >= 118
+
+
+def test_signer_key():
+    signer = Signer()
+    assert Signer(signer.private_key).public_key == signer.public_key
+
+
+def test_unique_ids():
+    factory = InteractionFactory()
+    ids = {factory.slash_command("ping")["id"] for _ in range(100)}
+    assert len(ids) == 100
@@ -0,0 +1,81 @@
+import os
+import json
+import time
+
+import pytest
+
+from flask_discord_interactions import DiscordInteractions, Profiler
+from flask_discord_interactions.payloads import InteractionFactory
+
+factory = InteractionFactory()
+
+
+def slow_function():
+    time.sleep(0.1)
+
+
+def profiles(directory):
+    return sorted(
+        name[: -len(".json")]
+        for name in os.listdir(directory)
+        if name.endswith(".json")
+    )
+
+
+def test_slow_interactions(app, tmp_path):
+    profiler = Profiler(tmp_path, threshold=0.05, interval=0.001)
+    discord = DiscordInteractions(app, profiler=profiler)
+
+    @discord.command()
+    def slow(ctx):
+        slow_function()
+        return "Done"
+
+    @discord.command()
+    def fast(ctx):
+        return "Done"
+
+    discord.set_route("/interactions")
+
+    with app.test_client() as client:
+        client.post("/interactions", json=factory.slash_command("fast"))
+        client.post("/interactions", json=factory.slash_command("slow"))
+
+    [name] = profiles(tmp_path)
+    assert name.endswith("-slow")
+
+    with open(tmp_path / f"{name}.json") as f:
+        meta = json.load(f)
+    assert meta["command"] == "slow"
+    assert meta["type"] == "application_command"
+    assert meta["reason"] == "slow"
+    assert meta["phases"]["command"] >= 0.1
+    assert meta["samples"] > 0
+
+    with open(tmp_path / f"{name}.folded") as f:
+        stacks = f.read()
+    assert "slow_function (test_profiling.py" in stacks
+
+
+def test_sample_every(app, tmp_path):
+    profiler = Profiler(tmp_path, sample_every=2, max_files=2)
+    discord = DiscordInteractions(app, profiler=profiler)
+
+    @discord.command()
+    def ping(ctx):
+        return "Pong!"
+
+    discord.set_route("/interactions")
+
+    with app.test_client() as client:
+        for _ in range(7):
+            client.post("/interactions", json=factory.slash_command("ping"))
+
+    # Three were sampled, but only the newest two are kept
+    assert len(profiles(tmp_path)) == 2
+    assert len(os.listdir(tmp_path)) == 4
+
+
+def test_profiler_requires_trigger(tmp_path):
+    with pytest.raises(ValueError):
+        Profiler(tmp_path)
@@ -2,7 +2,15 @@ import json
 
 import pytest
 
-from flask_discord_interactions import Message, ResponseType, Embed, embed
+from flask_discord_interactions import (
+    Message,
+    MessageTemplate,
+    ResponseType,
+    Embed,
+    embed,
+    ActionRow,
+    Button,
+)
 
 
 def test_content(discord, client):
@@ -96,3 +104,79 @@ def test_dump_followup():
     result, mimetype = resp.encode(followup=True)
     assert json.loads(result) == expected
     assert mimetype == "application/json"
+
+
+def test_message_template(discord, client):
+    template = MessageTemplate(
+        Message(
+            content="Hi {name}! {{braces}}",
+            embed=Embed(title="Welcome, {name}", description="Member #{count:,}"),
+            components=[
+                ActionRow(components=[Button(label="Hi", custom_id=["hi", "{name}"])])
+            ],
+        ),
+        ["name", "count"],
+    )
+    assert template.slots == {"name", "count"}
+
+    name = 'Ann "the" }{ 👋'
+
+    @discord.command()
+    def templated(ctx):
+        return template.render(name=name, count=12345)
+
+    expected = Message(
+        content=f"Hi {name}! {{braces}}",
+        embed=Embed(title=f"Welcome, {name}", description="Member #12,345"),
+        components=[ActionRow(components=[Button(label="Hi", custom_id=["hi", name])])],
+    )
+
+    result, mimetype = client.run("templated").encode()
+    assert json.loads(result) == expected.dump()
+    assert mimetype == "application/json"
+
+    followup, _ = template.render(name="Bo", count=1).encode(followup=True)
+    assert json.loads(followup)["embeds"] == [
+        {"title": "Welcome, Bo", "description": "Member #1"}
+    ]
+
+    with pytest.raises(ValueError):
+        template.render(name="Bo")
+
+    with pytest.raises(ValueError):
+        MessageTemplate(Message("{name} and {other}"), ["name"])
+
+
+def test_message_template_packed_custom_id(discord, client):
+    @discord.custom_handler(packed=True)
+    def handle_vote(ctx, user_id: int, choice: str):
+        return f"{user_id} voted {choice}"
+
+    # Packed custom IDs are base85, which may contain braces
+    custom_ids = [
+        discord.pack_custom_id(handle_vote, user_id, "red")
+        for user_id in range(1052345678901234567, 1052345678901234867)
+    ]
+    assert any("{" in custom_id for custom_id in custom_ids)
+
+    for custom_id in custom_ids:
+        template = MessageTemplate(
+            Message(
+                content="Vote, {name}!",
+                components=[
+                    ActionRow(
+                        components=[
+                            Button(label="Red", custom_id=custom_id),
+                            Button(label="Link", style=5, url="https://a.b/{x}"),
+                        ]
+                    )
+                ],
+            ),
+            ["name"],
+        )
+
+        result = json.loads(template.render(name="Ann").encode()[0])
+        buttons = result["data"]["components"][0]["components"]
+        assert result["data"]["content"] == "Vote, Ann!"
+        assert buttons[0]["custom_id"] == custom_id
+        assert buttons[1]["url"] == "https://a.b/{x}"
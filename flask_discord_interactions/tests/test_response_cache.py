@@ -0,0 +1,116 @@
+import asyncio
+
+from flask_discord_interactions import Message, ResponseCache
+from flask_discord_interactions.payloads import InteractionFactory
+
+factory = InteractionFactory()
+
+
+def test_response_cache(app, discord):
+    calls = 0
+
+    @discord.command(cache=True)
+    def info(ctx, topic: str):
+        nonlocal calls
+        calls += 1
+        return f"All about {topic} ({ctx.locale})"
+
+    discord.set_route("/interactions")
+
+    def run(topic, locale="en-US"):
+        payload = InteractionFactory(locale=locale).slash_command("info", topic=topic)
+        with app.test_client() as client:
+            response = client.post("/interactions", json=payload)
+        return response.get_json()["data"]["content"]
+
+    assert run(topic="cats") == "All about cats (en-US)"
+    assert run(topic="cats") == "All about cats (en-US)"
+    assert calls == 1
+
+    assert run(topic="dogs") == "All about dogs (en-US)"
+    assert run(topic="cats", locale="de") == "All about cats (de)"
+    assert calls == 3
+
+    assert isinstance(info.cache, ResponseCache)
+    assert info.cache.hits == 1
+
+
+def test_response_cache_skips_deferred(app, discord):
+    calls = 0
+
+    @discord.command(cache=ResponseCache(ttl=60))
+    def slow(ctx):
+        nonlocal calls
+        calls += 1
+        return Message(deferred=True)
+
+    with app.app_context():
+        discord.run_command(factory.slash_command("slow"))
+        discord.run_command(factory.slash_command("slow"))
+
+    assert calls == 2
+    assert len(slow.cache) == 0
+
+
+def test_async_response_cache(app, discord):
+    calls = 0
+
+    @discord.command(cache=True)
+    async def hello(ctx):
+        nonlocal calls
+        calls += 1
+        return "Hello!"
+
+    async def run():
+        with app.app_context():
+            result = discord.run_command(factory.slash_command("hello"))
+            if asyncio.iscoroutine(result):
+                result = await result
+            return result.encode()
+
+    first = asyncio.run(run())
+    assert asyncio.run(run()) == first
+    assert calls == 1
+
+
+def test_command_group_without_cache(app, discord):
+    group = discord.command_group("group")
+
+    @group.command()
+    def sub(ctx):
+        return "sub"
+
+    discord.set_route("/interactions")
+
+    with app.test_client() as client:
+        response = client.post(
+            "/interactions", json=factory.slash_command("group", "sub")
+        )
+
+    assert response.get_json()["data"]["content"] == "sub"
+
+
+def test_shared_response_cache(app, discord):
+    cache = ResponseCache(ttl=600)
+
+    @discord.command(cache=cache)
+    def help(ctx):
+        return "Help"
+
+    @discord.command(cache=cache)
+    def about(ctx):
+        return "About"
+
+    discord.set_route("/interactions")
+
+    def run(name):
+        with app.test_client() as client:
+            response = client.post("/interactions", json=factory.slash_command(name))
+        return response.get_json()["data"]["content"]
+
+    assert run("help") == "Help"
+    assert run("about") == "About"
+    assert run("help") == "Help"
+
+    assert len(cache) == 2
+    assert cache.hits == 1
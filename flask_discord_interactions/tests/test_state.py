@@ -0,0 +1,110 @@
+import time
+
+import pytest
+
+from flask_discord_interactions import (
+    State,
+    MemoryStateStore,
+    SQLiteStateStore,
+    RedisStateStore,
+    Message,
+    ActionRow,
+    Button,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and expires <= time.time():
+            return None
+        return value
+
+    def set(self, key, value, px=None, nx=False):
+        if nx and self.get(key) is not None:
+            return None
+        self.data[key] = (value, None if px is None else time.time() + px / 1000)
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStateStore()
+    elif request.param == "sqlite":
+        return SQLiteStateStore(str(tmp_path / "state.db"))
+    else:
+        return RedisStateStore(FakeRedis())
+
+
+def test_state_store(store):
+    key = store.put({"pages": [1, 2, 3]})
+    assert len(key) <= 16
+    assert store.get(key) == {"pages": [1, 2, 3]}
+
+    store.set(key, "replaced")
+    assert store.get(key) == "replaced"
+
+    store.delete(key)
+    assert store.get(key) is None
+    assert store.get("unknown", "default") == "default"
+
+
+def test_state_store_expiry(store):
+    key = store.put("short-lived", ttl=0.05)
+    assert store.get(key) == "short-lived"
+
+    time.sleep(0.1)
+    assert store.get(key) is None
+
+
+def test_state_store_add(store):
+    assert store.add("key", "first")
+    assert not store.add("key", "second")
+    assert store.get("key") == "first"
+
+    assert store.add("short-lived", "first", ttl=0.05)
+    time.sleep(0.1)
+    assert store.add("short-lived", "second")
+    assert store.get("short-lived") == "second"
+
+
+def test_memory_state_store_bounded():
+    store = MemoryStateStore(maxsize=2)
+    keys = [store.put(i) for i in range(3)]
+
+    assert store.get(keys[0]) is None
+    assert store.get(keys[2]) == 2
+
+
+def test_state_handler(discord, client):
+    @discord.custom_handler()
+    def handle_page(ctx, pages: State, pageno: int):
+        if pages is None:
+            return "Expired"
+        return pages[pageno]
+
+    @discord.command()
+    def paginate(ctx):
+        key = ctx.state.put(["first", "second"])
+        return Message(
+            "Pages",
+            components=[
+                ActionRow(
+                    components=[Button(custom_id=[handle_page, key, 1], label="2")]
+                )
+            ],
+        )
+
+    with client.context(discord=discord):
+        custom_id = client.run("paginate").components[0].components[0].custom_id
+
+    _, key, pageno = custom_id.split("\n")
+    assert client.run_handler(handle_page, key, pageno).content == "second"
+    assert client.run_handler(handle_page, "expired", pageno).content == "Expired"
@@ -0,0 +1,230 @@
+import asyncio
+import contextlib
+import contextvars
+
+import pytest
+
+from flask_discord_interactions import (
+    DiscordInteractions,
+    InteractionType,
+    Autocomplete,
+    set_tracer,
+)
+from flask_discord_interactions.tracing import span
+
+
+class RecordingTracer:
+    "Records spans, tracking the current span in a context variable like OTel."
+
+    def __init__(self):
+        self.spans = []
+        self.ended = []
+        self.current = contextvars.ContextVar("current", default=None)
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        record = {"name": name, "attributes": attributes, "parent": self.current.get()}
+        self.spans.append(record)
+        token = self.current.set(name)
+        try:
+            yield record
+        finally:
+            self.current.reset(token)
+            self.ended.append(name)
+
+    def find(self, name):
+        return [record for record in self.spans if record["name"] == name]
+
+
+@pytest.fixture()
+def tracer():
+    tracer = RecordingTracer()
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(None)
+
+
+def test_command_spans(app, tracer):
+    discord = DiscordInteractions(app)
+
+    group = discord.command_group("math")
+
+    @group.command()
+    def add(ctx, a: int, b: int):
+        with span("calculate", interaction_id=ctx.id):
+            return str(a + b)
+
+    discord.set_route("/interactions")
+
+    with app.test_client() as client:
+        response = client.post(
+            "/interactions",
+            json={
+                "type": InteractionType.APPLICATION_COMMAND,
+                "id": "123",
+                "token": "",
+                "data": {
+                    "id": 1,
+                    "name": "math",
+                    "options": [
+                        {
+                            "type": 1,
+                            "name": "add",
+                            "options": [
+                                {"type": 4, "name": "a", "value": 1},
+                                {"type": 4, "name": "b", "value": 2},
+                            ],
+                        }
+                    ],
+                },
+            },
+        )
+
+    assert response.get_json()["data"]["content"] == "3"
+
+    assert [record["name"] for record in tracer.spans] == [
+        "discord.context",
+        "discord.command_group",
+        "discord.command",
+        "calculate",
+    ]
+    assert tracer.find("discord.command")[0]["parent"] == "discord.command_group"
+    assert tracer.find("calculate")[0]["parent"] == "discord.command"
+
+    for record in tracer.spans:
+        assert record["attributes"]["discord.interaction.id"] == "123"
+
+
+def test_async_spans(app, tracer):
+    discord = DiscordInteractions(app)
+
+    @discord.command()
+    async def ping(ctx):
+        await asyncio.sleep(0)
+        with span("inner"):
+            pass
+        return "Pong!"
+
+    async def run():
+        with app.app_context():
+            await discord.run_command(
+                {
+                    "type": InteractionType.APPLICATION_COMMAND,
+                    "id": "1",
+                    "data": {"id": 1, "name": "ping"},
+                }
+            )
+
+    asyncio.run(run())
+
+    # The span covers the coroutine, not only its creation
+    assert tracer.find("inner")[0]["parent"] == "discord.command"
+    assert "discord.interaction.id" not in tracer.find("inner")[0]["attributes"]
+
+
+def test_async_subcommand_spans(app, tracer):
+    discord = DiscordInteractions(app)
+    group = discord.command_group("math")
+
+    @group.command()
+    async def add(ctx, a: int, b: int):
+        await asyncio.sleep(0)
+        with span("calculate"):
+            return str(a + b)
+
+    async def run():
+        with app.app_context():
+            result = discord.run_command(
+                {
+                    "type": InteractionType.APPLICATION_COMMAND,
+                    "id": "7",
+                    "data": {
+                        "id": 1,
+                        "name": "math",
+                        "options": [
+                            {
+                                "type": 1,
+                                "name": "add",
+                                "options": [
+                                    {"type": 4, "name": "a", "value": 1},
+                                    {"type": 4, "name": "b", "value": 2},
+                                ],
+                            }
+                        ],
+                    },
+                }
+            )
+            # Nothing but the context has finished before awaiting
+            assert tracer.ended == ["discord.context"]
+            return await result
+
+    assert asyncio.run(run()).content == "3"
+
+    # The group's span stays open until the subcommand finishes
+    assert tracer.find("discord.command")[0]["parent"] == "discord.command_group"
+    assert tracer.find("calculate")[0]["parent"] == "discord.command"
+    assert tracer.ended == [
+        "discord.context",
+        "calculate",
+        "discord.command",
+        "discord.command_group",
+    ]
+
+
+def test_no_tracer(app):
+    discord = DiscordInteractions(app)
+
+    @discord.command()
+    def ping(ctx):
+        with span("inner"):
+            return "Pong!"
+
+    discord.set_route("/interactions")
+
+    with app.test_client() as client:
+        response = client.post(
+            "/interactions",
+            json={
+                "type": InteractionType.APPLICATION_COMMAND,
+                "id": "1",
+                "token": "",
+                "data": {"id": 1, "name": "ping"},
+            },
+        )
+
+    assert response.get_json()["data"]["content"] == "Pong!"
+
+
+def test_autocomplete_thread(app, tracer):
+    discord = DiscordInteractions(app)
+
+    @discord.command()
+    def fruit(ctx, name: Autocomplete(str)):
+        return name
+
+    @fruit.autocomplete(timeout=1)
+    def fruit_autocomplete(ctx, name=None):
+        return [name.value]
+
+    with app.app_context(), span("request"):
+        discord.run_autocomplete(
+            {
+                "type": InteractionType.APPLICATION_COMMAND_AUTOCOMPLETE,
+                "id": "5",
+                "data": {
+                    "id": 1,
+                    "name": "fruit",
+                    "options": [
+                        {"type": 3, "name": "name", "value": "ap", "focused": True}
+                    ],
+                },
+            }
+        )
+
+    # The handler runs in an executor thread, under the caller's span
+    [record] = tracer.find("discord.autocomplete")
+    assert record["parent"] == "request"
+    assert record["attributes"] == {
+        "discord.command.name": "fruit",
+        "discord.interaction.id": "5",
+    }
@@ -0,0 +1,179 @@
+import sys
+import inspect
+import contextlib
+import contextvars
+from typing import Callable
+
+_tracer = None
+_no_span = contextlib.nullcontext()
+
+
+def set_tracer(tracer):
+    """
+    Set the tracer that receives spans for the interaction lifecycle.
+
+    The tracer must provide ``start_as_current_span(name, attributes=...)``,
+    returning a context manager, like an OpenTelemetry tracer does. This
+    library doesn't depend on OpenTelemetry itself.
+
+    .. code-block:: python
+
+        from opentelemetry import trace
+        from flask_discord_interactions import set_tracer
+
+        set_tracer(trace.get_tracer("my-bot"))
+
+    Tracing is process-wide. Call this in every process that handles
+    interactions or sends followup messages, such as background workers.
+
+    Parameters
+    ----------
+    tracer
+        The tracer, or ``None`` to disable tracing.
+    """
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer():
+    "Return the tracer set with :func:`set_tracer`, or ``None``."
+    return _tracer
+
+
+def span(name: str, attributes: dict = None, *, interaction_id=None):
+    """
+    Start a span as the current span, if a tracer is set.
+
+    Every span for an interaction carries its ID as the
+    ``discord.interaction.id`` attribute, so the spans of a deferred command
+    can be correlated with the request that started it, whichever thread,
+    task or worker process sends the followup.
+
+    .. code-block:: python
+
+        @discord.command()
+        def lookup(ctx, name: str):
+            with span("database", interaction_id=ctx.id):
+                row = db.fetch(name)
+            return row.description
+
+    Parameters
+    ----------
+    name: str
+        The name of the span.
+    attributes: dict
+        Attributes of the span. ``None`` values are left out.
+    interaction_id
+        The ID of the interaction the span belongs to.
+
+    Returns
+    -------
+    ContextManager
+        The span, or a no-op context manager if no tracer is set.
+    """
+    if _tracer is None:
+        return _no_span
+
+    attributes = {
+        key: value for key, value in (attributes or {}).items() if value is not None
+    }
+    if interaction_id is not None:
+        attributes["discord.interaction.id"] = str(interaction_id)
+
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def call(
+    name: str,
+    func: Callable,
+    args: tuple = (),
+    kwargs: dict = None,
+    *,
+    attributes: dict = None,
+    interaction_id=None,
+):
+    """
+    Call a function inside a span. If the function returns an awaitable
+    (e.g. it is a coroutine function, or a command group dispatching to an
+    async subcommand), the span covers the awaitable until it finishes.
+
+    Parameters
+    ----------
+    name: str
+        The name of the span.
+    func: Callable
+        The function to call.
+    args: tuple
+        The positional arguments to call the function with.
+    kwargs: dict
+        The keyword arguments to call the function with.
+    attributes: dict
+        Attributes of the span.
+    interaction_id
+        The ID of the interaction the span belongs to.
+    """
+    if kwargs is None:
+        kwargs = {}
+
+    if _tracer is None:
+        return func(*args, **kwargs)
+
+    if inspect.iscoroutinefunction(func):
+        return _call_async(name, func, args, kwargs, attributes, interaction_id)
+
+    # The span stays open after returning if the result is awaitable, so it
+    # is made current in a copy of the context rather than the caller's
+    context = contextvars.copy_context()
+    manager = span(name, attributes, interaction_id=interaction_id)
+    context.run(manager.__enter__)
+    try:
+        result = context.run(func, *args, **kwargs)
+    except BaseException:
+        context.run(manager.__exit__, *sys.exc_info())
+        raise
+
+    if not inspect.isawaitable(result):
+        context.run(manager.__exit__, None, None, None)
+        return result
+
+    return _finish_in_context(context, manager, result)
+
+
+async def _call_async(name, func, args, kwargs, attributes, interaction_id):
+    with span(name, attributes, interaction_id=interaction_id):
+        return await func(*args, **kwargs)
+
+
+async def _finish_in_context(context, manager, awaitable):
+    try:
+        result = await _InContext(context, awaitable)
+    except BaseException:
+        context.run(manager.__exit__, *sys.exc_info())
+        raise
+
+    context.run(manager.__exit__, None, None, None)
+    return result
+
+
+class _InContext:
+    "Runs each step of an awaitable in the given context."
+
+    def __init__(self, context: contextvars.Context, awaitable):
+        self.context = context
+        self.awaitable = awaitable
+
+    def __await__(self):
+        iterator = self.awaitable.__await__()
+        step, value = iterator.send, None
+        while True:
+            try:
+                signal = self.context.run(step, value)
+            except StopIteration as stop:
+                return stop.value
+
+            try:
+                value = yield signal
+                step = iterator.send
+            except BaseException as error:
+                value = error
+                step = iterator.throw
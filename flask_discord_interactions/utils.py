@@ -1,3 +1,4 @@
+import time
 import functools
 
 
@@ -12,3 +13,53 @@ class static_or_instance(object):
 
     def __get__(self, instance, owner):
         return functools.partial(self.func, instance)
+
+
+# Milliseconds between the Unix epoch and the first second of 2015
+DISCORD_EPOCH = 1420070400000
+
+# Discord waits this many seconds for the initial response to an interaction
+RESPONSE_WINDOW = 3.0
+
+
+def snowflake_time(snowflake):
+    """
+    Return the time a Discord snowflake was created at.
+
+    Parameters
+    ----------
+    snowflake
+        The snowflake, as a string or integer.
+
+    Returns
+    -------
+    float
+        The creation time as a Unix timestamp, or ``None`` if the value is
+        not a snowflake.
+    """
+    try:
+        return ((int(snowflake) >> 22) + DISCORD_EPOCH) / 1000
+    except (TypeError, ValueError):
+        return None
+
+
+def make_snowflake(timestamp: float = None, increment: int = 0):
+    """
+    Build a Discord snowflake for the given time.
+
+    Parameters
+    ----------
+    timestamp: float
+        The creation time as a Unix timestamp. Defaults to now.
+    increment: int
+        The value of the low 12 bits, to tell apart snowflakes created in
+        the same millisecond.
+
+    Returns
+    -------
+    str
+        The snowflake.
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    return str(((int(timestamp * 1000) - DISCORD_EPOCH) << 22) | (increment & 0xFFF))
@@ -18,7 +18,7 @@ setup(
     zip_safe=False,
     include_package_data=True,
     platforms="any",
-    install_requires=["Flask", "requests", "PyNaCl", "requests-toolbelt"],
+    install_requires=["Flask", "requests", "PyNaCl"],
     extras_require={"async": ["Quart", "aiohttp"]},
     tests_require=["pytest"],
     classifiers=[